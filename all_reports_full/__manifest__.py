@@ -3,12 +3,16 @@
     'version': '17.0.1.0.0',
     'category': 'Reporting',
     'license': 'LGPL-3',
-    'depends': ['base', 'account', 'sale', 'purchase', 'stock', 'product'],
+    'depends': ['base', 'mail', 'account', 'sale', 'purchase', 'stock', 'product'],
     'data': [
         'security/ir.model.access.csv',
         'security/security.xml',
         'views/menu_views.xml',
         'views/report_center_views.xml',
+        'views/report_export_job_views.xml',
+        'views/report_perf_log_views.xml',
+        'data/report_export_job_cron.xml',
+        'data/account_balance_snapshot_data.xml',
         'views/template.xml',
         'views/opening_closing.xml',
         'views/advance_vendor.xml',
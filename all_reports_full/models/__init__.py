@@ -1,5 +1,20 @@
 # -*- coding: utf-8 -*-
+from . import report_export_job
+from . import report_result_cache
+from . import report_perf_log
+from . import report_chunked_pdf
+from . import report_preview
+from . import account_balance_snapshot
+from . import account_move
 from . import report_center
+from . import trial_balance_engine
+from . import aging_engine
+from . import inventory_valuation_engine
+from . import consumption_engine
+from . import payment_engine
+from . import partner_ledger_engine
+from . import gr_ir_engine
+from . import payroll_engine
 from . import opening_closing
 from . import advance_vendor
 from . import vendor_ledger
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+from odoo import api, fields, models, _
+from odoo.tools.sql import create_unique_index
+
+SNAPSHOT_BY_PARTNER_KEY = 'all_reports_full.balance_snapshot_by_partner'
+
+
+class AccountBalanceSnapshot(models.Model):
+    _name = 'account.balance.snapshot'
+    _description = 'Daily Account Balance Snapshot'
+    _order = 'date, account_id'
+    _log_access = False
+
+    date = fields.Date(string='Date', required=True, index=True)
+    account_id = fields.Many2one('account.account', string='Account', required=True, ondelete='cascade', index=True)
+    partner_id = fields.Many2one('res.partner', string='Partner', ondelete='cascade', index=True)
+    company_id = fields.Many2one('res.company', string='Company', required=True, ondelete='cascade')
+    debit = fields.Float(string='Debit')
+    credit = fields.Float(string='Credit')
+
+    def init(self):
+        create_unique_index(self._cr, 'account_balance_snapshot_key_uniq', self._table,
+                            ['date', 'account_id', 'company_id', 'COALESCE(partner_id, 0)'])
+
+    # -----------------------------
+    #  CONFIGURATION
+    # -----------------------------
+    @api.model
+    def _is_ready(self):
+        """Snapshots can only replace journal items once they were rebuilt."""
+        return bool(self.env['ir.config_parameter'].sudo().get_param('all_reports_full.balance_snapshot_ready'))
+
+    @api.model
+    def _by_partner(self):
+        """Whether snapshot rows are split per partner (on unless disabled)."""
+        value = self.env['ir.config_parameter'].sudo().get_param(SNAPSHOT_BY_PARTNER_KEY, 'True')
+        return value not in ('0', 'False', 'false')
+
+    def _partner_column(self):
+        return 'aml.partner_id' if self._by_partner() else 'NULL::integer'
+
+    # -----------------------------
+    #  MAINTENANCE
+    # -----------------------------
+    @api.model
+    def _apply_moves(self, moves, sign):
+        """Add (sign=1) or remove (sign=-1) the journal items of ``moves``."""
+        if moves:
+            self._apply('aml.move_id IN %(ids)s', moves.ids, sign)
+
+    @api.model
+    def _apply_lines(self, lines, sign):
+        """Add (sign=1) or remove (sign=-1) the journal items ``lines``."""
+        if lines:
+            self._apply('aml.id IN %(ids)s', lines.ids, sign)
+
+    def _apply(self, where, ids, sign):
+        self.env['account.move.line'].flush_model(['date', 'account_id', 'partner_id', 'company_id', 'debit', 'credit'])
+        partner = self._partner_column()
+        # section and note lines have no account
+        self.env.cr.execute(f"""
+            INSERT INTO account_balance_snapshot (date, account_id, partner_id, company_id, debit, credit)
+                 SELECT aml.date, aml.account_id, {partner}, aml.company_id,
+                        %(sign)s * SUM(aml.debit), %(sign)s * SUM(aml.credit)
+                   FROM account_move_line aml
+                  WHERE {where}
+                    AND aml.account_id IS NOT NULL
+               GROUP BY aml.date, aml.account_id, {partner}, aml.company_id
+            ON CONFLICT (date, account_id, company_id, COALESCE(partner_id, 0))
+            DO UPDATE SET debit = account_balance_snapshot.debit + EXCLUDED.debit,
+                          credit = account_balance_snapshot.credit + EXCLUDED.credit
+        """, {'sign': sign, 'ids': tuple(ids)})
+        self.invalidate_model()
+
+    @api.model
+    def _rebuild(self):
+        """Recompute every snapshot row from the posted journal items."""
+        self.env['account.move.line'].flush_model()
+        partner = self._partner_column()
+        self.env.cr.execute("DELETE FROM account_balance_snapshot")
+        self.env.cr.execute(f"""
+            INSERT INTO account_balance_snapshot (date, account_id, partner_id, company_id, debit, credit)
+                 SELECT aml.date, aml.account_id, {partner}, aml.company_id, SUM(aml.debit), SUM(aml.credit)
+                   FROM account_move_line aml
+                  WHERE aml.parent_state = 'posted'
+                    AND aml.account_id IS NOT NULL
+               GROUP BY aml.date, aml.account_id, {partner}, aml.company_id
+        """)
+        self.invalidate_model()
+        self.env['ir.config_parameter'].sudo().set_param('all_reports_full.balance_snapshot_ready', 'True')
+
+    def action_rebuild(self):
+        self._rebuild()
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Balance snapshots rebuilt'),
+                'message': _('Opening balances are now read from the snapshot table.'),
+                'type': 'success',
+            },
+        }
+
+    # -----------------------------
+    #  READING
+    # -----------------------------
+    @api.model
+    def _get_source(self, by_partner=False):
+        """Return the table and extra filter opening balances are read from.
+
+        Falls back to posted journal items when the snapshots were never
+        rebuilt, or when partner balances are needed but not tracked.
+        """
+        if self._is_ready() and (not by_partner or self._by_partner()):
+            self.flush_model()
+            return 'account_balance_snapshot', ''
+        self.env['account.move.line'].flush_model(
+            ['date', 'account_id', 'partner_id', 'company_id', 'debit', 'credit', 'parent_state'])
+        return 'account_move_line', "AND parent_state = 'posted'"
+
+    @api.model
+    def _get_opening_balances(self, date, account_ids, partner_ids=None, by_partner=False):
+        """Return debit - credit before ``date`` per account.
+
+        Keys are account ids, or ``(account_id, partner_id)`` tuples when
+        ``by_partner`` is set.
+        """
+        if not account_ids:
+            return {}
+        by_partner = by_partner or bool(partner_ids)
+        table, state_clause = self._get_source(by_partner=by_partner)
+        group = 'account_id, partner_id' if by_partner else 'account_id'
+        query = f"""
+            SELECT {group}, SUM(debit - credit)
+              FROM {table}
+             WHERE date < %(date)s
+               AND account_id IN %(account_ids)s
+               AND company_id IN %(company_ids)s
+               {state_clause}
+        """
+        params = {
+            'date': date,
+            'account_ids': tuple(account_ids),
+            'company_ids': tuple(self.env.companies.ids),
+        }
+        if partner_ids:
+            query += " AND partner_id IN %(partner_ids)s"
+            params['partner_ids'] = tuple(partner_ids)
+        query += f" GROUP BY {group}"
+        self.env.cr.execute(query, params)
+        if by_partner:
+            return {(account_id, partner_id): balance or 0.0
+                    for account_id, partner_id, balance in self.env.cr.fetchall()}
+        return {account_id: balance or 0.0 for account_id, balance in self.env.cr.fetchall()}
+
+    @api.model
+    def _get_partner_opening_balances(self, date, account_ids, partner_ids=None):
+        """Return debit - credit before ``date`` per partner across ``account_ids``."""
+        result = {}
+        balances = self._get_opening_balances(date, account_ids, partner_ids=partner_ids, by_partner=True)
+        for (account_id, partner_id), balance in balances.items():
+            if partner_id:
+                result[partner_id] = result.get(partner_id, 0.0) + balance
+        return result
+
+
+class IrConfigParameter(models.Model):
+    _inherit = 'ir.config_parameter'
+
+    def _rebuild_snapshot_if_regrouped(self, by_partner):
+        """Rebuild the snapshots when their partner split changed, rows of both kinds cannot be mixed."""
+        Snapshot = self.env['account.balance.snapshot']
+        if Snapshot._is_ready() and Snapshot._by_partner() != by_partner:
+            Snapshot._rebuild()
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        if not any(vals.get('key') == SNAPSHOT_BY_PARTNER_KEY for vals in vals_list):
+            return super().create(vals_list)
+        by_partner = self.env['account.balance.snapshot']._by_partner()
+        params = super().create(vals_list)
+        self._rebuild_snapshot_if_regrouped(by_partner)
+        return params
+
+    def write(self, vals):
+        if SNAPSHOT_BY_PARTNER_KEY not in self.mapped('key') + [vals.get('key')]:
+            return super().write(vals)
+        by_partner = self.env['account.balance.snapshot']._by_partner()
+        res = super().write(vals)
+        self._rebuild_snapshot_if_regrouped(by_partner)
+        return res
+
+    def unlink(self):
+        if SNAPSHOT_BY_PARTNER_KEY not in self.mapped('key'):
+            return super().unlink()
+        by_partner = self.env['account.balance.snapshot']._by_partner()
+        res = super().unlink()
+        self._rebuild_snapshot_if_regrouped(by_partner)
+        return res
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+from odoo import api, models
+
+
+class AccountMove(models.Model):
+    _inherit = 'account.move'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        # the lines are counted with their move, not one by one
+        moves = super(AccountMove, self.with_context(skip_balance_snapshot=True)).create(vals_list)
+        moves = moves.with_env(self.env)
+        posted = moves.filtered(lambda m: m.state == 'posted')
+        self.env['account.balance.snapshot']._apply_moves(posted, 1)
+        posted._invalidate_report_cache()
+        return moves
+
+    def write(self, vals):
+        if 'state' not in vals:
+            return super().write(vals)
+        # Posting, resetting to draft and cancelling all go through the state:
+        # take the lines out as they were posted and add back what is posted now
+        Snapshot = self.env['account.balance.snapshot']
+        Snapshot._apply_moves(self.filtered(lambda m: m.state == 'posted'), -1)
+        # line changes made along are covered by reapplying the whole moves
+        res = super(AccountMove, self.with_context(skip_balance_snapshot=True)).write(vals)
+        Snapshot._apply_moves(self.filtered(lambda m: m.state == 'posted'), 1)
+        self._invalidate_report_cache()
+        return res
+
+    def unlink(self):
+        posted = self.filtered(lambda m: m.state == 'posted')
+        self.env['account.balance.snapshot']._apply_moves(posted, -1)
+        posted._invalidate_report_cache()
+        return super(AccountMove, self.with_context(skip_balance_snapshot=True)).unlink()
+
+    def _invalidate_report_cache(self):
+        """Drop the cached report results once posted entries changed."""
+        if self:
+            self.env['report.result.cache']._invalidate()
+
+
+class AccountMoveLine(models.Model):
+    _inherit = 'account.move.line'
+
+    # Fields of a journal item the balance snapshots are made of
+    _snapshot_fields = {'date', 'account_id', 'partner_id', 'company_id', 'debit', 'credit', 'balance', 'amount_currency'}
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        lines = super().create(vals_list)
+        if not self.env.context.get('skip_balance_snapshot'):
+            # items added to an entry that is already posted
+            posted = lines.filtered(lambda l: l.parent_state == 'posted')
+            self.env['account.balance.snapshot']._apply_lines(posted, 1)
+            posted.move_id._invalidate_report_cache()
+        return lines
+
+    def write(self, vals):
+        if self.env.context.get('skip_balance_snapshot') or not self._snapshot_fields.intersection(vals):
+            return super().write(vals)
+        # Corrections on posted entries bypass the state of the move:
+        # take their moves out as they were and add them back as written
+        Snapshot = self.env['account.balance.snapshot']
+        moves = self.filtered(lambda l: l.parent_state == 'posted').move_id
+        Snapshot._apply_moves(moves, -1)
+        res = super().write(vals)
+        Snapshot._apply_moves(moves, 1)
+        moves._invalidate_report_cache()
+        return res
+
+    def unlink(self):
+        if not self.env.context.get('skip_balance_snapshot'):
+            posted = self.filtered(lambda l: l.parent_state == 'posted')
+            self.env['account.balance.snapshot']._apply_lines(posted, -1)
+            posted.move_id._invalidate_report_cache()
+        return super().unlink()
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+from odoo import api, models
+
+
+class AgingEngine(models.AbstractModel):
+    _name = 'report.center.aging'
+    _description = 'Partner Aging Engine'
+
+    @api.model
+    def _get_aging(self, as_of_date, account_type, boundaries=(30, 60, 90), partner_ids=None):
+        """Return the open balance of every partner split into age buckets.
+
+        ``boundaries`` are the inclusive upper limits, in days, of every
+        bucket but the last one: ``(30, 60, 90)`` yields 0-30, 31-60, 61-90
+        and 90+. Residuals are bucketed and summed in a single grouped query;
+        the result is a list of ``{'partner', 'total', 'buckets'}`` dicts
+        sorted by partner name, cached until the ledger up to ``as_of_date``
+        changes.
+        """
+        return self.env['report.result.cache']._cached(
+            'aging', {
+                'as_of': as_of_date,
+                'account_type': account_type,
+                'boundaries': list(boundaries),
+                'partner_ids': sorted(partner_ids or []),
+            },
+            lambda: self._compute_aging(as_of_date, account_type, boundaries, partner_ids))
+
+    @api.model
+    def _compute_aging(self, as_of_date, account_type, boundaries, partner_ids):
+        self.env['account.move.line'].flush_model(
+            ['partner_id', 'account_id', 'date', 'amount_residual', 'reconciled', 'parent_state', 'company_id'])
+        query = """
+            SELECT aml.partner_id,
+                   width_bucket(%(as_of)s::date - aml.date, %(thresholds)s::int[]) AS bucket,
+                   SUM(aml.amount_residual)
+              FROM account_move_line aml
+              JOIN account_account acc ON acc.id = aml.account_id
+             WHERE aml.parent_state = 'posted'
+               AND aml.reconciled IS NOT TRUE
+               AND aml.partner_id IS NOT NULL
+               AND aml.date <= %(as_of)s
+               AND acc.account_type = %(account_type)s
+               AND aml.company_id IN %(company_ids)s
+        """
+        params = {
+            'as_of': as_of_date,
+            # width_bucket counts the thresholds <= age, so bucket n starts one day past boundary n-1
+            'thresholds': [int(bound) + 1 for bound in boundaries],
+            'account_type': account_type,
+            'company_ids': tuple(self.env.companies.ids),
+        }
+        if partner_ids:
+            query += " AND aml.partner_id IN %(partner_ids)s"
+            params['partner_ids'] = tuple(partner_ids)
+        query += " GROUP BY aml.partner_id, bucket"
+        self.env.cr.execute(query, params)
+
+        bucket_count = len(boundaries) + 1
+        totals = {}
+        for partner_id, bucket, amount in self.env.cr.fetchall():
+            buckets = totals.setdefault(partner_id, [0.0] * bucket_count)
+            buckets[bucket] += amount or 0.0
+
+        partners = self.env['res.partner'].browse(list(totals)).sorted(lambda p: p.name or '')
+        return [{
+            'partner': partner,
+            'total': sum(totals[partner.id]),
+            'buckets': totals[partner.id],
+        } for partner in partners]
@@ -1,4 +1,5 @@
 from odoo import models, fields, api
+from .report_perf_log import instrument_report
 from datetime import datetime
 
 
@@ -7,6 +8,7 @@ class BankReconciliationReport(models.AbstractModel):
     _description = 'Bank Reconciliation Report'
 
     @api.model
+    @instrument_report()
     def _get_report_values(self, docids, data=None):
         if not data:
             data = {}
@@ -12,68 +12,16 @@ except Exception:
 class ChartOfAccountsReport(models.TransientModel):
     _name = 'chart.of.accounts.report'
     _description = 'Chart of Accounts Report'
+    _inherit = ['report.background.mixin', 'report.preview.mixin']
+    _preview_line_model = 'chart.of.accounts.line'
 
     date_from = fields.Date(string='Start Date', required=True, default=fields.Date.context_today)
     date_to = fields.Date(string='End Date', required=True, default=fields.Date.context_today)
-    line_ids = fields.One2many('chart.of.accounts.line', 'report_id', string='Lines')
     show_entries = fields.Boolean(string='Show Journal Entries', default=True)
 
     def action_view_report(self):
         """Fetch and display report data with entries"""
-        self.line_ids.unlink()
-        
-        accounts = self.env['account.account'].search([], order='code')
-        lines_to_create = []
-        
-        for acc in accounts:
-            acc_type = ''
-            if hasattr(acc, 'account_type'):
-                acc_type = dict(acc._fields['account_type'].selection).get(acc.account_type, acc.account_type or '')
-            
-            # Get move lines for this account within date range
-            domain = [
-                ('account_id', '=', acc.id),
-                ('date', '>=', self.date_from),
-                ('date', '<=', self.date_to),
-                ('parent_state', '=', 'posted')  # Only posted entries
-            ]
-            move_lines = self.env['account.move.line'].search(domain, order='date, id')
-            
-            # Create main account line
-            lines_to_create.append({
-                'report_id': self.id,
-                'account_code': acc.code or '',
-                'account_name': acc.name,
-                'account_type': acc_type,
-                'reconcile': 'Yes' if acc.reconcile else 'No',
-                'is_account': True,
-                'entry_count': len(move_lines),
-            })
-            
-            # Create entry lines if show_entries is enabled
-            if self.show_entries:
-                for line in move_lines:
-                    lines_to_create.append({
-                        'report_id': self.id,
-                        'is_account': False,
-                        'entry_date': line.date,
-                        'entry_reference': line.move_id.name or '',
-                        'entry_label': line.name or '',
-                        'entry_partner': line.partner_id.name or '',
-                        'entry_debit': line.debit,
-                        'entry_credit': line.credit,
-                        'entry_balance': line.debit - line.credit,
-                    })
-        
-        self.env['chart.of.accounts.line'].create(lines_to_create)
-        
-        return {
-            'type': 'ir.actions.act_window',
-            'res_model': 'chart.of.accounts.report',
-            'view_mode': 'form',
-            'res_id': self.id,
-            'target': 'new',
-        }
+        return self._action_preview()
 
     def action_download_xlsx(self):
         """Download Excel report with entries"""
@@ -104,44 +52,37 @@ class ChartOfAccountsReport(models.TransientModel):
         
         # Headers
         row = 3
-        headers = ['Account Code', 'Account Name', 'Type', 'Reconcile', 'Date', 'Reference', 'Label', 'Partner', 'Debit', 'Credit', 'Balance']
+        headers = ['Account Code', 'Account Name', 'Type', 'Reconcile', 'Date', 'Reference', 'Label', 'Partner', 'Debit', 'Credit', 'Balance', 'Entries']
         for col, h in enumerate(headers):
             sheet.write(row, col, h, header_format)
         
         # Data
-        accounts = self.env['account.account'].search([], order='code')
         row = 4
-        
-        for acc in accounts:
-            acc_type = ''
-            if hasattr(acc, 'account_type'):
-                acc_type = dict(acc._fields['account_type'].selection).get(acc.account_type, acc.account_type or '')
+        for item in self.get_report_data():
+            acc = item['account']
             
             # Account header row
             sheet.write(row, 0, acc.code or '', account_format)
             sheet.write(row, 1, acc.name, account_format)
-            sheet.write(row, 2, acc_type, account_format)
+            sheet.write(row, 2, item['account_type'], account_format)
             sheet.write(row, 3, 'Yes' if acc.reconcile else 'No', account_format)
+            sheet.write(row, 8, item['debit'], number_format)
+            sheet.write(row, 9, item['credit'], number_format)
+            sheet.write(row, 10, item['debit'] - item['credit'], number_format)
+            sheet.write(row, 11, item['entry_count'], account_format)
             row += 1
             
-            # Get move lines
-            domain = [
-                ('account_id', '=', acc.id),
-                ('date', '>=', self.date_from),
-                ('date', '<=', self.date_to),
-                ('parent_state', '=', 'posted')
-            ]
-            move_lines = self.env['account.move.line'].search(domain, order='date, id')
-            
-            if move_lines:
-                for line in move_lines:
-                    sheet.write(row, 4, line.date.strftime('%Y-%m-%d') if line.date else '')
-                    sheet.write(row, 5, line.move_id.name or '')
-                    sheet.write(row, 6, line.name or '')
-                    sheet.write(row, 7, line.partner_id.name or '')
-                    sheet.write(row, 8, line.debit, number_format)
-                    sheet.write(row, 9, line.credit, number_format)
-                    sheet.write(row, 10, line.debit - line.credit, number_format)
+            if not self.show_entries:
+                continue
+            if item['entries']:
+                for line in item['entries']:
+                    sheet.write(row, 4, line['date'].strftime('%Y-%m-%d') if line['date'] else '')
+                    sheet.write(row, 5, line['reference'])
+                    sheet.write(row, 6, line['label'])
+                    sheet.write(row, 7, line['partner'])
+                    sheet.write(row, 8, line['debit'], number_format)
+                    sheet.write(row, 9, line['credit'], number_format)
+                    sheet.write(row, 10, line['debit'] - line['credit'], number_format)
                     row += 1
             else:
                 sheet.write(row, 4, 'No entries in this period')
@@ -158,7 +99,7 @@ class ChartOfAccountsReport(models.TransientModel):
         sheet.set_column('F:F', 15)
         sheet.set_column('G:G', 30)
         sheet.set_column('H:H', 25)
-        sheet.set_column('I:K', 15)
+        sheet.set_column('I:L', 15)
 
         workbook.close()
         
@@ -179,26 +120,138 @@ class ChartOfAccountsReport(models.TransientModel):
         """Download PDF report"""
         return self.env.ref('all_reports_full.report_chart_of_accounts_pdf').report_action(self)
 
+    def _get_account_activity_query(self):
+        """SQL and parameters of the entry count, debit and credit per account in the period"""
+        self.env['account.move.line'].flush_model(['account_id', 'date', 'debit', 'credit', 'parent_state', 'company_id'])
+        query = """
+            SELECT account_id, COUNT(*) AS entry_count, SUM(debit) AS debit, SUM(credit) AS credit
+              FROM account_move_line
+             WHERE date BETWEEN %(date_from)s AND %(date_to)s
+               AND parent_state = 'posted'
+               AND company_id IN %(company_ids)s
+          GROUP BY account_id
+        """
+        return query, {
+            'date_from': self.date_from or None,
+            'date_to': self.date_to or None,
+            'company_ids': tuple(self.env.companies.ids),
+        }
+
+    def _get_account_activity(self):
+        """Entry count, debit and credit per account id from one grouped query"""
+        self.env.cr.execute(*self._get_account_activity_query())
+        return {account_id: (count, debit or 0.0, credit or 0.0)
+                for account_id, count, debit, credit in self.env.cr.fetchall()}
+
+    def _get_account_entries(self, account_ids):
+        """Posted entries of the period per account id, read with one query"""
+        if not account_ids:
+            return {}
+        self.env['account.move.line'].flush_model()
+        self.env['account.move'].flush_model(['name'])
+        self.env.cr.execute("""
+            SELECT aml.account_id, aml.date, am.name, aml.name, rp.name, aml.debit, aml.credit
+              FROM account_move_line aml
+              JOIN account_move am ON am.id = aml.move_id
+         LEFT JOIN res_partner rp ON rp.id = aml.partner_id
+             WHERE aml.account_id IN %(account_ids)s
+               AND aml.date BETWEEN %(date_from)s AND %(date_to)s
+               AND aml.parent_state = 'posted'
+          ORDER BY aml.account_id, aml.date, aml.id
+        """, {
+            'account_ids': tuple(account_ids),
+            'date_from': self.date_from,
+            'date_to': self.date_to,
+        })
+        entries = {}
+        for account_id, line_date, reference, label, partner, debit, credit in self.env.cr.fetchall():
+            entries.setdefault(account_id, []).append({
+                'date': line_date,
+                'reference': reference or '',
+                'label': label or '',
+                'partner': partner or '',
+                'debit': debit or 0.0,
+                'credit': credit or 0.0,
+            })
+        return entries
+
+    def get_report_data(self):
+        """Accounts with their period activity, and their entries when shown"""
+        accounts = self.env['account.account'].search([], order='code')
+        activity = self._get_account_activity()
+        entries = self._get_account_entries(list(activity)) if self.show_entries else {}
+        account_types = dict(self.env['account.account']._fields['account_type']._description_selection(self.env))
+        data = []
+        for acc in accounts:
+            count, debit, credit = activity.get(acc.id, (0, 0.0, 0.0))
+            data.append({
+                'account': acc,
+                'account_type': account_types.get(acc.account_type, acc.account_type or ''),
+                'entry_count': count,
+                'debit': debit,
+                'credit': credit,
+                'entries': entries.get(acc.id, []),
+            })
+        return data
 
-class ChartOfAccountsLine(models.TransientModel):
+
+class ChartOfAccountsLine(models.Model):
     _name = 'chart.of.accounts.line'
+    _inherit = 'report.preview.line'
     _description = 'Chart of Accounts Line'
+    _auto = False
+    _report_model = 'chart.of.accounts.report'
 
-    report_id = fields.Many2one('chart.of.accounts.report', string='Report', ondelete='cascade')
-    
-    # Account fields
-    is_account = fields.Boolean(string='Is Account', default=False)
+    account_id = fields.Many2one('account.account', string='Account')
     account_code = fields.Char(string='Account Code')
     account_name = fields.Char(string='Account Name')
-    account_type = fields.Char(string='Type')
+    account_type = fields.Selection(selection='_get_account_types', string='Type')
     reconcile = fields.Char(string='Reconcile')
     entry_count = fields.Integer(string='Entry Count')
-    
-    # Entry fields
-    entry_date = fields.Date(string='Date')
-    entry_reference = fields.Char(string='Reference')
-    entry_label = fields.Char(string='Label')
-    entry_partner = fields.Char(string='Partner')
     entry_debit = fields.Float(string='Debit')
     entry_credit = fields.Float(string='Credit')
-    entry_balance = fields.Float(string='Balance')
\ No newline at end of file
+    entry_balance = fields.Float(string='Balance')
+
+    @api.model
+    def _get_account_types(self):
+        return self.env['account.account']._fields['account_type']._description_selection(self.env)
+
+    def action_open_entries(self):
+        """Drill down into the posted entries of the account for the period"""
+        self.ensure_one()
+        report = self.env['chart.of.accounts.report'].browse(self.report_id)
+        return {
+            'type': 'ir.actions.act_window',
+            'name': _('Entries of %s') % self.account_code,
+            'res_model': 'account.move.line',
+            'view_mode': 'tree',
+            'domain': [
+                ('account_id', '=', self.account_id.id),
+                ('date', '>=', report.date_from),
+                ('date', '<=', report.date_to),
+                ('parent_state', '=', 'posted'),
+            ],
+            'context': {'create': False},
+            'target': 'new',
+        }
+
+    def _preview_query(self):
+        query, params = self._get_preview_report()._get_account_activity_query()
+        return f"""
+            SELECT acc.id,
+                   %(report_id)s AS report_id,
+                   ROW_NUMBER() OVER (ORDER BY acc.code, acc.id) AS sequence,
+                   acc.id AS account_id,
+                   acc.code AS account_code,
+                   COALESCE(acc.name->>%(lang)s, acc.name->>'en_US') AS account_name,
+                   acc.account_type,
+                   CASE WHEN acc.reconcile THEN 'Yes' ELSE 'No' END AS reconcile,
+                   COALESCE(act.entry_count, 0) AS entry_count,
+                   COALESCE(act.debit, 0) AS entry_debit,
+                   COALESCE(act.credit, 0) AS entry_credit,
+                   COALESCE(act.debit, 0) - COALESCE(act.credit, 0) AS entry_balance
+              FROM account_account acc
+         LEFT JOIN ({query}) act ON act.account_id = acc.id
+             WHERE acc.company_id IN %(company_ids)s
+               AND %(report_id)s IS NOT NULL
+        """, params
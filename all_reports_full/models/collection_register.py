@@ -1,10 +1,13 @@
 # -*- coding: utf-8 -*-
 from odoo import api, fields, models
+from .report_perf_log import instrument_report
 
 
 class CollectionRegisterWizard(models.TransientModel):
     _name = "collection.register.wizard"
     _description = "Collection Register Report Wizard"
+    _inherit = ['report.preview.mixin']
+    _preview_line_model = "collection.register.line"
 
     date_from = fields.Date(required=True)
     date_to = fields.Date(required=True)
@@ -13,46 +16,9 @@ class CollectionRegisterWizard(models.TransientModel):
         string="Customers",
         domain=[("customer_rank", ">", 0)]
     )
-    payment_ids = fields.Many2many(
-        "account.payment",
-        string="Payment Records",
-        compute="_compute_payment_ids",
-        store=False
-    )
-   
-    @api.depends('date_from', 'date_to', 'partner_ids')
-    def _compute_payment_ids(self):
-        for rec in self:
-            rec.payment_ids = False
-
-            if not rec.date_from or not rec.date_to:
-                continue
-
-            domain = [
-                ('payment_type', '=', 'inbound'),
-                ('state', '=', 'posted'),
-                ('move_id.date', '>=', rec.date_from),
-                ('move_id.date', '<=', rec.date_to),
-            ]
-
-            if rec.partner_ids:
-                domain.append(('partner_id', 'in', rec.partner_ids.ids))
-
-            payments = self.env['account.payment'].search(domain)
-            rec.payment_ids = payments.sorted(lambda p: p.move_id.date)   
-    
-    def _reopen(self):
-        return {
-            'type': 'ir.actions.act_window',
-            'res_model': self._name,
-            'res_id': self.id,
-            'view_mode': 'form',
-            'target': 'new',
-        }
 
     def action_view_payments(self):
-        self._compute_payment_ids()
-        return self._reopen()
+        return self._action_preview()
 
     def action_print_collection_register(self):
         """Generates the PDF report using Odoo’s report action."""
@@ -66,33 +32,55 @@ class CollectionRegisterWizard(models.TransientModel):
         ).report_action(self, data=data)
 
 
+class CollectionRegisterLine(models.Model):
+    _name = "collection.register.line"
+    _inherit = "report.preview.line"
+    _description = "Collection Register Line"
+    _auto = False
+    _report_model = "collection.register.wizard"
+
+    payment_id = fields.Many2one("account.payment", string="Payment")
+    date = fields.Date(string="Date")
+    name = fields.Char(string="Number")
+    partner_id = fields.Many2one("res.partner", string="Customer")
+    journal_id = fields.Many2one("account.journal", string="Journal")
+    ref = fields.Char(string="Reference")
+    amount = fields.Float(string="Amount")
+
+    def _preview_query(self):
+        report = self._get_preview_report()
+        today = fields.Date.context_today(self)
+        query, params = self.env["report.center.payments"]._get_collections_query(
+            report.date_from or today, report.date_to or today, report.partner_ids.ids)
+        return f"""
+            SELECT c.payment_id AS id,
+                   %(report_id)s AS report_id,
+                   ROW_NUMBER() OVER (ORDER BY c.date, c.name, c.payment_id) AS sequence,
+                   c.*
+              FROM ({query}) c
+             WHERE %(report_id)s IS NOT NULL
+        """, params
+
+
 class CollectionRegisterReport(models.AbstractModel):
     _name = "report.all_reports_full.collection_register_template"
     _description = "Collection Register QWeb Report"
 
     @api.model
+    @instrument_report()
     def _get_report_values(self, docids, data=None):
         date_from = data.get("date_from")
         date_to = data.get("date_to")
         partner_ids = data.get("partner_ids")
 
-        # Domain for inbound payments (collections)
-        domain = [
-            ('payment_type', '=', 'inbound'),
-            ('date', '>=', date_from),
-            ('date', '<=', date_to),
-        ]
-
-        if partner_ids:
-            domain.append(('partner_id', 'in', partner_ids))
-
-        payments = self.env['account.payment'].search(domain, order="date")
+        collections = self.env['report.center.payments']._get_collections(date_from, date_to, partner_ids)
 
         return {
             'doc_ids': docids,
             'doc_model': "collection.register.wizard",
             'data': data,
-            'payments': payments,
+            'lines': collections['lines'],
+            'collections': collections,
             'date_from': date_from,
             'date_to': date_to,
         }
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+from datetime import timedelta
+
+from odoo import api, models
+
+USAGES = [
+    ('manufacturing', 'Manufacturing Order'),
+    ('production', 'Production'),
+    ('customer', 'Customer Delivery'),
+    ('inventory', 'Inventory Adjustment'),
+    ('other', 'Other'),
+]
+
+PERIODS = [
+    ('day', 'Day'),
+    ('week', 'Week'),
+    ('month', 'Month'),
+    ('quarter', 'Quarter'),
+    ('year', 'Year'),
+]
+
+
+class ConsumptionEngine(models.AbstractModel):
+    _name = 'report.center.consumption'
+    _description = 'Material Consumption Engine'
+
+    @api.model
+    def _get_moves_query(self, date_from, date_to, product_id=None, categ_id=None, period='month'):
+        """Return the SQL and parameters of the consumed moves in range.
+
+        Every done move leaving an internal location is classified in the
+        database from the manufacturing order it feeds and the usage of its
+        destination. Quantities are in the unit of the product and the value
+        comes from the valuation layers of the move when stock_account is
+        installed, else from the standard price.
+        """
+        if period not in dict(PERIODS):
+            period = 'month'
+        self.env['stock.move'].flush_model()
+        self.env['stock.location'].flush_model(['usage', 'parent_path'])
+        self.env['product.product'].flush_model(['product_tmpl_id'])
+        self.env['product.template'].flush_model(['categ_id'])
+        self.env['product.category'].flush_model(['parent_path'])
+
+        # manufacturing orders only exist with mrp installed
+        if 'raw_material_production_id' in self.env['stock.move']._fields:
+            manufacturing = "WHEN sm.raw_material_production_id IS NOT NULL THEN 'manufacturing'"
+        else:
+            manufacturing = ""
+        if 'stock.valuation.layer' in self.env:
+            self.env['stock.valuation.layer'].flush_model(['stock_move_id', 'value'])
+            value = """-(SELECT COALESCE(SUM(svl.value), 0)
+                           FROM stock_valuation_layer svl
+                          WHERE svl.stock_move_id = sm.id)"""
+        else:
+            value = """sm.product_qty * COALESCE(
+                           (SELECT ip.value_float FROM ir_property ip
+                             WHERE ip.name = 'standard_price' AND ip.company_id = sm.company_id
+                               AND ip.res_id = 'product.product,' || sm.product_id LIMIT 1),
+                           0.0)"""
+
+        query = f"""
+            SELECT sm.id AS move_id,
+                   sm.product_id,
+                   pt.categ_id,
+                   CASE {manufacturing}
+                        WHEN ld.usage = 'production' THEN 'production'
+                        WHEN ld.usage = 'customer' THEN 'customer'
+                        WHEN ld.usage = 'inventory' THEN 'inventory'
+                        ELSE 'other'
+                   END AS usage,
+                   date_trunc(%(period)s, sm.date)::date AS period_start,
+                   sm.product_qty AS quantity,
+                   {value} AS value
+              FROM stock_move sm
+              JOIN stock_location ls ON ls.id = sm.location_id
+              JOIN stock_location ld ON ld.id = sm.location_dest_id
+              JOIN product_product pp ON pp.id = sm.product_id
+              JOIN product_template pt ON pt.id = pp.product_tmpl_id
+         LEFT JOIN product_category pc ON pc.id = pt.categ_id
+             WHERE sm.state = 'done'
+               AND ls.usage = 'internal'
+               AND sm.date >= %(date_from)s
+               AND sm.date < %(date_to)s
+               AND sm.company_id IN %(company_ids)s
+        """
+        params = {
+            'period': period,
+            'date_from': date_from,
+            'date_to': date_to + timedelta(days=1),
+            'company_ids': tuple(self.env.companies.ids),
+        }
+        if product_id:
+            query += " AND sm.product_id = %(product_id)s"
+            params['product_id'] = product_id
+        elif categ_id:
+            query += " AND LEFT(pc.parent_path, LENGTH(%(categ_path)s)) = %(categ_path)s"
+            params['categ_path'] = self.env['product.category'].browse(categ_id).parent_path
+        return query, params
+
+    @api.model
+    def _get_summary_query(self, date_from, date_to, product_id=None, categ_id=None, period='month'):
+        """Return the SQL and parameters of the consumption per product, usage and period."""
+        query, params = self._get_moves_query(date_from, date_to, product_id, categ_id, period)
+        query = f"""
+            SELECT m.product_id,
+                   m.categ_id,
+                   m.usage,
+                   m.period_start,
+                   COUNT(*) AS move_count,
+                   SUM(m.quantity) AS quantity,
+                   SUM(m.value) AS value
+              FROM ({query}) m
+          GROUP BY m.product_id, m.categ_id, m.usage, m.period_start
+        """
+        return query, params
+
+    @api.model
+    def _get_summary(self, date_from, date_to, product_id=None, categ_id=None, period='month'):
+        """Return the consumption rows grouped by product, category, usage and period."""
+        query, params = self._get_summary_query(date_from, date_to, product_id, categ_id, period)
+        self.env.cr.execute(query + " ORDER BY m.period_start, m.product_id, m.usage", params)
+        rows = self.env.cr.dictfetchall()
+        products = {p.id: p for p in self.env['product.product'].browse({row['product_id'] for row in rows})}
+        categories = {c.id: c for c in self.env['product.category'].browse({row['categ_id'] for row in rows if row['categ_id']})}
+        labels = dict(USAGES)
+        for row in rows:
+            row['product'] = products[row['product_id']]
+            row['category'] = categories.get(row['categ_id'], self.env['product.category'])
+            row['usage_label'] = labels[row['usage']]
+        return rows
+
+    @api.model
+    def _get_move_ids(self, date_from, date_to, product_id, usage, period, period_start):
+        """Return the ids of the moves behind one row of the summary."""
+        query, params = self._get_moves_query(date_from, date_to, product_id, period=period)
+        self.env.cr.execute(f"""
+            SELECT m.move_id FROM ({query}) m
+             WHERE m.usage = %(usage)s AND m.period_start = %(period_start)s
+        """, dict(params, usage=usage, period_start=period_start))
+        return [move_id for move_id, in self.env.cr.fetchall()]
@@ -12,6 +12,10 @@ except Exception:
 class CustomerAgingReport(models.TransientModel):
     _name = 'customer.aging.report'
     _description = 'Customer Aging Report'
+    _inherit = ['report.background.mixin']
+
+    # Upper bound in days of every bucket but the last (365+)
+    _aging_boundaries = (30, 60, 90, 180, 365)
 
     end_date = fields.Date(string='As of Date', required=True)
     partner_id = fields.Many2one('res.partner', string='Customer', domain=[('customer_rank', '>', 0)])
@@ -21,53 +25,13 @@ class CustomerAgingReport(models.TransientModel):
         """Fetch and display report data"""
         self.line_ids.unlink()
         
-        domain = [
-            ('date', '<=', self.end_date),
-            ('reconciled', '=', False),
-            ('parent_state', '=', 'posted'),
-            ('account_id.account_type', '=', 'asset_receivable')
-        ]
-        
-        # Add partner filter if customer is selected
-        if self.partner_id:
-            domain.append(('partner_id', '=', self.partner_id.id))
-        
-        lines = self.env['account.move.line'].search(domain)
-        partners = {}
-        for l in lines:
-            partner = l.partner_id
-            if not partner:
-                continue
-            partners.setdefault(partner.id, []).append(l)
-        
         lines_to_create = []
-        for pid, lns in partners.items():
-            partner = self.env['res.partner'].browse(pid)
-            buckets = [0, 0, 0, 0, 0, 0]  # 0-30, 31-60, 61-90, 91-180, 181-365, 365+
-            total_due = 0.0
-            
-            for l in lns:
-                days = (self.end_date - l.date).days if l.date else 0
-                amount = float(l.amount_residual or 0.0)
-                total_due += amount
-                
-                if days <= 30:
-                    buckets[0] += amount
-                elif days <= 60:
-                    buckets[1] += amount
-                elif days <= 90:
-                    buckets[2] += amount
-                elif days <= 180:
-                    buckets[3] += amount
-                elif days <= 365:
-                    buckets[4] += amount
-                else:
-                    buckets[5] += amount
-            
+        for partner_data in self.get_report_data():
+            buckets = partner_data['buckets']
             lines_to_create.append({
                 'report_id': self.id,
-                'partner_name': partner.name,
-                'total_due': total_due,
+                'partner_name': partner_data['partner'].name,
+                'total_due': partner_data['total'],
                 'bucket_0_30': buckets[0],
                 'bucket_31_60': buckets[1],
                 'bucket_61_90': buckets[2],
@@ -101,57 +65,12 @@ class CustomerAgingReport(models.TransientModel):
             sheet.write(0, col, h)
         
         # Data
-        domain = [
-            ('date', '<=', self.end_date),
-            ('reconciled', '=', False),
-            ('parent_state', '=', 'posted'),
-            ('account_id.account_type', '=', 'asset_receivable')
-        ]
-        
-        # Add partner filter if customer is selected
-        if self.partner_id:
-            domain.append(('partner_id', '=', self.partner_id.id))
-        
-        lines = self.env['account.move.line'].search(domain)
-        partners = {}
-        for l in lines:
-            partner = l.partner_id
-            if not partner:
-                continue
-            partners.setdefault(partner.id, []).append(l)
-        
         row = 1
-        for pid, lns in partners.items():
-            partner = self.env['res.partner'].browse(pid)
-            buckets = [0, 0, 0, 0, 0, 0]
-            total_due = 0.0
-            
-            for l in lns:
-                days = (self.end_date - l.date).days if l.date else 0
-                amount = float(l.amount_residual or 0.0)
-                total_due += amount
-                
-                if days <= 30:
-                    buckets[0] += amount
-                elif days <= 60:
-                    buckets[1] += amount
-                elif days <= 90:
-                    buckets[2] += amount
-                elif days <= 180:
-                    buckets[3] += amount
-                elif days <= 365:
-                    buckets[4] += amount
-                else:
-                    buckets[5] += amount
-            
-            sheet.write(row, 0, partner.name)
-            sheet.write(row, 1, float(total_due))
-            sheet.write(row, 2, float(buckets[0]))
-            sheet.write(row, 3, float(buckets[1]))
-            sheet.write(row, 4, float(buckets[2]))
-            sheet.write(row, 5, float(buckets[3]))
-            sheet.write(row, 6, float(buckets[4]))
-            sheet.write(row, 7, float(buckets[5]))
+        for partner_data in self.get_report_data():
+            sheet.write(row, 0, partner_data['partner'].name)
+            sheet.write(row, 1, float(partner_data['total']))
+            for col, amount in enumerate(partner_data['buckets'], start=2):
+                sheet.write(row, col, float(amount))
             row += 1
         
         workbook.close()
@@ -174,47 +93,12 @@ class CustomerAgingReport(models.TransientModel):
         return self.env.ref('all_reports_full.report_customer_aging_pdf').report_action(self)
 
     def get_report_data(self):
-        """Get data for PDF report"""
-        domain = [
-            ('date', '<=', self.end_date),
-            ('reconciled', '=', False),
-            ('parent_state', '=', 'posted'),
-            ('account_id.account_type', '=', 'asset_receivable')
-        ]
-        
-        # Add partner filter if customer is selected
-        if self.partner_id:
-            domain.append(('partner_id', '=', self.partner_id.id))
-        
-        lines = self.env['account.move.line'].search(domain)
-        partners_data = {}
-        
-        for l in lines:
-            if not l.partner_id:
-                continue
-            pid = l.partner_id.id
-            if pid not in partners_data:
-                partners_data[pid] = {'partner': l.partner_id, 'lines': [], 'buckets': [0,0,0,0,0,0], 'total': 0}
-            
-            days = (self.end_date - l.date).days if l.date else 0
-            amount = float(l.amount_residual or 0.0)
-            partners_data[pid]['total'] += amount
-            partners_data[pid]['lines'].append(l)
-            
-            if days <= 30:
-                partners_data[pid]['buckets'][0] += amount
-            elif days <= 60:
-                partners_data[pid]['buckets'][1] += amount
-            elif days <= 90:
-                partners_data[pid]['buckets'][2] += amount
-            elif days <= 180:
-                partners_data[pid]['buckets'][3] += amount
-            elif days <= 365:
-                partners_data[pid]['buckets'][4] += amount
-            else:
-                partners_data[pid]['buckets'][5] += amount
-        
-        return list(partners_data.values())
+        """Get aged balances per customer for the view, Excel and PDF outputs"""
+        return self.env['report.center.aging']._get_aging(
+            self.end_date, 'asset_receivable',
+            boundaries=self._aging_boundaries,
+            partner_ids=self.partner_id.ids or None,
+        )
 
 
 class CustomerAgingLine(models.TransientModel):
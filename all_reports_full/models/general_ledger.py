@@ -12,33 +12,47 @@ except Exception:
 class GeneralLedgerReport(models.TransientModel):
     _name = 'general.ledger.report'
     _description = 'General Ledger Report'
+    _inherit = ['report.background.mixin', 'report.preview.mixin']
+    _preview_line_model = 'general.ledger.line'
 
     start_date = fields.Date(string='Start Date', required=True)
     end_date = fields.Date(string='End Date', required=True)
-    line_ids = fields.One2many('general.ledger.line', 'report_id', string='Lines')
+    total_debit = fields.Float(string='Total Debit', compute='_compute_totals')
+    total_credit = fields.Float(string='Total Credit', compute='_compute_totals')
+
+    def _compute_totals(self):
+        for rec in self:
+            totals = rec._preview_totals('debit', 'credit')
+            rec.total_debit = totals['debit']
+            rec.total_credit = totals['credit']
 
     def action_view_report(self):
         """Fetch and display report data"""
-        self.line_ids.unlink()
-        
+        return self._action_preview()
+
+    def _get_ledger_rows(self):
+        """Ledger rows with a running balance per account, cached per period."""
+        return self.env['report.result.cache']._cached(
+            'general_ledger', {'start': self.start_date, 'end': self.end_date},
+            self._compute_ledger_rows)
+
+    def _compute_ledger_rows(self):
         domain = [
             ('date', '>=', self.start_date),
             ('date', '<=', self.end_date),
             ('parent_state', '=', 'posted')
         ]
         amls = self.env['account.move.line'].search(domain, order='date,account_id,partner_id')
-        
+
         balance_map = {}
-        lines_to_create = []
-        
+        rows = []
         for line in amls:
             acc = line.account_id
             key = acc.id
             bal = balance_map.get(key, 0.0) + (line.debit - line.credit)
             balance_map[key] = bal
-            
-            lines_to_create.append({
-                'report_id': self.id,
+
+            rows.append({
                 'date': line.date,
                 'journal': line.move_id.journal_id.name or '',
                 'account_code': acc.code or '',
@@ -49,16 +63,7 @@ class GeneralLedgerReport(models.TransientModel):
                 'credit': line.credit,
                 'balance': bal,
             })
-        
-        self.env['general.ledger.line'].create(lines_to_create)
-        
-        return {
-            'type': 'ir.actions.act_window',
-            'res_model': 'general.ledger.report',
-            'view_mode': 'form',
-            'res_id': self.id,
-            'target': 'new',
-        }
+        return rows
 
     def action_download_xlsx(self):
         """Download Excel report"""
@@ -75,30 +80,17 @@ class GeneralLedgerReport(models.TransientModel):
             sheet.write(0, col, h)
 
         # Data
-        domain = [
-            ('date', '>=', self.start_date),
-            ('date', '<=', self.end_date),
-            ('parent_state', '=', 'posted')
-        ]
-        amls = self.env['account.move.line'].search(domain, order='date,account_id,partner_id')
-        
-        balance_map = {}
         row = 1
-        for line in amls:
-            acc = line.account_id
-            key = acc.id
-            bal = balance_map.get(key, 0.0) + (line.debit - line.credit)
-            balance_map[key] = bal
-            
-            sheet.write(row, 0, str(line.date))
-            sheet.write(row, 1, line.move_id.journal_id.name or '')
-            sheet.write(row, 2, acc.code or '')
-            sheet.write(row, 3, acc.name)
-            sheet.write(row, 4, line.partner_id.name or '')
-            sheet.write(row, 5, line.name or '')
-            sheet.write(row, 6, float(line.debit))
-            sheet.write(row, 7, float(line.credit))
-            sheet.write(row, 8, float(bal))
+        for line in self._get_ledger_rows():
+            sheet.write(row, 0, str(line['date']))
+            sheet.write(row, 1, line['journal'])
+            sheet.write(row, 2, line['account_code'])
+            sheet.write(row, 3, line['account_name'])
+            sheet.write(row, 4, line['partner'])
+            sheet.write(row, 5, line['label'])
+            sheet.write(row, 6, float(line['debit']))
+            sheet.write(row, 7, float(line['credit']))
+            sheet.write(row, 8, float(line['balance']))
             row += 1
 
         workbook.close()
@@ -117,7 +109,13 @@ class GeneralLedgerReport(models.TransientModel):
         }
 
     def action_download_pdf(self):
-        """Download PDF report"""
+        """Download PDF report, rendered in chunks when the ledger is large"""
+        rows = self._get_ledger_rows()
+        chunked = self.env['report.chunked.pdf']
+        if chunked._should_chunk(rows):
+            return chunked._download(
+                'all_reports_full.report_general_ledger_pdf', self, rows,
+                f'general_ledger_{self.start_date}_{self.end_date}.pdf', carry_keys=('debit', 'credit'))
         return self.env.ref('all_reports_full.report_general_ledger_pdf').report_action(self)
 
     def get_report_data(self):
@@ -130,11 +128,13 @@ class GeneralLedgerReport(models.TransientModel):
         return self.env['account.move.line'].search(domain, order='date,account_id')
 
 
-class GeneralLedgerLine(models.TransientModel):
+class GeneralLedgerLine(models.Model):
     _name = 'general.ledger.line'
+    _inherit = 'report.preview.line'
     _description = 'General Ledger Line'
+    _auto = False
+    _report_model = 'general.ledger.report'
 
-    report_id = fields.Many2one('general.ledger.report', string='Report', ondelete='cascade')
     date = fields.Date(string='Date')
     journal = fields.Char(string='Journal')
     account_code = fields.Char(string='Account Code')
@@ -143,4 +143,29 @@ class GeneralLedgerLine(models.TransientModel):
     label = fields.Char(string='Label')
     debit = fields.Float(string='Debit')
     credit = fields.Float(string='Credit')
-    balance = fields.Float(string='Balance')
\ No newline at end of file
+    balance = fields.Float(string='Balance')
+
+    def _preview_query(self):
+        return """
+            SELECT aml.id,
+                   w.id AS report_id,
+                   ROW_NUMBER() OVER w_order AS sequence,
+                   aml.date,
+                   COALESCE(aj.name->>%(lang)s, aj.name->>'en_US') AS journal,
+                   acc.code AS account_code,
+                   COALESCE(acc.name->>%(lang)s, acc.name->>'en_US') AS account_name,
+                   rp.name AS partner,
+                   aml.name AS label,
+                   aml.debit,
+                   aml.credit,
+                   SUM(aml.debit - aml.credit) OVER (PARTITION BY aml.account_id ORDER BY aml.date, aml.partner_id, aml.id) AS balance
+              FROM general_ledger_report w
+              JOIN account_move_line aml ON aml.date BETWEEN w.start_date AND w.end_date
+              JOIN account_account acc ON acc.id = aml.account_id
+              JOIN account_journal aj ON aj.id = aml.journal_id
+         LEFT JOIN res_partner rp ON rp.id = aml.partner_id
+             WHERE w.id = %(report_id)s
+               AND aml.parent_state = 'posted'
+               AND aml.company_id IN %(company_ids)s
+            WINDOW w_order AS (ORDER BY aml.date, aml.account_id, aml.partner_id, aml.id)
+        """, {}
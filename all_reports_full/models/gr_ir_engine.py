@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+from odoo import api, models
+
+
+class GrIrEngine(models.AbstractModel):
+    _name = 'report.center.gr.ir'
+    _description = 'GR/IR Reconciliation Engine'
+
+    @api.model
+    def _bucket_labels(self, boundaries):
+        labels, start = [], 0
+        for bound in boundaries:
+            labels.append('%s-%s' % (start, bound))
+            start = bound + 1
+        labels.append('%s+' % boundaries[-1])
+        return labels
+
+    @api.model
+    def _get_query(self, date_from, date_to, as_of=None, boundaries=(30, 60, 90), only_open=True):
+        """Return the SQL and parameters of the GR/IR lines of confirmed POs.
+
+        Received quantities are summed from done stock moves (returns to
+        the vendor count negative) and invoiced quantities from posted
+        vendor bills and refunds, each with one grouped query over the PO
+        lines in range, in the unit of measure of the PO line. The open
+        difference is aged from the last receipt up to ``as_of``.
+        """
+        self.env['purchase.order.line'].flush_model()
+        self.env['purchase.order'].flush_model()
+        self.env['account.move.line'].flush_model(['purchase_line_id', 'quantity', 'product_uom_id', 'move_id'])
+        self.env['account.move'].flush_model(['state', 'move_type'])
+
+        # receipts are only linked to PO lines when purchase_stock is installed
+        if 'purchase_line_id' in self.env['stock.move']._fields:
+            self.env['stock.move'].flush_model(['purchase_line_id', 'quantity', 'product_uom', 'state', 'date', 'location_dest_id'])
+            receipts = """
+                 LEFT JOIN (
+                        SELECT sm.purchase_line_id,
+                               SUM(CASE WHEN ld.usage = 'supplier' THEN -1 ELSE 1 END * sm.quantity / mu.factor) AS qty,
+                               MAX(sm.date) FILTER (WHERE ld.usage != 'supplier') AS receipt_date
+                          FROM stock_move sm
+                          JOIN stock_location ld ON ld.id = sm.location_dest_id
+                          JOIN uom_uom mu ON mu.id = sm.product_uom
+                         WHERE sm.state = 'done'
+                           AND sm.purchase_line_id IN (SELECT id FROM scope)
+                      GROUP BY sm.purchase_line_id
+                 ) rec ON rec.purchase_line_id = pol.id"""
+            received = """CASE WHEN pol.qty_received_method = 'stock_moves'
+                               THEN COALESCE(rec.qty, 0) * lu.factor
+                               ELSE COALESCE(pol.qty_received_manual, 0)
+                          END"""
+            receipt_date = "rec.receipt_date::date"
+        else:
+            receipts = ""
+            received = "COALESCE(pol.qty_received_manual, 0)"
+            receipt_date = "NULL::date"
+
+        query = f"""
+            WITH scope AS (
+                SELECT pol.id
+                  FROM purchase_order_line pol
+                  JOIN purchase_order po ON po.id = pol.order_id
+                 WHERE po.state IN ('purchase', 'done')
+                   AND po.date_order >= %(date_from)s
+                   AND po.date_order < %(date_to)s::date + 1
+                   AND po.company_id IN %(company_ids)s
+                   AND pol.display_type IS NULL
+            ),
+            lines AS (
+                SELECT pol.id AS line_id,
+                       po.id AS order_id,
+                       po.name AS po_name,
+                       COALESCE(rp.name, '') AS vendor,
+                       COALESCE(pt.name->>%(lang)s, pt.name->>'en_US', pol.name, '') AS product_name,
+                       pol.product_qty AS ordered_qty,
+                       {received} AS received_qty,
+                       COALESCE(inv.qty, 0) * lu.factor AS invoiced_qty,
+                       pol.price_unit,
+                       {receipt_date} AS receipt_date,
+                       po.priority,
+                       pol.sequence
+                  FROM scope
+                  JOIN purchase_order_line pol ON pol.id = scope.id
+                  JOIN purchase_order po ON po.id = pol.order_id
+                  JOIN uom_uom lu ON lu.id = pol.product_uom
+             LEFT JOIN res_partner rp ON rp.id = po.partner_id
+             LEFT JOIN product_product pp ON pp.id = pol.product_id
+             LEFT JOIN product_template pt ON pt.id = pp.product_tmpl_id{receipts}
+             LEFT JOIN (
+                        SELECT aml.purchase_line_id,
+                               SUM(CASE WHEN am.move_type = 'in_refund' THEN -1 ELSE 1 END
+                                   * aml.quantity / COALESCE(au.factor, 1)) AS qty
+                          FROM account_move_line aml
+                          JOIN account_move am ON am.id = aml.move_id
+                     LEFT JOIN uom_uom au ON au.id = aml.product_uom_id
+                         WHERE am.state = 'posted'
+                           AND am.move_type IN ('in_invoice', 'in_refund')
+                           AND aml.purchase_line_id IN (SELECT id FROM scope)
+                      GROUP BY aml.purchase_line_id
+                 ) inv ON inv.purchase_line_id = pol.id
+            )
+            SELECT lines.*,
+                   received_qty - invoiced_qty AS difference,
+                   (received_qty - invoiced_qty) * price_unit AS open_value,
+                   %(as_of)s::date - receipt_date AS age_days,
+                   width_bucket(%(as_of)s::date - receipt_date, %(thresholds)s::int[]) AS age_bucket
+              FROM lines
+        """
+        if only_open:
+            query += " WHERE received_qty != invoiced_qty"
+        query += " ORDER BY priority DESC, order_id DESC, sequence, line_id"
+        params = {
+            'date_from': date_from,
+            'date_to': date_to,
+            'as_of': as_of or date_to,
+            'thresholds': [int(bound) + 1 for bound in boundaries],
+            'company_ids': tuple(self.env.companies.ids),
+            'lang': self.env.lang or 'en_US',
+        }
+        return query, params
+
+    @api.model
+    def _get_lines(self, date_from, date_to, as_of=None, boundaries=(30, 60, 90), only_open=True):
+        """Return the GR/IR lines as dicts, with the age bucket label."""
+        query, params = self._get_query(date_from, date_to, as_of, boundaries, only_open)
+        self.env.cr.execute(query, params)
+        labels = self._bucket_labels(boundaries)
+        rows = self.env.cr.dictfetchall()
+        for row in rows:
+            row['age_label'] = labels[row['age_bucket']] if row['receipt_date'] else ''
+        return rows
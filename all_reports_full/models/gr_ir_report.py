@@ -12,51 +12,23 @@ except Exception:
 class GRIRReport(models.TransientModel):
     _name = 'gr.ir.report'
     _description = 'GR/IR Report'
+    _inherit = ['report.preview.mixin']
+    _preview_line_model = 'gr.ir.line'
 
     start_date = fields.Date(string='Start Date', required=True)
     end_date = fields.Date(string='End Date', required=True)
-    line_ids = fields.One2many('gr.ir.line', 'report_id', string='Lines')
+    total_difference = fields.Float(string='Total Difference', compute='_compute_totals')
+    total_open_value = fields.Float(string='Total Open Value', compute='_compute_totals')
+
+    def _compute_totals(self):
+        for rec in self:
+            totals = rec._preview_totals('difference', 'open_value')
+            rec.total_difference = totals['difference']
+            rec.total_open_value = totals['open_value']
 
     def action_view_report(self):
         """Fetch and display report data"""
-        self.line_ids.unlink()
-        
-        pos = self.env['purchase.order'].search([
-            ('date_order', '>=', self.start_date),
-            ('date_order', '<=', self.end_date),
-            ('state', 'in', ['purchase', 'done'])
-        ])
-        
-        lines_to_create = []   
-        for po in pos:
-            for line in po.order_line:
-                ordered = float(line.product_qty or 0.0)
-                received = float(line.qty_received or 0.0)
-                invoiced = float(line.qty_invoiced or 0.0)
-                diff = received - invoiced
-                
-                # Only show lines with differences
-                if diff != 0:
-                    lines_to_create.append({
-                        'report_id': self.id,
-                        'po_number': po.name,
-                        'vendor': po.partner_id.name or '',
-                        'product_name': line.product_id.name or '',
-                        'ordered_qty': ordered,
-                        'received_qty': received,
-                        'invoiced_qty': invoiced,
-                        'difference': diff,
-                    })
-        
-        self.env['gr.ir.line'].create(lines_to_create)
-        
-        return {
-            'type': 'ir.actions.act_window',
-            'res_model': 'gr.ir.report',
-            'view_mode': 'form',
-            'res_id': self.id,
-            'target': 'new',
-        }
+        return self._action_preview()
 
     def action_download_pdf(self):
             """Download PDF report"""
@@ -64,24 +36,50 @@ class GRIRReport(models.TransientModel):
 
 
     def get_report_data(self):
-        """Get data for PDF report"""
-        pos = self.env['purchase.order'].search([
-            ('date_order', '>=', self.start_date),
-            ('date_order', '<=', self.end_date),
-            ('state', 'in', ['purchase', 'done'])
-        ])
-        return pos
+        """Get the open GR/IR lines for the PDF report"""
+        return self.env['report.center.gr.ir']._get_lines(self.start_date, self.end_date)
 
 
-class GRIRLine(models.TransientModel):
+class GRIRLine(models.Model):
     _name = 'gr.ir.line'
+    _inherit = 'report.preview.line'
     _description = 'GR/IR Line'
+    _auto = False
+    _report_model = 'gr.ir.report'
 
-    report_id = fields.Many2one('gr.ir.report', string='Report', ondelete='cascade')
     po_number = fields.Char(string='PO')
     vendor = fields.Char(string='Vendor')
     product_name = fields.Char(string='Product')
     ordered_qty = fields.Float(string='Ordered Qty')
     received_qty = fields.Float(string='Received Qty')
     invoiced_qty = fields.Float(string='Invoiced Qty')
-    difference = fields.Float(string='Difference (GR-IR)')
\ No newline at end of file
+    difference = fields.Float(string='Difference (GR-IR)')
+    price_unit = fields.Float(string='PO Price')
+    open_value = fields.Float(string='Open Value')
+    receipt_date = fields.Date(string='Last Receipt')
+    age_days = fields.Integer(string='Age (Days)')
+    age_label = fields.Char(string='Age')
+
+    def _preview_query(self):
+        report = self._get_preview_report()
+        engine = self.env['report.center.gr.ir']
+        query, params = engine._get_query(report.start_date or None, report.end_date or None)
+        return f"""
+            SELECT g.line_id AS id,
+                   %(report_id)s AS report_id,
+                   ROW_NUMBER() OVER (ORDER BY g.priority DESC, g.order_id DESC, g.sequence, g.line_id) AS sequence,
+                   g.po_name AS po_number,
+                   g.vendor,
+                   g.product_name,
+                   g.ordered_qty,
+                   g.received_qty,
+                   g.invoiced_qty,
+                   g.difference,
+                   g.price_unit,
+                   g.open_value,
+                   g.receipt_date,
+                   g.age_days,
+                   CASE WHEN g.receipt_date IS NOT NULL THEN (%(age_labels)s::varchar[])[g.age_bucket + 1] END AS age_label
+              FROM ({query}) g
+             WHERE %(report_id)s IS NOT NULL
+        """, dict(params, age_labels=list(engine._bucket_labels((30, 60, 90))))
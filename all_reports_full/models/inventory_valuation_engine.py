@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+from odoo import api, models, _
+from odoo.exceptions import UserError
+
+
+class InventoryValuationEngine(models.AbstractModel):
+    _name = 'report.center.inventory.valuation'
+    _description = 'Inventory Valuation Engine'
+
+    @api.model
+    def _check_method(self, method):
+        if method == 'layers' and 'stock.valuation.layer' not in self.env:
+            raise UserError(_('Valuing stock from valuation layers requires the Inventory Valuation (stock_account) module.'))
+
+    @api.model
+    def _get_valuation_query(self, date_from=None, date_to=None, method='standard',
+                             product_ids=None, categ_id=None, storable=False, skip_empty=True):
+        """Return the SQL and parameters of the quantities and value per product.
+
+        Incoming and outgoing quantities of done moves between ``date_from``
+        and ``date_to``, the on-hand quantity of internal locations and, with
+        ``method='layers'``, the remaining value of the stock valuation
+        layers are each summed in one grouped subquery for all products.
+        Otherwise the stock of every company is valued at the standard price
+        of that company, and the unit cost is the resulting average; products
+        without stock show the standard price of the current company. Unless
+        ``skip_empty`` is unset, products without stock whose moves in range
+        net to zero are left out.
+        """
+        self._check_method(method)
+        self.env['stock.move'].flush_model(['product_id', 'product_uom_qty', 'location_id', 'location_dest_id', 'state', 'date', 'company_id'])
+        self.env['stock.quant'].flush_model(['product_id', 'location_id', 'quantity', 'company_id'])
+        self.env['product.product'].flush_model(['product_tmpl_id', 'default_code', 'active', 'standard_price'])
+        self.env['product.template'].flush_model(['name', 'categ_id', 'type', 'priority'])
+        params = {
+            'lang': self.env.lang or 'en_US',
+            'company_id': self.env.company.id,
+            'company_ids': tuple(self.env.companies.ids),
+            'standard_price_field': self.env['ir.model.fields']._get('product.product', 'standard_price').id,
+        }
+        def product_filter(column):
+            return f" AND {column} = ANY(%(product_ids)s)" if product_ids is not None else ""
+        if product_ids is not None:
+            params['product_ids'] = list(product_ids)
+
+        def standard_price(alias, product, company):
+            """Join the standard price of ``product`` in ``company`` as ``<alias>_cost``."""
+            return f"""
+         LEFT JOIN ir_property {alias}_ip ON {alias}_ip.fields_id = %(standard_price_field)s
+                                         AND {alias}_ip.company_id = {company}
+                                         AND {alias}_ip.res_id = 'product.product,' || {product}
+         LEFT JOIN LATERAL (
+                    SELECT dp.value_float
+                      FROM ir_property dp
+                     WHERE dp.fields_id = %(standard_price_field)s
+                       AND dp.res_id IS NULL
+                       AND (dp.company_id = {company} OR dp.company_id IS NULL)
+                  ORDER BY dp.company_id NULLS LAST
+                     LIMIT 1
+                   ) {alias}_dp ON TRUE
+         CROSS JOIN LATERAL (
+                    SELECT COALESCE({alias}_ip.value_float, {alias}_dp.value_float, 0) AS cost
+                   ) {alias}_cost"""
+
+        if date_from and date_to:
+            moves = f"""
+                SELECT sm.product_id,
+                       SUM(sm.product_uom_qty) FILTER (WHERE ld.usage = 'internal') AS qty_in,
+                       SUM(sm.product_uom_qty) FILTER (WHERE ls.usage = 'internal') AS qty_out
+                  FROM stock_move sm
+                  JOIN stock_location ls ON ls.id = sm.location_id
+                  JOIN stock_location ld ON ld.id = sm.location_dest_id
+                 WHERE sm.state = 'done'
+                   AND sm.date >= %(date_from)s
+                   AND sm.date < %(date_to)s::date + 1
+                   AND sm.company_id IN %(company_ids)s
+                   {product_filter('sm.product_id')}
+              GROUP BY sm.product_id"""
+            params.update(date_from=date_from, date_to=date_to)
+        else:
+            moves = "SELECT NULL::integer AS product_id, 0.0 AS qty_in, 0.0 AS qty_out WHERE FALSE"
+
+        # on-hand quantity, and its value at the standard price of the company holding it
+        quants = f"""
+                SELECT cq.product_id, SUM(cq.qty) AS qty, SUM(cq.qty * cq_cost.cost) AS value
+                  FROM (
+                        SELECT sq.product_id, sq.company_id, SUM(sq.quantity) AS qty
+                          FROM stock_quant sq
+                          JOIN stock_location l ON l.id = sq.location_id
+                         WHERE l.usage = 'internal'
+                           AND sq.company_id IN %(company_ids)s
+                           {product_filter('sq.product_id')}
+                      GROUP BY sq.product_id, sq.company_id
+                       ) cq{standard_price('cq', 'cq.product_id', 'cq.company_id')}
+              GROUP BY cq.product_id"""
+
+        if method == 'layers':
+            self.env['stock.valuation.layer'].flush_model(['product_id', 'remaining_value', 'company_id'])
+            layers = f"""
+                SELECT svl.product_id, SUM(svl.remaining_value) AS value
+                  FROM stock_valuation_layer svl
+                 WHERE svl.company_id IN %(company_ids)s
+                   {product_filter('svl.product_id')}
+              GROUP BY svl.product_id"""
+            unit_cost = "CASE WHEN COALESCE(q.qty, 0) <> 0 THEN COALESCE(val.value, 0) / q.qty ELSE 0 END"
+            total_value = "COALESCE(val.value, 0)"
+        else:
+            layers = "SELECT NULL::integer AS product_id, 0.0 AS value WHERE FALSE"
+            unit_cost = "CASE WHEN COALESCE(q.qty, 0) <> 0 THEN q.value / q.qty ELSE p_cost.cost END"
+            total_value = "COALESCE(q.value, 0)"
+
+        query = f"""
+            SELECT pp.id AS product_id,
+                   pt.priority,
+                   COALESCE(pt.name->>%(lang)s, pt.name->>'en_US') AS product_name,
+                   COALESCE(pp.default_code, '') AS sku,
+                   COALESCE(pc.name, '') AS category,
+                   COALESCE(mv.qty_in, 0)::float AS qty_in,
+                   COALESCE(mv.qty_out, 0)::float AS qty_out,
+                   COALESCE(q.qty, 0)::float AS qty_on_hand,
+                   ({unit_cost})::float AS unit_cost,
+                   ({total_value})::float AS total_value
+              FROM product_product pp
+              JOIN product_template pt ON pt.id = pp.product_tmpl_id
+         LEFT JOIN product_category pc ON pc.id = pt.categ_id
+         LEFT JOIN ({moves}) mv ON mv.product_id = pp.id
+         LEFT JOIN ({quants}) q ON q.product_id = pp.id
+         LEFT JOIN ({layers}) val ON val.product_id = pp.id{standard_price('p', 'pp.id', '%(company_id)s')}
+             WHERE pp.active
+        """
+        if product_ids is not None:
+            query += " AND pp.id = ANY(%(product_ids)s)"
+        if storable:
+            query += " AND pt.type = 'product'"
+        if categ_id:
+            query += " AND pc.parent_path LIKE %(categ_path)s"
+            params['categ_path'] = self.env['product.category'].browse(categ_id).parent_path + '%'
+        if skip_empty:
+            # as the report always did: no stock and moves that net to zero
+            query += " AND (COALESCE(q.qty, 0) <> 0 OR COALESCE(mv.qty_in, 0) - COALESCE(mv.qty_out, 0) <> 0)"
+        return query, params
+
+    @api.model
+    def _get_valuation(self, products, date_from=None, date_to=None, method='standard', skip_empty=True):
+        """Return quantities and value of ``products``, in their order.
+
+        All figures come from one execution of ``_get_valuation_query``,
+        which the preview of the valuation wizard also reads.
+        """
+        if not products:
+            return []
+        query, params = self._get_valuation_query(date_from, date_to, method, products.ids, skip_empty=skip_empty)
+        self.env.cr.execute(query, params)
+        rows = {row['product_id']: row for row in self.env.cr.dictfetchall()}
+
+        data = []
+        for p in products:
+            row = rows.get(p.id)
+            if not row:
+                continue
+            data.append({
+                'product': p,
+                'qty_in': row['qty_in'],
+                'qty_out': row['qty_out'],
+                'qty_on_hand': row['qty_on_hand'],
+                'unit_cost': row['unit_cost'],
+                'total_value': row['total_value'],
+            })
+        return data
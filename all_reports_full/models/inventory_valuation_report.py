@@ -12,89 +12,28 @@ except Exception:
 class InventoryValuationReport(models.TransientModel):
     _name = 'inventory.valuation.report'
     _description = 'Inventory Valuation Report'
+    _inherit = ['report.background.mixin', 'report.preview.mixin']
+    _preview_line_model = 'inventory.valuation.line'
 
     date_from = fields.Date(string='From Date', required=True)
     date_to = fields.Date(string='To Date', required=True)
     product_id = fields.Many2one('product.product', string='Product')
     categ_id = fields.Many2one('product.category', string='Product Category')
-    line_ids = fields.One2many('inventory.valuation.line', 'report_id', string='Lines')
+    valuation_method = fields.Selection([
+        ('standard', 'Standard Price'),
+        ('layers', 'Valuation Layers'),
+    ], string='Valuation', default='standard', required=True,
+        help='Value on-hand stock at the product cost, or from the remaining value of the stock valuation layers.')
     total_value = fields.Float(string='Total Inventory Value', compute='_compute_total_value')
 
-    @api.depends('line_ids.total_value')
     def _compute_total_value(self):
         for rec in self:
-            rec.total_value = sum(rec.line_ids.mapped('total_value'))
+            rec.total_value = rec._preview_totals('total_value')['total_value']
 
     def action_view_report(self):
         """Fetch and display report data"""
-        self.line_ids.unlink()
-        
-        # Build domain for products
-        domain = [('type', '=', 'product')]
-        if self.product_id:
-            domain.append(('id', '=', self.product_id.id))
-        if self.categ_id:
-            domain.append(('categ_id', 'child_of', self.categ_id.id))
-        
-        products = self.env['product.product'].search(domain)
-        lines_to_create = []
-        
-        for p in products:
-            # Get stock moves within date range
-            moves_in = self.env['stock.move'].search([
-                ('product_id', '=', p.id),
-                ('date', '>=', self.date_from),
-                ('date', '<=', self.date_to),
-                ('state', '=', 'done'),
-                ('location_dest_id.usage', '=', 'internal'),
-            ])
-            
-            moves_out = self.env['stock.move'].search([
-                ('product_id', '=', p.id),
-                ('date', '>=', self.date_from),
-                ('date', '<=', self.date_to),
-                ('state', '=', 'done'),
-                ('location_id.usage', '=', 'internal'),
-            ])
-            
-            qty_in = sum(moves_in.mapped('product_uom_qty'))
-            qty_out = sum(moves_out.mapped('product_uom_qty'))
-            net_qty = qty_in - qty_out
-            
-            # Current quantity on hand
-            quants = self.env['stock.quant'].search([
-                ('product_id', '=', p.id),
-                ('location_id.usage', '=', 'internal')
-            ])
-            current_qty = sum(quants.mapped('quantity'))
-            
-            if current_qty == 0 and net_qty == 0:
-                continue
-            
-            unit_cost = float(p.standard_price or 0.0)
-            value = unit_cost * float(current_qty)
-            
-            lines_to_create.append({
-                'report_id': self.id,
-                'product_name': p.name,
-                'sku': p.default_code or '',
-                'category': p.categ_id.name if p.categ_id else '',
-                'qty_in': qty_in,
-                'qty_out': qty_out,
-                'qty_on_hand': current_qty,
-                'unit_cost': unit_cost,
-                'total_value': value,
-            })
-        
-        self.env['inventory.valuation.line'].create(lines_to_create)
-        
-        return {
-            'type': 'ir.actions.act_window',
-            'res_model': 'inventory.valuation.report',
-            'view_mode': 'form',
-            'res_id': self.id,
-            'target': 'new',
-        }
+        self.env['report.center.inventory.valuation']._check_method(self.valuation_method)
+        return self._action_preview()
 
     def action_download_xlsx(self):
         """Download Excel report"""
@@ -110,60 +49,20 @@ class InventoryValuationReport(models.TransientModel):
         for col, h in enumerate(headers):
             sheet.write(0, col, h)
         
-        # Build domain for products
-        domain = [('type', '=', 'product')]
-        if self.product_id:
-            domain.append(('id', '=', self.product_id.id))
-        if self.categ_id:
-            domain.append(('categ_id', 'child_of', self.categ_id.id))
-        
-        products = self.env['product.product'].search(domain)
         row = 1
         total_value = 0
-        
-        for p in products:
-            # Get stock moves within date range
-            moves_in = self.env['stock.move'].search([
-                ('product_id', '=', p.id),
-                ('date', '>=', self.date_from),
-                ('date', '<=', self.date_to),
-                ('state', '=', 'done'),
-                ('location_dest_id.usage', '=', 'internal'),
-            ])
-            
-            moves_out = self.env['stock.move'].search([
-                ('product_id', '=', p.id),
-                ('date', '>=', self.date_from),
-                ('date', '<=', self.date_to),
-                ('state', '=', 'done'),
-                ('location_id.usage', '=', 'internal'),
-            ])
-            
-            qty_in = sum(moves_in.mapped('product_uom_qty'))
-            qty_out = sum(moves_out.mapped('product_uom_qty'))
-            
-            # Current quantity on hand
-            quants = self.env['stock.quant'].search([
-                ('product_id', '=', p.id),
-                ('location_id.usage', '=', 'internal')
-            ])
-            current_qty = sum(quants.mapped('quantity'))
-            
-            if current_qty == 0 and qty_in == 0 and qty_out == 0:
-                continue
-            
-            unit_cost = float(p.standard_price or 0.0)
-            value = unit_cost * float(current_qty)
-            total_value += value
+        for item in self.get_report_data():
+            p = item['product']
+            total_value += item['total_value']
             
             sheet.write(row, 0, p.name)
             sheet.write(row, 1, p.default_code or '')
             sheet.write(row, 2, p.categ_id.name if p.categ_id else '')
-            sheet.write(row, 3, float(qty_in))
-            sheet.write(row, 4, float(qty_out))
-            sheet.write(row, 5, float(current_qty))
-            sheet.write(row, 6, float(unit_cost))
-            sheet.write(row, 7, float(value))
+            sheet.write(row, 3, float(item['qty_in']))
+            sheet.write(row, 4, float(item['qty_out']))
+            sheet.write(row, 5, float(item['qty_on_hand']))
+            sheet.write(row, 6, float(item['unit_cost']))
+            sheet.write(row, 7, float(item['total_value']))
             row += 1
         
         # Total row
@@ -187,14 +86,27 @@ class InventoryValuationReport(models.TransientModel):
 
     def action_download_pdf(self):
         """Download PDF report"""
-        return self.env.ref('all_reports_full.report_inventory_valuation_pdf').report_action(self)
+        return self._report_action_preview('all_reports_full.report_inventory_valuation_pdf')
+
+    def get_report_data(self):
+        """Get valuation rows for the products in scope"""
+        domain = [('type', '=', 'product')]
+        if self.product_id:
+            domain.append(('id', '=', self.product_id.id))
+        if self.categ_id:
+            domain.append(('categ_id', 'child_of', self.categ_id.id))
+        products = self.env['product.product'].search(domain)
+        return self.env['report.center.inventory.valuation']._get_valuation(
+            products, self.date_from, self.date_to, method=self.valuation_method)
 
 
-class InventoryValuationLine(models.TransientModel):
+class InventoryValuationLine(models.Model):
     _name = 'inventory.valuation.line'
+    _inherit = 'report.preview.line'
     _description = 'Inventory Valuation Line'
+    _auto = False
+    _report_model = 'inventory.valuation.report'
 
-    report_id = fields.Many2one('inventory.valuation.report', string='Report', ondelete='cascade')
     product_name = fields.Char(string='Product')
     sku = fields.Char(string='SKU')
     category = fields.Char(string='Category')
@@ -202,4 +114,25 @@ class InventoryValuationLine(models.TransientModel):
     qty_out = fields.Float(string='Qty Out')
     qty_on_hand = fields.Float(string='Quantity On Hand')
     unit_cost = fields.Float(string='Unit Cost')
-    total_value = fields.Float(string='Total Value')
\ No newline at end of file
+    total_value = fields.Float(string='Total Value')
+
+    def _preview_query(self):
+        report = self._get_preview_report()
+        query, params = self.env['report.center.inventory.valuation']._get_valuation_query(
+            report.date_from or None, report.date_to or None, report.valuation_method or 'standard',
+            product_ids=report.product_id.ids or None, categ_id=report.categ_id.id, storable=True)
+        return f"""
+            SELECT v.product_id AS id,
+                   %(report_id)s AS report_id,
+                   ROW_NUMBER() OVER (ORDER BY v.priority DESC, v.sku, v.product_name, v.product_id) AS sequence,
+                   v.product_name,
+                   v.sku,
+                   v.category,
+                   v.qty_in,
+                   v.qty_out,
+                   v.qty_on_hand,
+                   v.unit_cost,
+                   v.total_value
+              FROM ({query}) v
+             WHERE %(report_id)s IS NOT NULL
+        """, params
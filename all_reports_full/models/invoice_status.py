@@ -1,4 +1,7 @@
+from datetime import timedelta
+
 from odoo import models, fields, api
+from .report_perf_log import instrument_report
 import logging
 
 _logger = logging.getLogger(__name__)
@@ -52,28 +55,84 @@ class InvoiceStatusWizard(models.TransientModel):
         }
         return self.env.ref('all_reports_full.action_invoice_status_report').report_action(self, data=data)
 
+    def action_open_invoices(self):
+        """Drill down to the invoices behind the report"""
+        self.ensure_one()
+        domain = self.env['report.all_reports_full.invoice_status_template']._get_domain(
+            self.date_from, self.date_to, self.partner_ids.ids,
+            self.invoice_type, self.state, self.payment_state)
+        return {
+            'type': 'ir.actions.act_window',
+            'name': 'Invoices',
+            'res_model': 'account.move',
+            'view_mode': 'tree,form',
+            'domain': domain,
+            'context': {'create': False},
+        }
+
 
 class InvoiceStatusReport(models.AbstractModel):
     _name = 'report.all_reports_full.invoice_status_template'
     _description = 'Invoice Status Report'
 
-    def _safe_sum(self, recordset, field_name):
-        """Safely sum a field, returning 0.0 if empty or None"""
-        try:
-            if not recordset:
-                return 0.0
-            result = sum(recordset.mapped(field_name))
-            return result if result is not None else 0.0
-        except:
-            return 0.0
+    _move_types = ['out_invoice', 'in_invoice', 'out_refund', 'in_refund']
+    _overdue_boundaries = (30, 60, 90)
 
     @api.model
+    def _get_domain(self, date_from, date_to, partner_ids, invoice_type, state, payment_state):
+        """Return the account.move domain of the report filters"""
+        if invoice_type in self._move_types:
+            domain = [('move_type', '=', invoice_type)]
+        else:
+            domain = [('move_type', 'in', self._move_types)]
+        if state and state != 'all':
+            domain.append(('state', '=', state))
+        if payment_state and payment_state != 'all':
+            domain.append(('payment_state', '=', payment_state))
+        if partner_ids:
+            domain.append(('partner_id', 'in', partner_ids))
+        # Date filter - invoice date, else accounting date
+        if date_from:
+            domain += ['|', ('invoice_date', '>=', date_from),
+                       '&', ('invoice_date', '=', False), ('date', '>=', date_from)]
+        if date_to:
+            domain += ['|', ('invoice_date', '<=', date_to),
+                       '&', ('invoice_date', '=', False), ('date', '<=', date_to)]
+        return domain
+
+    @api.model
+    def _get_overdue(self, domain, as_of):
+        """Return the residual of open posted invoices per partner and overdue bucket.
+
+        Buckets are 'not due', then days past due up to every boundary of
+        ``_overdue_boundaries`` and beyond the last one; each bucket is one
+        grouped query.
+        """
+        bounds = [None, 0] + list(self._overdue_boundaries) + [None]
+        open_domain = domain + [('state', '=', 'posted'), ('amount_residual', '!=', 0)]
+        bucket_domains = [[('invoice_date_due', '>=', as_of)]]
+        for index in range(1, len(bounds) - 1):
+            bucket_domain = [('invoice_date_due', '<', as_of - timedelta(days=bounds[index]))]
+            if bounds[index + 1] is not None:
+                bucket_domain.append(('invoice_date_due', '>=', as_of - timedelta(days=bounds[index + 1])))
+            bucket_domains.append(bucket_domain)
+
+        Move = self.env['account.move']
+        totals = {}
+        for bucket, bucket_domain in enumerate(bucket_domains):
+            for partner, residual in Move._read_group(
+                    open_domain + bucket_domain, ['partner_id'], ['amount_residual:sum']):
+                buckets = totals.setdefault(partner, [0.0] * len(bucket_domains))
+                buckets[bucket] += residual or 0.0
+        return [{
+            'partner_name': partner.name or 'Unknown',
+            'buckets': buckets,
+            'total': sum(buckets),
+        } for partner, buckets in sorted(totals.items(), key=lambda item: -sum(item[1]))]
+
+    @api.model
+    @instrument_report()
     def _get_report_values(self, docids, data=None):
-        _logger.info("#"*80)
-        _logger.info("INVOICE STATUS REPORT - _get_report_values CALLED")
-        _logger.info(f"docids: {docids}")
-        _logger.info(f"data: {data}")
-        
         # Get wizard data
         if data and data.get('form'):
             form_data = data['form']
@@ -83,7 +142,6 @@ class InvoiceStatusReport(models.AbstractModel):
             invoice_type = form_data.get('invoice_type', 'out_invoice')
             state = form_data.get('state', 'all')
             payment_state = form_data.get('payment_state', 'all')
-            _logger.info("Data source: FORM DATA")
         else:
             wizard = self.env['invoice.status.wizard'].browse(docids)
             if wizard:
@@ -93,7 +151,6 @@ class InvoiceStatusReport(models.AbstractModel):
                 invoice_type = wizard.invoice_type
                 state = wizard.state
                 payment_state = wizard.payment_state
-                _logger.info("Data source: WIZARD BROWSE")
             else:
                 date_from = fields.Date.today().strftime('%Y-%m-%d')
                 date_to = fields.Date.today().strftime('%Y-%m-%d')
@@ -101,125 +158,65 @@ class InvoiceStatusReport(models.AbstractModel):
                 invoice_type = 'all'
                 state = 'all'
                 payment_state = 'all'
-                _logger.info("Data source: DEFAULT")
-        
-        _logger.info(f"Parsed Date From: {date_from}")
-        _logger.info(f"Parsed Date To: {date_to}")
-        _logger.info(f"Parsed Invoice Type: {invoice_type}")
-        _logger.info(f"Parsed State: {state}")
-        _logger.info(f"Parsed Payment State: {payment_state}")
-        
-        # Build simple domain
-        domain = []
-        
-        # Invoice type filter
-        if invoice_type == 'out_invoice':
-            domain.append(('move_type', '=', 'out_invoice'))
-        elif invoice_type == 'in_invoice':
-            domain.append(('move_type', '=', 'in_invoice'))
-        elif invoice_type == 'out_refund':
-            domain.append(('move_type', '=', 'out_refund'))
-        elif invoice_type == 'in_refund':
-            domain.append(('move_type', '=', 'in_refund'))
-        else:
-            domain.append(('move_type', 'in', ['out_invoice', 'in_invoice', 'out_refund', 'in_refund']))
-        
-        _logger.info(f"Domain after invoice_type: {domain}")
-        
-        # State filter
-        if state and state != 'all':
-            domain.append(('state', '=', state))
-            _logger.info(f"Added state filter: {state}")
-        
-        # Payment state filter
-        if payment_state and payment_state != 'all':
-            domain.append(('payment_state', '=', payment_state))
-            _logger.info(f"Added payment_state filter: {payment_state}")
-        
-        # Partner filter
-        if partner_ids:
-            domain.append(('partner_id', 'in', partner_ids))
-            _logger.info(f"Added partner filter: {partner_ids}")
-        
-        # Date filter - try both fields
-        if date_from:
-            domain.append('|')
-            domain.append(('invoice_date', '>=', date_from))
-            domain.append('&')
-            domain.append(('invoice_date', '=', False))
-            domain.append(('date', '>=', date_from))
-            _logger.info(f"Added date_from filter: {date_from}")
-        
-        if date_to:
-            domain.append('|')
-            domain.append(('invoice_date', '<=', date_to))
-            domain.append('&')
-            domain.append(('invoice_date', '=', False))
-            domain.append(('date', '<=', date_to))
-            _logger.info(f"Added date_to filter: {date_to}")
-        
-        _logger.info(f"FINAL DOMAIN: {domain}")
-        
-        # Get invoices
-        invoices = self.env['account.move'].search(domain, order='date desc, name')
-        _logger.info(f"FOUND {len(invoices)} INVOICES")
-        
-        if invoices:
-            _logger.info("SAMPLE INVOICES:")
-            for inv in invoices[:5]:  # Show first 5
-                _logger.info(f"  - {inv.name}: Date={inv.invoice_date}, Type={inv.move_type}, State={inv.state}, Payment={inv.payment_state}")
-        else:
-            _logger.info("NO INVOICES FOUND - Let's check total invoices in system:")
-            all_invoices = self.env['account.move'].search([('move_type', 'in', ['out_invoice', 'in_invoice', 'out_refund', 'in_refund'])], limit=10)
-            _logger.info(f"Total invoices in system (sample of 10): {len(all_invoices)}")
-            for inv in all_invoices:
-                _logger.info(f"  - {inv.name}: Date={inv.invoice_date}, Type={inv.move_type}, State={inv.state}")
-        
-        _logger.info("#"*80)
-        
-        # Group invoices by status
-        draft_invoices = invoices.filtered(lambda inv: inv.state == 'draft')
-        posted_invoices = invoices.filtered(lambda inv: inv.state == 'posted')
-        cancelled_invoices = invoices.filtered(lambda inv: inv.state == 'cancel')
-        
-        # Group by payment state
-        not_paid = invoices.filtered(lambda inv: inv.payment_state == 'not_paid')
-        partial_paid = invoices.filtered(lambda inv: inv.payment_state == 'partial')
-        paid = invoices.filtered(lambda inv: inv.payment_state == 'paid')
-        
-        # Calculate totals using safe sum
-        total_draft = self._safe_sum(draft_invoices, 'amount_total')
-        total_posted = self._safe_sum(posted_invoices, 'amount_total')
-        total_cancelled = self._safe_sum(cancelled_invoices, 'amount_total')
-        total_not_paid = self._safe_sum(not_paid, 'amount_residual')
-        total_paid = self._safe_sum(paid, 'amount_total')
-        total_partial = self._safe_sum(partial_paid, 'amount_residual')
-        
+
+        domain = self._get_domain(date_from, date_to, partner_ids, invoice_type, state, payment_state)
+        _logger.debug("Invoice status report domain: %s", domain)
+        Move = self.env['account.move']
+        aggregates = ['__count', 'amount_total:sum', 'amount_residual:sum']
+
+        # Group by status and by payment state
+        by_state = {
+            move_state: (count, total or 0.0)
+            for move_state, count, total, _residual in Move._read_group(domain, ['state'], aggregates)
+        }
+        by_payment = {
+            move_payment_state: (count, total or 0.0, residual or 0.0)
+            for move_payment_state, count, total, residual in Move._read_group(domain, ['payment_state'], aggregates)
+        }
+        draft_count, total_draft = by_state.get('draft', (0, 0.0))
+        posted_count, total_posted = by_state.get('posted', (0, 0.0))
+        cancelled_count, total_cancelled = by_state.get('cancel', (0, 0.0))
+        not_paid_count, _total, total_not_paid = by_payment.get('not_paid', (0, 0.0, 0.0))
+        partial_count, _total, total_partial = by_payment.get('partial', (0, 0.0, 0.0))
+        paid_count, total_paid, _residual = by_payment.get('paid', (0, 0.0, 0.0))
+
         # Overall totals
-        grand_total = self._safe_sum(invoices, 'amount_total')
-        total_due = self._safe_sum(invoices, 'amount_residual')
-        
-        # Group by customer
-        customer_summary = []
-        if invoices:
-            customer_dict = {}
-            for invoice in invoices:
-                partner = invoice.partner_id
-                if partner:
-                    if partner.id not in customer_dict:
-                        customer_dict[partner.id] = {
-                            'partner_name': partner.name or 'Unknown',
-                            'invoice_count': 0,
-                            'total_amount': 0.0,
-                            'total_due': 0.0,
-                        }
-                    customer_dict[partner.id]['invoice_count'] += 1
-                    customer_dict[partner.id]['total_amount'] += (invoice.amount_total or 0.0)
-                    customer_dict[partner.id]['total_due'] += (invoice.amount_residual or 0.0)
-            
-            # Convert to list and sort
-            customer_summary = sorted(customer_dict.values(), 
-                                    key=lambda x: x['total_amount'], reverse=True)
+        invoice_count = sum(count for count, _total in by_state.values())
+        grand_total = sum(total for _count, total in by_state.values())
+        total_due = sum(residual for _count, _total, residual in by_payment.values())
+
+        # Group by customer and move type
+        type_labels = dict(Move._fields['move_type']._description_selection(self.env))
+        customer_dict = {}
+        type_summary = []
+        for partner, move_type, count, total, residual in Move._read_group(
+                domain + [('partner_id', '!=', False)], ['partner_id', 'move_type'], aggregates):
+            summary = customer_dict.setdefault(partner, {
+                'partner_name': partner.name or 'Unknown',
+                'invoice_count': 0,
+                'total_amount': 0.0,
+                'total_due': 0.0,
+            })
+            summary['invoice_count'] += count
+            summary['total_amount'] += total or 0.0
+            summary['total_due'] += residual or 0.0
+            type_summary.append({
+                'partner_name': partner.name or 'Unknown',
+                'move_type': type_labels.get(move_type, move_type),
+                'invoice_count': count,
+                'total_amount': total or 0.0,
+                'total_due': residual or 0.0,
+            })
+        customer_summary = sorted(customer_dict.values(), key=lambda x: x['total_amount'], reverse=True)
+        type_summary.sort(key=lambda x: (x['partner_name'], x['move_type']))
+
+        # Overdue buckets of the open invoices
+        overdue_summary = self._get_overdue(domain, fields.Date.context_today(self))
+        bounds = (0,) + self._overdue_boundaries
+        overdue_labels = ['Not Due'] + [
+            '%d-%d' % (low + 1, high) for low, high in zip(bounds, bounds[1:])
+        ] + ['%d+' % bounds[-1]]
+        overdue_totals = [sum(row['buckets'][index] for row in overdue_summary) for index in range(len(overdue_labels))]
         
         # Get invoice type label
         invoice_type_labels = {
@@ -245,20 +242,13 @@ class InvoiceStatusReport(models.AbstractModel):
             'payment_state_filter': payment_state or 'all',
             'state_label': state_label,
             'payment_state_label': payment_state_label,
-            'invoices': invoices,
-            'invoice_count': len(invoices),
-            'draft_invoices': draft_invoices,
-            'draft_count': len(draft_invoices),
-            'posted_invoices': posted_invoices,
-            'posted_count': len(posted_invoices),
-            'cancelled_invoices': cancelled_invoices,
-            'cancelled_count': len(cancelled_invoices),
-            'not_paid': not_paid,
-            'not_paid_count': len(not_paid),
-            'partial_paid': partial_paid,
-            'partial_count': len(partial_paid),
-            'paid': paid,
-            'paid_count': len(paid),
+            'invoice_count': invoice_count,
+            'draft_count': draft_count,
+            'posted_count': posted_count,
+            'cancelled_count': cancelled_count,
+            'not_paid_count': not_paid_count,
+            'partial_count': partial_count,
+            'paid_count': paid_count,
             'total_draft': float(total_draft),
             'total_posted': float(total_posted),
             'total_cancelled': float(total_cancelled),
@@ -268,5 +258,9 @@ class InvoiceStatusReport(models.AbstractModel):
             'grand_total': float(grand_total),
             'total_due': float(total_due),
             'customer_summary': customer_summary,
+            'type_summary': type_summary,
+            'overdue_labels': overdue_labels,
+            'overdue_summary': overdue_summary,
+            'overdue_totals': overdue_totals,
             'company_name': self.env.company.name or 'Company',
-        }
\ No newline at end of file
+        }
@@ -1,8 +1,8 @@
 # -*- coding: utf-8 -*-
 from odoo import api, fields, models, _
 from odoo.exceptions import UserError
-import io, base64
 from datetime import datetime
+from itertools import groupby
 
 try:
     import xlsxwriter
@@ -12,6 +12,8 @@ except Exception:
 class JournalRegisterReport(models.TransientModel):
     _name = 'journal.register.report'
     _description = 'Journal Register Report'
+    _inherit = ['report.background.mixin', 'report.preview.mixin']
+    _preview_line_model = 'journal.register.line'
 
     date_from = fields.Date(string='Start Date', required=True, default=fields.Date.context_today)
     date_to = fields.Date(string='End Date', required=True, default=fields.Date.context_today)
@@ -20,75 +22,77 @@ class JournalRegisterReport(models.TransientModel):
         ('posted', 'Posted Entries'),
         ('all', 'All Entries')
     ], string='Target Moves', required=True, default='posted')
-    line_ids = fields.One2many('journal.register.line', 'report_id', string='Lines')
+    total_debit = fields.Float(string='Total Debit', compute='_compute_totals')
+    total_credit = fields.Float(string='Total Credit', compute='_compute_totals')
+
+    def _compute_totals(self):
+        for rec in self:
+            totals = rec._preview_totals('debit', 'credit')
+            rec.total_debit = totals['debit']
+            rec.total_credit = totals['credit']
 
     def action_view_report(self):
         """Fetch and display journal register data"""
-        self.line_ids.unlink()
-        
-        # Build domain
-        domain = [
-            ('journal_id', 'in', self.journal_ids.ids),
-            ('date', '>=', self.date_from),
-            ('date', '<=', self.date_to),
-        ]
-        
+        return self._action_preview()
+
+    def _get_register_rows(self):
+        """Yield the journal items of the register as plain tuples.
+
+        Headers and lines of all selected journals come from one joined
+        query, ordered by entry, and are fetched in batches through a
+        server-side cursor so they can be written out as they arrive. Each tuple holds the move id, date,
+        name, journal, partner, reference and state label followed by the
+        account code and name, label, partner, debit and credit of the line,
+        which are empty for an entry without items.
+        """
+        self.ensure_one()
+        for model in ('account.move', 'account.move.line', 'account.account', 'account.journal', 'res.partner'):
+            self.env[model].flush_model()
+        states = dict(self.env['account.move']._fields['state']._description_selection(self.env))
+        query = """
+            SELECT am.id, am.date, am.name,
+                   COALESCE(aj.name->>%(lang)s, aj.name->>'en_US'),
+                   mp.name, am.ref, am.state,
+                   acc.code, COALESCE(acc.name->>%(lang)s, acc.name->>'en_US'),
+                   aml.name, lp.name, aml.debit, aml.credit
+              FROM account_move am
+              JOIN account_journal aj ON aj.id = am.journal_id
+         LEFT JOIN res_partner mp ON mp.id = am.partner_id
+         LEFT JOIN account_move_line aml ON aml.move_id = am.id
+         LEFT JOIN account_account acc ON acc.id = aml.account_id
+         LEFT JOIN res_partner lp ON lp.id = aml.partner_id
+             WHERE am.journal_id IN %(journal_ids)s
+               AND am.date BETWEEN %(date_from)s AND %(date_to)s
+               AND am.company_id IN %(company_ids)s
+        """
         if self.target_move == 'posted':
-            domain.append(('state', '=', 'posted'))
-        
-        # Get journal entries
-        journal_entries = self.env['account.move'].search(domain, order='date, name')
-        
-        lines_to_create = []
-        
-        for move in journal_entries:
-            # Create journal entry header
-            lines_to_create.append({
-                'report_id': self.id,
-                'is_header': True,
-                'move_id': move.id,
-                'move_name': move.name or '',
-                'move_date': move.date,
-                'journal_id': move.journal_id.id,
-                'journal_name': move.journal_id.name,
-                'partner_id': move.partner_id.id if move.partner_id else False,
-                'partner_name': move.partner_id.name if move.partner_id else '',
-                'reference': move.ref or '',
-                'state': dict(move._fields['state'].selection).get(move.state, move.state),
-            })
-            
-            # Create lines for each move line
-            for line in move.line_ids:
-                lines_to_create.append({
-                    'report_id': self.id,
-                    'is_header': False,
-                    'move_id': move.id,
-                    'account_code': line.account_id.code or '',
-                    'account_name': line.account_id.name or '',
-                    'line_name': line.name or '',
-                    'line_partner': line.partner_id.name if line.partner_id else '',
-                    'debit': line.debit,
-                    'credit': line.credit,
-                    'balance': line.debit - line.credit,
-                })
-        
-        self.env['journal.register.line'].create(lines_to_create)
-        
-        return {
-            'type': 'ir.actions.act_window',
-            'res_model': 'journal.register.report',
-            'view_mode': 'form',
-            'res_id': self.id,
-            'target': 'new',
-        }
+            query += " AND am.state = 'posted'"
+        query += " ORDER BY am.date, am.name, am.id, aml.id"
+        rows = self.env['report.center']._iter_query_rows(query, {
+            'journal_ids': tuple(self.journal_ids.ids) or (None,),
+            'date_from': self.date_from,
+            'date_to': self.date_to,
+            'company_ids': tuple(self.env.companies.ids),
+            'lang': self.env.lang or 'en_US',
+        })
+        for row in rows:
+            yield row[:6] + (states.get(row[6], row[6] or ''),) + row[7:]
+
+    def _get_register_entries(self):
+        """Yield ``(header, lines)`` per journal entry from the register rows."""
+        for _move_id, rows in groupby(self._get_register_rows(), key=lambda row: row[0]):
+            rows = list(rows)
+            # an entry without items still gets its header
+            yield rows[0][1:7], [row[7:] for row in rows if row[11] is not None]
 
     def action_download_xlsx(self):
         """Download Excel report"""
         if xlsxwriter is None:
             raise UserError(_('Python library xlsxwriter is required for Excel export.'))
         
-        workbook_stream = io.BytesIO()
-        workbook = xlsxwriter.Workbook(workbook_stream, {'in_memory': True})
+        # rows are written in order, straight to a temporary file
+        ReportCenter = self.env['report.center']
+        workbook, path = ReportCenter._open_streamed_workbook()
         sheet = workbook.add_worksheet('Journal Register')
         
         # Formats
@@ -124,43 +128,31 @@ class JournalRegisterReport(models.TransientModel):
         for col, header in enumerate(headers):
             sheet.write(row, col, header, header_format)
         
-        # Build domain
-        domain = [
-            ('journal_id', 'in', self.journal_ids.ids),
-            ('date', '>=', self.date_from),
-            ('date', '<=', self.date_to),
-        ]
-        
-        if self.target_move == 'posted':
-            domain.append(('state', '=', 'posted'))
-        
-        # Get journal entries
-        journal_entries = self.env['account.move'].search(domain, order='date, name')
-        
         row = 5
         total_debit = 0
         total_credit = 0
         
-        for move in journal_entries:
+        for header, lines in self._get_register_entries():
+            move_date, move_name, journal_name, partner_name, reference, state = header
             # Move header row
-            sheet.write(row, 0, move.date, date_format)
-            sheet.write(row, 1, move.name or '', move_header_format)
-            sheet.write(row, 2, move.journal_id.name, move_header_format)
-            sheet.write(row, 3, move.partner_id.name if move.partner_id else '', move_header_format)
-            sheet.write(row, 4, move.ref or '', move_header_format)
-            sheet.write(row, 5, dict(move._fields['state'].selection).get(move.state, move.state), move_header_format)
+            sheet.write(row, 0, move_date, date_format)
+            sheet.write(row, 1, move_name or '', move_header_format)
+            sheet.write(row, 2, journal_name or '', move_header_format)
+            sheet.write(row, 3, partner_name or '', move_header_format)
+            sheet.write(row, 4, reference or '', move_header_format)
+            sheet.write(row, 5, state, move_header_format)
             row += 1
             
             # Move lines
-            for line in move.line_ids:
-                sheet.write(row, 5, f"{line.account_id.code or ''} - {line.account_id.name or ''}")
-                sheet.write(row, 6, line.name or '')
-                sheet.write(row, 7, line.debit, number_format)
-                sheet.write(row, 8, line.credit, number_format)
-                sheet.write(row, 9, line.debit - line.credit, number_format)
+            for account_code, account_name, label, _partner, debit, credit in lines:
+                sheet.write(row, 5, f"{account_code or ''} - {account_name or ''}")
+                sheet.write(row, 6, label or '')
+                sheet.write(row, 7, debit, number_format)
+                sheet.write(row, 8, credit, number_format)
+                sheet.write(row, 9, debit - credit, number_format)
                 
-                total_debit += line.debit
-                total_credit += line.credit
+                total_debit += debit
+                total_credit += credit
                 row += 1
             
             # Blank row between entries
@@ -184,29 +176,21 @@ class JournalRegisterReport(models.TransientModel):
 
         workbook.close()
         
-        attachment = self.env['ir.attachment'].create({
-            'name': f'journal_register_{self.date_from}_{self.date_to}.xlsx',
-            'type': 'binary',
-            'datas': base64.b64encode(workbook_stream.getvalue()),
-            'mimetype': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-        })
-        
-        return {
-            'type': 'ir.actions.act_url',
-            'url': f'/web/content/{attachment.id}?download=true',
-            'target': 'self',
-        }
+        return ReportCenter._make_xlsx_file_attachment_action(
+            path, f'journal_register_{self.date_from}_{self.date_to}.xlsx')
 
     def action_download_pdf(self):
         """Download PDF report"""
         return self.env.ref('all_reports_full.report_journal_register_pdf').report_action(self)
 
 
-class JournalRegisterLine(models.TransientModel):
+class JournalRegisterLine(models.Model):
     _name = 'journal.register.line'
+    _inherit = 'report.preview.line'
     _description = 'Journal Register Line'
+    _auto = False
+    _report_model = 'journal.register.report'
 
-    report_id = fields.Many2one('journal.register.report', string='Report', ondelete='cascade')
     
     # Header fields (for journal entry header)
     is_header = fields.Boolean(string='Is Header', default=False)
@@ -218,7 +202,7 @@ class JournalRegisterLine(models.TransientModel):
     partner_id = fields.Many2one('res.partner', string='Partner')
     partner_name = fields.Char(string='Partner Name')
     reference = fields.Char(string='Reference')
-    state = fields.Char(string='Status')
+    state = fields.Selection(selection='_get_move_states', string='Status')
     
     # Line fields (for journal entry lines)
     account_code = fields.Char(string='Account Code')
@@ -227,4 +211,81 @@ class JournalRegisterLine(models.TransientModel):
     line_partner = fields.Char(string='Partner')
     debit = fields.Float(string='Debit', digits=(16, 2))
     credit = fields.Float(string='Credit', digits=(16, 2))
-    balance = fields.Float(string='Balance', digits=(16, 2))
\ No newline at end of file
+    balance = fields.Float(string='Balance', digits=(16, 2))
+
+    @api.model
+    def _get_move_states(self):
+        return self.env['account.move']._fields['state']._description_selection(self.env)
+
+    def _preview_query(self):
+        journals = self.env['journal.register.report']._fields['journal_ids']
+        return f"""
+            SELECT rows.*,
+                   ROW_NUMBER() OVER (ORDER BY sort_date, sort_name, move_id, is_header DESC, line_order) AS sequence
+              FROM (
+                    SELECT am.id * 2 + 1 AS id,
+                           w.id AS report_id,
+                           TRUE AS is_header,
+                           am.id AS move_id,
+                           am.name AS move_name,
+                           am.date AS move_date,
+                           am.journal_id,
+                           COALESCE(aj.name->>%(lang)s, aj.name->>'en_US') AS journal_name,
+                           am.partner_id,
+                           rp.name AS partner_name,
+                           am.ref AS reference,
+                           am.state,
+                           NULL AS account_code,
+                           NULL AS account_name,
+                           NULL AS line_name,
+                           NULL AS line_partner,
+                           NULL::numeric AS debit,
+                           NULL::numeric AS credit,
+                           NULL::numeric AS balance,
+                           am.date AS sort_date,
+                           am.name AS sort_name,
+                           0 AS line_order
+                      FROM journal_register_report w
+                      JOIN {journals.relation} rel ON rel.{journals.column1} = w.id
+                      JOIN account_move am ON am.journal_id = rel.{journals.column2}
+                      JOIN account_journal aj ON aj.id = am.journal_id
+                 LEFT JOIN res_partner rp ON rp.id = am.partner_id
+                     WHERE w.id = %(report_id)s
+                       AND am.date BETWEEN w.date_from AND w.date_to
+                       AND (w.target_move = 'all' OR am.state = 'posted')
+                       AND am.company_id IN %(company_ids)s
+                 UNION ALL
+                    SELECT aml.id * 2 AS id,
+                           w.id AS report_id,
+                           FALSE AS is_header,
+                           am.id AS move_id,
+                           NULL AS move_name,
+                           NULL AS move_date,
+                           NULL AS journal_id,
+                           NULL AS journal_name,
+                           NULL AS partner_id,
+                           NULL AS partner_name,
+                           NULL AS reference,
+                           NULL AS state,
+                           acc.code AS account_code,
+                           COALESCE(acc.name->>%(lang)s, acc.name->>'en_US') AS account_name,
+                           aml.name AS line_name,
+                           rp.name AS line_partner,
+                           aml.debit,
+                           aml.credit,
+                           aml.debit - aml.credit AS balance,
+                           am.date AS sort_date,
+                           am.name AS sort_name,
+                           aml.id AS line_order
+                      FROM journal_register_report w
+                      JOIN {journals.relation} rel ON rel.{journals.column1} = w.id
+                      JOIN account_move am ON am.journal_id = rel.{journals.column2}
+                      JOIN account_move_line aml ON aml.move_id = am.id
+                      JOIN account_account acc ON acc.id = aml.account_id
+                 LEFT JOIN res_partner rp ON rp.id = aml.partner_id
+                     WHERE w.id = %(report_id)s
+                       AND am.date BETWEEN w.date_from AND w.date_to
+                       AND (w.target_move = 'all' OR am.state = 'posted')
+                       AND am.company_id IN %(company_ids)s
+                   ) rows
+        """, {}
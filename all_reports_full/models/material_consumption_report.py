@@ -3,6 +3,8 @@ from odoo import api, fields, models, _
 from odoo.exceptions import UserError
 import io, base64
 
+from .consumption_engine import PERIODS, USAGES
+
 try:
     import xlsxwriter
 except Exception:
@@ -11,91 +13,28 @@ except Exception:
 class MaterialConsumptionReport(models.TransientModel):
     _name = 'material.consumption.report'
     _description = 'Material Consumption Report'
+    _inherit = ['report.background.mixin', 'report.preview.mixin']
+    _preview_line_model = 'material.consumption.line'
     
 
     date_from = fields.Date(string='From Date', required=True)
     date_to = fields.Date(string='To Date', required=True)
     product_id = fields.Many2one('product.product', string='Product')
     categ_id = fields.Many2one('product.category', string='Product Category')
-    line_ids = fields.One2many('material.consumption.line', 'report_id', string='Lines')
+    period = fields.Selection(PERIODS, string='Summarize By', required=True, default='month')
+    total_quantity = fields.Float(string='Total Quantity', compute='_compute_totals')
+
+    def _compute_totals(self):
+        for rec in self:
+            rec.total_quantity = rec._preview_totals('quantity')['quantity']
 
     def action_view_report(self):
         """Fetch and display report data"""
-        self.line_ids.unlink()
-        
-        # Build domain for stock moves
-        domain = [
-            ('date', '>=', self.date_from),
-            ('date', '<=', self.date_to),
-            ('state', '=', 'done'),
-            ('location_id.usage', '=', 'internal'),
-        ]
-        
-        # Filter by product
-        if self.product_id:
-            domain.append(('product_id', '=', self.product_id.id))
-        elif self.categ_id:
-            # Get all products in category
-            products = self.env['product.product'].search([
-                ('categ_id', 'child_of', self.categ_id.id)
-            ])
-            domain.append(('product_id', 'in', products.ids))
-        
-        # Get consumed moves (moved out from internal locations)
-        moves = self.env['stock.move'].search(domain)
-        
-        lines_to_create = []
-        for move in moves:
-            # Determine where the product was used
-            used_in = ''
-            reference = ''
-            
-            if move.raw_material_production_id:
-                # Used in manufacturing
-                used_in = 'Manufacturing Order'
-                reference = move.raw_material_production_id.name
-                product_produced = move.raw_material_production_id.product_id.name
-            elif move.location_dest_id.usage == 'production':
-                used_in = 'Production'
-                reference = move.reference or move.picking_id.name if move.picking_id else ''
-                product_produced = 'Production Location'
-            elif move.location_dest_id.usage == 'customer':
-                used_in = 'Customer Delivery'
-                reference = move.picking_id.name if move.picking_id else move.reference or ''
-                product_produced = move.partner_id.name if move.partner_id else 'Customer'
-            elif move.location_dest_id.usage == 'inventory':
-                used_in = 'Inventory Adjustment'
-                reference = move.reference or ''
-                product_produced = 'Adjustment'
-            else:
-                used_in = f'{move.location_dest_id.name}'
-                reference = move.reference or move.picking_id.name if move.picking_id else ''
-                product_produced = move.location_dest_id.complete_name
-            
-            lines_to_create.append({
-                'report_id': self.id,
-                'date': move.date,
-                'product_name': move.product_id.name,
-                'product_code': move.product_id.default_code or '',
-                'category': move.product_id.categ_id.name if move.product_id.categ_id else '',
-                'quantity': move.product_uom_qty,
-                'uom': move.product_uom.name,
-                'used_in': used_in,
-                'reference': reference,
-                'produced_product': product_produced,
-                'source_location': move.location_id.complete_name,
-                'dest_location': move.location_dest_id.complete_name,
-            })
-        
-        self.env['material.consumption.line'].create(lines_to_create)
-        
-        return {
-            'type': 'ir.actions.act_window',
-            'res_model': 'material.consumption.report',
-            'view_mode': 'form',
-            'res_id': self.id,
-            'target': 'new',
-        }
+        return self._action_preview()
+
+    def action_view_summary(self):
+        """Display the consumption summary by period"""
+        return self._action_preview('material.consumption.summary')
 
     def action_download_xlsx(self):
         """Download Excel report"""
@@ -114,7 +53,7 @@ class MaterialConsumptionReport(models.TransientModel):
         
         # Data
         row = 1
-        for line in self.line_ids:
+        for line in self._preview_lines():
             sheet.write(row, 0, str(line.date))
             sheet.write(row, 1, line.product_name)
             sheet.write(row, 2, line.product_code)
@@ -128,6 +67,25 @@ class MaterialConsumptionReport(models.TransientModel):
             sheet.write(row, 10, line.dest_location)
             row += 1
         
+        # Summary per product, usage and period
+        summary = workbook.add_worksheet('Summary')
+        headers = ['Period', 'Product', 'Code', 'Category', 'Used In', 'Moves', 'Quantity', 'UOM', 'Value']
+        for col, h in enumerate(headers):
+            summary.write(0, col, h)
+        row = 1
+        for item in self._get_summary():
+            product = item['product']
+            summary.write(row, 0, str(item['period_start']))
+            summary.write(row, 1, product.name)
+            summary.write(row, 2, product.default_code or '')
+            summary.write(row, 3, item['category'].name or '')
+            summary.write(row, 4, item['usage_label'])
+            summary.write(row, 5, item['move_count'])
+            summary.write(row, 6, float(item['quantity'] or 0.0))
+            summary.write(row, 7, product.uom_id.name)
+            summary.write(row, 8, float(item['value'] or 0.0))
+            row += 1
+        
         workbook.close()
         
         attachment = self.env['ir.attachment'].create({
@@ -145,14 +103,22 @@ class MaterialConsumptionReport(models.TransientModel):
 
     def action_download_pdf(self):
         """Download PDF report"""
-        return self.env.ref('all_reports_full.report_material_consumption_pdf').report_action(self)
+        return self._report_action_preview('all_reports_full.report_material_consumption_pdf')
 
+    def _get_summary(self):
+        """Consumption grouped by product, category, usage and period"""
+        self.ensure_one()
+        return self.env['report.center.consumption']._get_summary(
+            self.date_from, self.date_to, self.product_id.id, self.categ_id.id, self.period)
 
-class MaterialConsumptionLine(models.TransientModel):
+
+class MaterialConsumptionLine(models.Model):
     _name = 'material.consumption.line'
+    _inherit = 'report.preview.line'
     _description = 'Material Consumption Line'
+    _auto = False
+    _report_model = 'material.consumption.report'
 
-    report_id = fields.Many2one('material.consumption.report', string='Report', ondelete='cascade')
     date = fields.Datetime(string='Date')
     product_name = fields.Char(string='Product')
     product_code = fields.Char(string='Product Code')
@@ -163,4 +129,112 @@ class MaterialConsumptionLine(models.TransientModel):
     reference = fields.Char(string='Reference')
     produced_product = fields.Char(string='For Product/Location')
     source_location = fields.Char(string='Source Location')
-    dest_location = fields.Char(string='Destination Location')
\ No newline at end of file
+    dest_location = fields.Char(string='Destination Location')
+
+    def _preview_query(self):
+        report = self._get_preview_report()
+        today = fields.Date.context_today(self)
+        query, params = self.env['report.center.consumption']._get_moves_query(
+            report.date_from or today, report.date_to or today, report.product_id.id, report.categ_id.id)
+        # manufacturing orders only exist with mrp installed
+        if 'raw_material_production_id' in self.env['stock.move']._fields:
+            mo_join = """
+                 LEFT JOIN mrp_production mo ON mo.id = sm.raw_material_production_id
+                 LEFT JOIN product_product mo_pp ON mo_pp.id = mo.product_id
+                 LEFT JOIN product_template mo_pt ON mo_pt.id = mo_pp.product_tmpl_id"""
+            mo_reference, mo_product = (
+                "WHEN 'manufacturing' THEN mo.name",
+                "WHEN 'manufacturing' THEN COALESCE(mo_pt.name->>%(lang)s, mo_pt.name->>'en_US')",
+            )
+        else:
+            mo_join = mo_reference = mo_product = ""
+        return f"""
+            SELECT m.move_id AS id,
+                   %(report_id)s AS report_id,
+                   ROW_NUMBER() OVER (ORDER BY sm.sequence, sm.id) AS sequence,
+                   sm.date,
+                   COALESCE(pt.name->>%(lang)s, pt.name->>'en_US') AS product_name,
+                   COALESCE(pp.default_code, '') AS product_code,
+                   COALESCE(pc.name, '') AS category,
+                   m.quantity,
+                   COALESCE(uom.name->>%(lang)s, uom.name->>'en_US') AS uom,
+                   CASE m.usage
+                        WHEN 'manufacturing' THEN 'Manufacturing Order'
+                        WHEN 'production' THEN 'Production'
+                        WHEN 'customer' THEN 'Customer Delivery'
+                        WHEN 'inventory' THEN 'Inventory Adjustment'
+                        ELSE ld.name
+                   END AS used_in,
+                   CASE m.usage {mo_reference}
+                        WHEN 'customer' THEN COALESCE(sp.name, sm.reference, '')
+                        WHEN 'inventory' THEN COALESCE(sm.reference, '')
+                        ELSE CASE WHEN sp.id IS NOT NULL THEN COALESCE(NULLIF(sm.reference, ''), sp.name) ELSE '' END
+                   END AS reference,
+                   CASE m.usage {mo_product}
+                        WHEN 'production' THEN 'Production Location'
+                        WHEN 'customer' THEN COALESCE(rp.name, 'Customer')
+                        WHEN 'inventory' THEN 'Adjustment'
+                        ELSE ld.complete_name
+                   END AS produced_product,
+                   ls.complete_name AS source_location,
+                   ld.complete_name AS dest_location
+              FROM ({query}) m
+              JOIN stock_move sm ON sm.id = m.move_id
+              JOIN stock_location ls ON ls.id = sm.location_id
+              JOIN stock_location ld ON ld.id = sm.location_dest_id
+              JOIN product_product pp ON pp.id = sm.product_id
+              JOIN product_template pt ON pt.id = pp.product_tmpl_id
+         LEFT JOIN product_category pc ON pc.id = pt.categ_id
+              JOIN uom_uom uom ON uom.id = pt.uom_id
+         LEFT JOIN stock_picking sp ON sp.id = sm.picking_id
+         LEFT JOIN res_partner rp ON rp.id = sm.partner_id{mo_join}
+             WHERE %(report_id)s IS NOT NULL
+        """, params
+
+
+class MaterialConsumptionSummary(models.Model):
+    _name = 'material.consumption.summary'
+    _inherit = 'report.preview.line'
+    _description = 'Material Consumption Summary'
+    _auto = False
+    _report_model = 'material.consumption.report'
+
+    period_start = fields.Date(string='Period')
+    product_id = fields.Many2one('product.product', string='Product')
+    categ_id = fields.Many2one('product.category', string='Category')
+    usage = fields.Selection(USAGES, string='Used In')
+    move_count = fields.Integer(string='Moves')
+    quantity = fields.Float(string='Quantity')
+    uom_id = fields.Many2one('uom.uom', string='UOM', related='product_id.uom_id')
+    value = fields.Float(string='Value')
+
+    def _preview_query(self):
+        report = self._get_preview_report()
+        today = fields.Date.context_today(self)
+        query, params = self.env['report.center.consumption']._get_summary_query(
+            report.date_from or today, report.date_to or today,
+            report.product_id.id, report.categ_id.id, report.period or 'month')
+        return f"""
+            SELECT ROW_NUMBER() OVER (ORDER BY s.period_start, s.product_id, s.usage) AS id,
+                   %(report_id)s AS report_id,
+                   ROW_NUMBER() OVER (ORDER BY s.period_start, s.product_id, s.usage) AS sequence,
+                   s.*
+              FROM ({query}) s
+             WHERE %(report_id)s IS NOT NULL
+        """, params
+
+    def action_open_moves(self):
+        """Drill down into the moves consumed for this product, usage and period"""
+        self.ensure_one()
+        report = self.env['material.consumption.report'].browse(self.report_id)
+        move_ids = self.env['report.center.consumption']._get_move_ids(
+            report.date_from, report.date_to, self.product_id.id, self.usage, report.period, self.period_start)
+        return {
+            'type': 'ir.actions.act_window',
+            'name': _('Consumed Moves'),
+            'res_model': 'stock.move',
+            'view_mode': 'tree,form',
+            'domain': [('id', 'in', move_ids)],
+            'context': {'create': False},
+            'target': 'new',
+        }
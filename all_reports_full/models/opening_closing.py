@@ -13,6 +13,8 @@ except Exception:
 class OpeningClosingWizard(models.TransientModel):
     _name = "opening.closing.report.wizard"
     _description = "Opening & Closing Balance Report Wizard"
+    _inherit = ["report.background.mixin"]
+    _background_method = "action_export"
 
     start_date = fields.Date(required=True)
     end_date = fields.Date(required=True)
@@ -35,43 +37,7 @@ class OpeningClosingWizard(models.TransientModel):
     #  CALCULATE BALANCES
     # -----------------------------
     def _get_balance_data(self):
-        start = self.start_date
-        end = self.end_date
-
-        accounts = self.env['account.account'].search([], order='code')
-        result = []
-
-        for acc in accounts:
-            # Opening
-            ob_domain = [
-                ('account_id', '=', acc.id),
-                ('date', '<', start),
-                ('parent_state', '=', 'posted')
-            ]
-            opening = sum(self.env['account.move.line'].search(ob_domain).mapped(lambda l: l.debit - l.credit))
-
-            # Period Movement
-            pr_domain = [
-                ('account_id', '=', acc.id),
-                ('date', '>=', start),
-                ('date', '<=', end),
-                ('parent_state', '=', 'posted')
-            ]
-            lines = self.env['account.move.line'].search(pr_domain)
-            debit = sum(lines.mapped('debit'))
-            credit = sum(lines.mapped('credit'))
-
-            closing = opening + debit - credit
-
-            result.append({
-                'account': acc,
-                'opening': opening,
-                'debit': debit,
-                'credit': credit,
-                'closing': closing
-            })
-
-        return result
+        return self.env['report.center.trial.balance']._get_balances(self.start_date, self.end_date)
 
     # -----------------------------
     #  EXCEL EXPORT
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 from odoo import api, fields, models
+from .report_perf_log import instrument_report
 
 
 class OutstandingCreditNotesWizard(models.TransientModel):
@@ -42,6 +43,7 @@ class ReportOutstandingCreditNotes(models.AbstractModel):
     _description = "Outstanding Credit Notes QWeb Report"
 
     @api.model
+    @instrument_report()
     def _get_report_values(self, docids, data=None):
         # read data
         date_from = data.get("date_from")
@@ -58,44 +60,8 @@ class ReportOutstandingCreditNotes(models.AbstractModel):
             # supplier credit notes
             move_types.append("in_refund")
 
-        domain = [
-            ("move_type", "in", move_types),
-            ("state", "=", "posted"),
-            ("amount_residual", ">", 0.0),
-            ("invoice_date", "<=", date_to) if date_to else ("invoice_date", "!=", False),
-        ]
-
-        # If date_from provided, consider only credit notes dated on/after date_from
-        if date_from:
-            domain.append(("invoice_date", ">=", date_from))
-
-        if partner_ids:
-            domain.append(("partner_id", "in", partner_ids))
-
-        # search moves
-        moves = self.env["account.move"].search(domain, order="partner_id, invoice_date, id")
-
-        # prepare report data structure: grouped by partner
-        partners = {}
-        grand_total = 0.0
-        for m in moves:
-            pid = m.partner_id.id or 0
-            partners.setdefault(pid, {"partner": m.partner_id, "lines": [], "total_residual": 0.0})
-            line = {
-                "move_id": m.id,
-                "move_name": m.name or m.display_name,
-                "date": m.invoice_date,
-                "journal": m.journal_id.name,
-                "origin": m.invoice_origin or m.ref or "",
-                "amount_total": m.amount_total,
-                "amount_residual": m.amount_residual,
-                "currency": m.currency_id,
-            }
-            partners[pid]["lines"].append(line)
-            partners[pid]["total_residual"] += m.amount_residual
-            grand_total += m.amount_residual
-
-        grouped = [partners[k] for k in sorted(partners.keys(), key=lambda x: (partners[x]["partner"].name or ""))]
+        credit_notes = self.env["report.center.payments"]._get_credit_notes(
+            date_to, date_from, partner_ids, move_types)
 
         return {
             "doc_ids": docids,
@@ -104,6 +70,7 @@ class ReportOutstandingCreditNotes(models.AbstractModel):
             "date_from": date_from,
             "date_to": date_to,
             "partner_type": partner_type,
-            "grouped": grouped,
-            "grand_total": grand_total,
+            "grouped": credit_notes["by_partner"],
+            "by_journal": credit_notes["by_journal"],
+            "grand_total": credit_notes["total"],
         }
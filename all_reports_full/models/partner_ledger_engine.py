@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+from odoo import api, models
+
+
+class PartnerLedgerEngine(models.AbstractModel):
+    _name = 'report.center.partner.ledger'
+    _description = 'Partner Ledger Engine'
+
+    @api.model
+    def _get_ledger(self, date_from, date_to, account_type, partner_ids=None, partner_domain=None):
+        """Return opening balance, entries and closing balance per partner.
+
+        Openings of all partners come from one grouped query and the period
+        entries from one query whose running balance is a cumulative sum
+        partitioned by partner. Partners with neither an opening balance nor
+        entries are left out. Without ``partner_ids`` the partners are
+        restricted to ``partner_domain``. Results are cached until the ledger
+        up to ``date_to`` changes.
+        """
+        return self.env['report.result.cache']._cached(
+            'partner_ledger', {
+                'date_from': date_from,
+                'date_to': date_to,
+                'account_type': account_type,
+                'partner_ids': sorted(partner_ids or []),
+                'partner_domain': partner_domain or [],
+            },
+            lambda: self._compute_ledger(date_from, date_to, account_type, partner_ids, partner_domain))
+
+    @api.model
+    def _compute_ledger(self, date_from, date_to, account_type, partner_ids, partner_domain):
+        accounts = self.env['account.account'].search([('account_type', '=', account_type)])
+        if not accounts:
+            return []
+        openings = self.env['account.balance.snapshot']._get_partner_opening_balances(
+            date_from, accounts.ids, partner_ids=partner_ids)
+
+        self.env['account.move.line'].flush_model()
+        self.env['account.move'].flush_model(['name', 'ref'])
+        query = """
+            SELECT aml.partner_id,
+                   aml.date,
+                   am.name,
+                   COALESCE(aj.name->>%(lang)s, aj.name->>'en_US'),
+                   COALESCE(NULLIF(aml.name, ''), am.ref),
+                   aml.debit,
+                   aml.credit,
+                   SUM(aml.debit - aml.credit) OVER (
+                       PARTITION BY aml.partner_id ORDER BY aml.date, aml.id
+                   ) AS running
+              FROM account_move_line aml
+              JOIN account_move am ON am.id = aml.move_id
+              JOIN account_journal aj ON aj.id = aml.journal_id
+             WHERE aml.parent_state = 'posted'
+               AND aml.partner_id IS NOT NULL
+               AND aml.date >= %(date_from)s
+               AND aml.date <= %(date_to)s
+               AND aml.account_id IN %(account_ids)s
+               AND aml.company_id IN %(company_ids)s
+        """
+        params = {
+            'lang': self.env.lang or 'en_US',
+            'date_from': date_from,
+            'date_to': date_to,
+            'account_ids': tuple(accounts.ids),
+            'company_ids': tuple(self.env.companies.ids),
+        }
+        if partner_ids:
+            query += " AND aml.partner_id IN %(partner_ids)s"
+            params['partner_ids'] = tuple(partner_ids)
+        query += " ORDER BY aml.partner_id, aml.date, aml.id"
+        self.env.cr.execute(query, params)
+
+        entries_by_partner = {}
+        for partner_id, line_date, ref, journal, label, debit, credit, running in self.env.cr.fetchall():
+            entries_by_partner.setdefault(partner_id, []).append({
+                'date': line_date,
+                'ref': ref or '',
+                'journal': journal,
+                'description': label or '',
+                'debit': debit,
+                'credit': credit,
+                'balance': openings.get(partner_id, 0.0) + running,
+            })
+
+        active_ids = set(entries_by_partner) | {pid for pid, balance in openings.items() if balance != 0}
+        Partner = self.env['res.partner']
+        domain = [('id', 'in', list(active_ids))]
+        if partner_ids:
+            Partner = Partner.with_context(active_test=False)
+        elif partner_domain:
+            domain += partner_domain
+        partners = Partner.search(domain, order='name')
+
+        result = []
+        for partner in partners:
+            opening = openings.get(partner.id, 0.0)
+            entries = entries_by_partner.get(partner.id, [])
+            result.append({
+                'partner': partner,
+                'opening_balance': opening,
+                'entries': entries,
+                'closing_balance': entries[-1]['balance'] if entries else opening,
+                'total_debit': sum(e['debit'] for e in entries),
+                'total_credit': sum(e['credit'] for e in entries),
+            })
+        return result
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+from datetime import timedelta
+
+from odoo import api, fields, models
+
+
+class PaymentEngine(models.AbstractModel):
+    _name = 'report.center.payments'
+    _description = 'Payment and Credit Note Engine'
+
+    @api.model
+    def _get_collections_query(self, date_from, date_to, partner_ids=None):
+        """Return the SQL and parameters of the posted inbound payments in range."""
+        self.env['account.payment'].flush_model(['move_id', 'payment_type', 'amount'])
+        self.env['account.move'].flush_model(['date', 'name', 'ref', 'state', 'partner_id', 'journal_id', 'company_id'])
+        query = """
+            SELECT ap.id AS payment_id,
+                   am.date,
+                   am.name,
+                   am.ref,
+                   am.partner_id,
+                   rp.name AS partner,
+                   am.journal_id,
+                   COALESCE(aj.name->>%(lang)s, aj.name->>'en_US') AS journal,
+                   ap.amount
+              FROM account_payment ap
+              JOIN account_move am ON am.id = ap.move_id
+              JOIN account_journal aj ON aj.id = am.journal_id
+         LEFT JOIN res_partner rp ON rp.id = am.partner_id
+             WHERE ap.payment_type = 'inbound'
+               AND am.state = 'posted'
+               AND am.date >= %(date_from)s
+               AND am.date < %(date_to)s
+               AND am.company_id IN %(company_ids)s
+        """
+        params = {
+            'lang': self.env.lang or 'en_US',
+            'date_from': date_from,
+            'date_to': fields.Date.to_date(date_to) + timedelta(days=1),
+            'company_ids': tuple(self.env.companies.ids),
+        }
+        if partner_ids:
+            query += " AND am.partner_id IN %(partner_ids)s"
+            params['partner_ids'] = tuple(partner_ids)
+        return query, params
+
+    @api.model
+    def _get_credit_notes_query(self, date_to, date_from=None, partner_ids=None, move_types=('out_refund', 'in_refund')):
+        """Return the SQL and parameters of the posted credit notes with an open residual."""
+        self.env['account.move'].flush_model([
+            'move_type', 'state', 'name', 'invoice_date', 'invoice_origin', 'ref', 'partner_id',
+            'journal_id', 'amount_total', 'amount_residual', 'currency_id', 'company_id'])
+        query = """
+            SELECT am.id AS move_id,
+                   am.name AS move_name,
+                   am.invoice_date AS date,
+                   COALESCE(NULLIF(am.invoice_origin, ''), am.ref, '') AS origin,
+                   am.partner_id,
+                   rp.name AS partner,
+                   am.journal_id,
+                   COALESCE(aj.name->>%(lang)s, aj.name->>'en_US') AS journal,
+                   am.currency_id,
+                   am.amount_total,
+                   am.amount_residual
+              FROM account_move am
+              JOIN account_journal aj ON aj.id = am.journal_id
+         LEFT JOIN res_partner rp ON rp.id = am.partner_id
+             WHERE am.move_type IN %(move_types)s
+               AND am.state = 'posted'
+               AND am.amount_residual > 0
+               AND am.invoice_date IS NOT NULL
+               AND am.company_id IN %(company_ids)s
+        """
+        params = {
+            'lang': self.env.lang or 'en_US',
+            'move_types': tuple(move_types) or ('',),
+            'company_ids': tuple(self.env.companies.ids),
+        }
+        if date_to:
+            query += " AND am.invoice_date <= %(date_to)s"
+            params['date_to'] = date_to
+        if date_from:
+            query += " AND am.invoice_date >= %(date_from)s"
+            params['date_from'] = date_from
+        if partner_ids:
+            query += " AND am.partner_id IN %(partner_ids)s"
+            params['partner_ids'] = tuple(partner_ids)
+        return query, params
+
+    @api.model
+    def _summarize(self, rows, amount_key):
+        """Return ``rows`` with their totals per partner, journal and day.
+
+        The totals are accumulated in a single pass over the rows; every
+        partner group also keeps its detail rows, in the order given.
+        """
+        partners, journals, days = {}, {}, {}
+        total = 0.0
+        for row in rows:
+            amount = row[amount_key] or 0.0
+            total += amount
+            group = partners.setdefault(row['partner_id'], {
+                'partner_id': row['partner_id'], 'name': row['partner'] or '', 'count': 0, 'amount': 0.0, 'lines': [],
+            })
+            group['count'] += 1
+            group['amount'] += amount
+            group['lines'].append(row)
+            for totals, key, name in ((journals, row['journal_id'], row['journal']), (days, row['date'], row['date'])):
+                entry = totals.setdefault(key, {'name': name, 'count': 0, 'amount': 0.0})
+                entry['count'] += 1
+                entry['amount'] += amount
+
+        records = self.env['res.partner'].browse([pid for pid in partners if pid])
+        for partner in records:
+            partners[partner.id]['partner'] = partner
+        if None in partners:
+            partners[None]['partner'] = self.env['res.partner']
+        return {
+            'lines': rows,
+            'by_partner': sorted(partners.values(), key=lambda group: group['name']),
+            'by_journal': sorted(journals.values(), key=lambda entry: entry['name']),
+            'by_day': [days[day] for day in sorted(days)],
+            'count': len(rows),
+            'total': total,
+        }
+
+    @api.model
+    def _get_collections(self, date_from, date_to, partner_ids=None):
+        """Return the inbound payments in range with their totals, see ``_summarize``."""
+        query, params = self._get_collections_query(date_from, date_to, partner_ids)
+        self.env.cr.execute(query + " ORDER BY am.date, am.name, ap.id", params)
+        return self._summarize(self.env.cr.dictfetchall(), 'amount')
+
+    @api.model
+    def _get_credit_notes(self, date_to, date_from=None, partner_ids=None, move_types=('out_refund', 'in_refund')):
+        """Return the open credit notes with their totals, see ``_summarize``."""
+        query, params = self._get_credit_notes_query(date_to, date_from, partner_ids, move_types)
+        self.env.cr.execute(query + " ORDER BY rp.name, am.invoice_date, am.id", params)
+        return self._summarize(self.env.cr.dictfetchall(), 'amount_residual')
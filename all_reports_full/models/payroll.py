@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 from odoo import api, fields, models
+from .report_perf_log import instrument_report
 from math import floor
 
 
@@ -87,31 +88,25 @@ class SalarySheetWizard(models.TransientModel):
         self.ensure_one()
         self.preview_ids.unlink()
 
-        domain = [
-            ('date_from', '>=', self.date_from),
-            ('date_to', '<=', self.date_to),
-            ('state', '=', 'done'),
-        ]
-        if self.employee_ids:
-            domain.append(('employee_id', 'in', self.employee_ids.ids))
-
-        slips = self.env['hr.payslip'].search(domain)
+        matrix = self.env['report.center.payroll']._get_matrix(
+            self.date_from, self.date_to, self.employee_ids.ids)
 
         lines = []
-        for slip in slips:
-            basic = get_amount(slip, {'BASIC'})
-            hra = get_amount(slip, {'HRA'})
-            da = get_amount(slip, {'DA'})
+        for row in matrix:
+            amounts = row['amounts']
+            basic = amounts.get('BASIC', 0.0)
+            hra = amounts.get('HRA', 0.0)
+            da = amounts.get('DA', 0.0)
             gross = basic + hra + da
-            pf = abs(get_amount(slip, {'PF'}))
-            esi = abs(get_amount(slip, {'ESI'}))
-            pt = abs(get_amount(slip, {'PT'}))
-            tds = abs(get_amount(slip, {'TDS'}))
+            pf = abs(amounts.get('PF', 0.0))
+            esi = abs(amounts.get('ESI', 0.0))
+            pt = abs(amounts.get('PT', 0.0))
+            tds = abs(amounts.get('TDS', 0.0))
             net = gross - (pf + esi + pt + tds)
 
             lines.append((0, 0, {
-                'employee': slip.employee_id.name,
-                'department': slip.employee_id.department_id.name or '',
+                'employee': row['employee'].name,
+                'department': row['department'],
                 'basic': basic,
                 'hra': hra,
                 'da': da,
@@ -139,6 +134,14 @@ class SalarySheetWizard(models.TransientModel):
             'date_to': self.date_to,
             'employee_ids': self.employee_ids.ids,
         }
+        chunked = self.env['report.chunked.pdf']
+        slips = self.env['report.center.payroll']._get_payslips(self.date_from, self.date_to, self.employee_ids.ids)
+        if chunked._should_chunk(slips):
+            rows, totals = self.env['report.all_reports_full.salary_sheet_template']._get_rows(
+                self.date_from, self.date_to, self.employee_ids.ids)
+            return chunked._download(
+                'all_reports_full.salary_sheet_report_action', self, rows,
+                f'salary_sheet_{self.date_from}_{self.date_to}.pdf', data=data, carry_keys=tuple(totals))
         return self.env.ref(
             'all_reports_full.salary_sheet_report_action'
         ).report_action(self, data=data)
@@ -149,41 +152,43 @@ class ReportSalarySheet(models.AbstractModel):
     _description = "Salary Sheet QWeb Report"
 
     @api.model
+    @instrument_report()
     def _get_report_values(self, docids, data=None):
         date_from = data.get('date_from')
         date_to = data.get('date_to')
         employee_ids = data.get('employee_ids') or []
 
-        # find payslips in period
-        domain = [
-            ('date_from', '>=', date_from),
-            ('date_to', '<=', date_to),
-            ('state', '=', 'done'),
-        ]
-        if employee_ids:
-            domain.append(('employee_id', 'in', employee_ids))
-
-        payslips = self.env['hr.payslip'].search(domain, order='employee_id, date_from')
-
-        # helper to safely get totals for a given salary rule code
-        def get_line_total(slip, code):
-            if not slip:
-                return 0.0
-            lines = slip.line_ids.filtered(lambda l: (l.code or '').strip().upper() == (code or '').strip().upper())
-            # if multiple lines with same code, sum totals
-            return float(sum(l.total or 0.0 for l in lines))
-
-        # fallback: classify a line as earning/deduction depending on sign if code unknown
-        def classify_lines(slip):
+        # a chunk of a large sheet comes with its rows and the running totals
+        if data.get('chunk_rows') is not None:
+            rows, totals = data['chunk_rows'], data['carry_out']
+        else:
+            rows, totals = self._get_rows(date_from, date_to, employee_ids)
+
+        return {
+            'doc_ids': docids,
+            'doc_model': 'salary.sheet.wizard',
+            'data': data,
+            'date_from': date_from,
+            'date_to': date_to,
+            'rows': rows,
+            'totals': totals,
+        }
+
+    @api.model
+    def _get_rows(self, date_from, date_to, employee_ids):
+        """Return the salary sheet rows of the payslips in range and their totals."""
+        engine = self.env['report.center.payroll']
+        matrix = engine._get_matrix(date_from, date_to, employee_ids)
+
+        # fallback: classify a code as earning/deduction depending on sign if code unknown
+        def classify_lines(amounts):
             earnings = {}
             deductions = {}
-            for l in slip.line_ids:
-                code = (l.code or '').strip().upper() or ('UNKNOWN_%s' % l.id)
-                amt = float(l.total or 0.0)
+            for code, amt in amounts.items():
                 if amt >= 0:
-                    earnings[code] = earnings.get(code, 0.0) + amt
+                    earnings[code] = amt
                 else:
-                    deductions[code] = deductions.get(code, 0.0) + abs(amt)
+                    deductions[code] = abs(amt)
             return earnings, deductions
 
         rows = []
@@ -194,37 +199,31 @@ class ReportSalarySheet(models.AbstractModel):
             'gross': 0.0, 'net': 0.0
         }
 
-        for slip in payslips:
-            emp = slip.employee_id
+        for line in matrix:
+            slip = line['slip']
+            emp = line['employee']
+            amounts = line['amounts']
 
             # Prefer explicit salary-rule codes; fallback to classification if needed
-            basic = get_line_total(slip, 'BASIC')
-            hra = get_line_total(slip, 'HRA')
-            da = get_line_total(slip, 'DA')
-            conv = get_line_total(slip, 'CONV') or get_line_total(slip, 'CONVEY') or get_line_total(slip, 'CONVEYANCE')
-            med = get_line_total(slip, 'MED') or get_line_total(slip, 'MEDICAL')
-            special = get_line_total(slip, 'SPALLOW') or get_line_total(slip, 'SPECIAL') or get_line_total(slip, 'SPECALLOW')
-            ot = get_line_total(slip, 'OT') or get_line_total(slip, 'OVERTIME')
-            gross = (
-    get_line_total(slip, 'BASIC')
-    + get_line_total(slip, 'HRA')
-    + get_line_total(slip, 'DA')
-    + get_line_total(slip, 'CONV')
-    + get_line_total(slip, 'MED')
-    + get_line_total(slip, 'SPALLOW')
-    + get_line_total(slip, 'OT')
-)  # many setups have explicit GROSS line
-            net = get_line_total(slip, 'NET')
+            basic = amounts.get('BASIC', 0.0)
+            hra = amounts.get('HRA', 0.0)
+            da = amounts.get('DA', 0.0)
+            conv = engine._pick(amounts, 'CONV', 'CONVEY', 'CONVEYANCE')
+            med = engine._pick(amounts, 'MED', 'MEDICAL')
+            special = engine._pick(amounts, 'SPALLOW', 'SPECIAL', 'SPECALLOW')
+            ot = engine._pick(amounts, 'OT', 'OVERTIME')
+            gross = sum(amounts.get(code, 0.0) for code in ('BASIC', 'HRA', 'DA', 'CONV', 'MED', 'SPALLOW', 'OT'))
+            net = amounts.get('NET', 0.0)
 
             # Deductions
-            pf = get_line_total(slip, 'PF') or get_line_total(slip, 'EPF') or get_line_total(slip, 'PFEE')
-            esi = get_line_total(slip, 'ESI')
-            pt = get_line_total(slip, 'PT') or get_line_total(slip, 'PROFTAX') or get_line_total(slip, 'PROF_TAX')
-            tds = get_line_total(slip, 'TDS')
+            pf = engine._pick(amounts, 'PF', 'EPF', 'PFEE')
+            esi = amounts.get('ESI', 0.0)
+            pt = engine._pick(amounts, 'PT', 'PROFTAX', 'PROF_TAX')
+            tds = amounts.get('TDS', 0.0)
 
             # If many values are zero, try to intelligently classify lines
             if not any([basic, hra, da, conv, med, special, ot, gross, net, pf, esi, pt, tds]):
-                earnings_map, deductions_map = classify_lines(slip)
+                earnings_map, deductions_map = classify_lines(amounts)
                 # attempt reasonable picks
                 basic = basic or earnings_map.get('BASIC', 0.0)
                 hra = hra or earnings_map.get('HRA', 0.0)
@@ -238,13 +237,11 @@ class ReportSalarySheet(models.AbstractModel):
                 other_earn = sum(v for k, v in earnings_map.items() if k not in {'BASIC', 'HRA', 'DA', 'CONV', 'CONVEY', 'MED', 'SPALLOW', 'OT', 'OVERTIME', 'GROSS', 'NET'})
                 other_ded = sum(v for k, v in deductions_map.items() if k not in {'PF', 'ESI', 'PT', 'TDS'})
             else:
-                # compute any remaining 'other' amounts from lines not matched above
+                # compute any remaining 'other' amounts from codes not matched above
                 matched_codes = {'BASIC', 'HRA', 'DA', 'CONV', 'CONVEY', 'CONVEYANCE', 'MED', 'MEDICAL', 'SPALLOW', 'SPECIAL', 'SPECALLOW', 'OT', 'OVERTIME', 'GROSS', 'NET', 'PF', 'EPF', 'PFEE', 'ESI', 'PT', 'PROFTAX', 'PROF_TAX', 'TDS'}
                 other_earn = 0.0
                 other_ded = 0.0
-                for l in slip.line_ids:
-                    code = (l.code or '').strip().upper()
-                    amt = float(l.total or 0.0)
+                for code, amt in amounts.items():
                     if code not in matched_codes:
                         if amt >= 0:
                             other_earn += amt
@@ -279,7 +276,7 @@ class ReportSalarySheet(models.AbstractModel):
             rows.append({
                 'employee_name': emp.name,
                 'employee_code': getattr(emp, 'employee_id', False) or getattr(emp, 'identification_id', False) or emp.id,
-                'department': emp.department_id.name if emp.department_id else '',
+                'department': line['department'],
                 'job_title': emp.job_id.name if emp.job_id else '',
                 'work_days': getattr(slip, 'worked_days_count', 0),
                 'lop': getattr(slip, 'unpaid_leaves', 0) or 0,
@@ -302,15 +299,7 @@ class ReportSalarySheet(models.AbstractModel):
                 'slip': slip,
             })
 
-        return {
-            'doc_ids': docids,
-            'doc_model': 'salary.sheet.wizard',
-            'data': data,
-            'date_from': date_from,
-            'date_to': date_to,
-            'rows': rows,
-            'totals': totals,
-        }
+        return rows, totals
 
 
 # ---------------------------
@@ -343,23 +332,17 @@ class PFESIPTSummaryWizard(models.TransientModel):
         self.ensure_one()
         self.preview_ids.unlink()
 
-        domain = [
-            ('date_from', '>=', self.date_from),
-            ('date_to', '<=', self.date_to),
-            ('state', '=', 'done'),
-        ]
-        if self.employee_ids:
-            domain.append(('employee_id', 'in', self.employee_ids.ids))
-
-        slips = self.env['hr.payslip'].search(domain)
+        matrix = self.env['report.center.payroll']._get_matrix(
+            self.date_from, self.date_to, self.employee_ids.ids, by_employee=True)
 
         data = {}
-        for slip in slips:
-            emp = slip.employee_id.name
+        for row in matrix:
+            emp = row['employee'].name
+            amounts = row['amounts']
             data.setdefault(emp, {'pf': 0, 'esi': 0, 'pt': 0})
-            data[emp]['pf'] += abs(get_amount(slip, {'PF'}))
-            data[emp]['esi'] += abs(get_amount(slip, {'ESI'}))
-            data[emp]['pt'] += abs(get_amount(slip, {'PT'}))
+            data[emp]['pf'] += abs(amounts.get('PF', 0.0))
+            data[emp]['esi'] += abs(amounts.get('ESI', 0.0))
+            data[emp]['pt'] += abs(amounts.get('PT', 0.0))
 
         self.preview_ids = [(0, 0, {
             'employee': k,
@@ -386,35 +369,26 @@ class ReportPFESIPT(models.AbstractModel):
     _description = "PF ESI PT Summary QWeb Report"
 
     @api.model
+    @instrument_report()
     def _get_report_values(self, docids, data=None):
         date_from = data.get('date_from')
         date_to = data.get('date_to')
         employee_ids = data.get('employee_ids') or []
 
-        # search payslips
-        domain = [
-            ('date_from', '>=', date_from),
-            ('date_to', '<=', date_to),
-            ('state', '=', 'done'),
-        ]
-        if employee_ids:
-            domain.append(('employee_id', 'in', employee_ids))
-        payslips = self.env['hr.payslip'].search(domain, order='employee_id')
+        matrix = self.env['report.center.payroll']._get_matrix(
+            date_from, date_to, employee_ids, by_employee=True)
 
         # aggregation per employee
         summary = {}
-        for slip in payslips:
-            emp = slip.employee_id
-            key = emp.id
-            rec = summary.setdefault(key, {
+        for line in matrix:
+            emp = line['employee']
+            rec = summary.setdefault(emp.id, {
                 'employee': emp,
                 'pf_emp': 0.0, 'pf_emp_er': 0.0, 'eps': 0.0,
                 'esi_emp': 0.0, 'esi_er': 0.0, 'pt': 0.0, 'pf_wages': 0.0, 'esi_wages': 0.0
             })
-            # iterate lines
-            for l in slip.line_ids:
-                code = (l.code or '').upper()
-                amt = float(l.total or 0.0)
+            # iterate rule codes
+            for code, amt in line['amounts'].items():
                 # PF employee contribution
                 if code in ('PF', 'EPF', 'PFEE', 'PFD') or ('PF' in code and 'EMP' in code):
                     rec['pf_emp'] += abs(amt)
@@ -438,10 +412,9 @@ class ReportPFESIPT(models.AbstractModel):
                     rec['pf_wages'] += abs(amt)
                 if code in ('ESIW', 'ESI_WAGES', 'ESI_WAGE'):
                     rec['esi_wages'] += abs(amt)
-            # if not found wages, try to use basic from slip
+            # if not found wages, try to use basic from the payslips
             if not rec['pf_wages']:
-                basic = sum(l.total for l in slip.line_ids if (l.code or '').upper() in ('BASIC',))
-                rec['pf_wages'] += basic
+                rec['pf_wages'] += line['amounts'].get('BASIC', 0.0)
             if not rec['esi_wages']:
                 rec['esi_wages'] += rec['pf_wages']  # fallback
 
@@ -496,27 +469,14 @@ class GratuityLeaveProvisionWizard(models.TransientModel):
         self.ensure_one()
         self.preview_ids.unlink()
 
-        employees = self.employee_ids or self.env['hr.employee'].search([])
-
-        lines = []
-        for emp in employees:
-            # hire = emp.employee_id.date_start or emp.create_date.date()
-            hire = emp.create_date.date()
-            years = floor((self.as_of_date - hire).days / 365) if hire else 0
-
-            slip = self.env['hr.payslip'].search(
-                [('employee_id', '=', emp.id), ('state', '=', 'done')],
-                order='date_from desc', limit=1
-            )
-            basic = get_amount(slip, {'BASIC'}) if slip else 0
-            gratuity = (basic * 15 / 26) * years if years else 0
-
-            lines.append((0, 0, {
-                'employee': emp.name,
-                'years': years, 
-                'basic': basic,
-                'gratuity': gratuity,
-            }))
+        # same rows as the printed report
+        rows = self.env['report.center.payroll']._get_provisions(self.as_of_date, self.employee_ids.ids)
+        lines = [(0, 0, {
+            'employee': row['employee'].name,
+            'years': row['years_service'],
+            'basic': row['basic'],
+            'gratuity': row['gratuity'],
+        }) for row in rows]
 
         self.preview_ids = lines
         return self._reopen()
@@ -540,90 +500,16 @@ class ReportGratuityLeaveProvision(models.AbstractModel):
 
 
     @api.model
+    @instrument_report()
     def _get_report_values(self, docids, data=None):
         as_of = data.get('as_of_date')
         employee_ids = data.get('employee_ids') or []
 
-        rows = []
-        grand = {'gratuity':0.0, 'leave_provision':0.0}
-        # find employees
-        domain = []
-        if employee_ids:
-            domain = [('id','in', employee_ids)]
-        employees = self.env['hr.employee'].search(domain, order='name')
-
-        for emp in employees:
-            # determine hire date
-            hire_date = getattr(emp, 'hire_date', False) or getattr(emp, 'employee_id.date_start', False) or False
-            # fallback: try contract start
-            if not hire_date:
-                last_contract = emp.contract_id or (emp.contract_ids and emp.contract_ids[:1])
-                if last_contract:
-                    hire_date = getattr(last_contract, 'employee_id.date_start', False)
-            # parse dates
-            years_service = 0
-            try:
-                if hire_date and as_of:
-                    hd = fields.Date.from_string(hire_date) if isinstance(hire_date, str) else hire_date
-                    ao = fields.Date.from_string(as_of) if isinstance(as_of, str) else as_of
-                    days = (ao - hd).days
-                    years_service = floor(days / 365) if days > 0 else 0
-            except Exception:
-                years_service = 0
-
-            # find last payslip basic (latest payslip before as_of)
-            basic = 0.0
-            slip_domain = [('state', '=', 'done')]
-            if as_of:
-                slip_domain += [('date_from', '<=', as_of)]
-            slip_domain += [('employee_id', '=', emp.id)]
-            last_slip = self.env['hr.payslip'].search(slip_domain, order='date_from desc', limit=1)
-            if last_slip:
-                basic = sum(l.total for l in last_slip.line_ids if (l.code or '').upper() == 'BASIC') or 0.0
-
-            # gratuity: standard formula (15/26)*basic*years_of_service (common practice)
-            gratuity = 0.0
-            try:
-                gratuity = (basic * 15.0 / 26.0) * years_service if basic and years_service else 0.0
-            except Exception:
-                gratuity = 0.0
-
-            # leave provision: attempt to approximate leave balance
-            leave_balance = 0.0
-            # Attempt: sum of remaining allocations (best-effort; custom setups may differ)
-            try:
-                allocations = self.env['hr.leave.allocation'].search([('employee_id','=',emp.id), ('state','=','validate')])
-                for alloc in allocations:
-                    # many installs use 'number_of_days' or 'number_of_days_display'
-                    nd = getattr(alloc, 'number_of_days_display', None)
-                    if nd is None:
-                        nd = getattr(alloc, 'number_of_days', 0.0)
-                    leave_balance += nd or 0.0
-                # subtract taken leaves in period up to as_of (approx)
-                leaves = self.env['hr.leave'].search([('holiday_status_id.include_in_calendar','=','True'), ('employee_id','=',emp.id), ('state','=','validate'), ('request_date_from','<=', as_of)])
-                used = sum(abs(getattr(l, 'number_of_days_display', 0.0) or getattr(l,'number_of_days', 0.0)) for l in leaves)
-                # approximate net balance
-                leave_balance = max(0.0, leave_balance - used)
-            except Exception:
-                leave_balance = 0.0
-
-            # per day salary estimation
-            per_day = (basic / 30.0) if basic else 0.0
-            leave_provision_value = leave_balance * per_day
-
-            rows.append({
-                'employee': emp,
-                'hire_date': hire_date,
-                'years_service': years_service,
-                'basic': basic,
-                'gratuity': gratuity,
-                'leave_balance': leave_balance,
-                'per_day_salary': per_day,
-                'leave_provision': leave_provision_value,
-            })
-
-            grand['gratuity'] += gratuity
-            grand['leave_provision'] += leave_provision_value
+        rows = self.env['report.center.payroll']._get_provisions(as_of, employee_ids)
+        grand = {
+            'gratuity': sum(r['gratuity'] for r in rows),
+            'leave_provision': sum(r['leave_provision'] for r in rows),
+        }
 
         return {
             'doc_ids': docids,
@@ -638,16 +524,6 @@ class ReportGratuityLeaveProvision(models.AbstractModel):
 
 
 
-# =====================================================
-# COMMON HELPERS
-# =====================================================
-def get_amount(slip, codes):
-    return sum(
-        l.total for l in slip.line_ids
-        if (l.code or '').upper() in codes
-    )
-
-
 # =====================================================
 # 1️⃣ SALARY SHEET
 # =====================================================
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+from math import floor
+
+from odoo import api, fields, models
+
+
+class PayrollEngine(models.AbstractModel):
+    _name = 'report.center.payroll'
+    _description = 'Payroll Report Engine'
+
+    @api.model
+    def _get_payslips(self, date_from, date_to, employee_ids=None):
+        domain = [
+            ('date_from', '>=', date_from),
+            ('date_to', '<=', date_to),
+            ('state', '=', 'done'),
+        ]
+        if employee_ids:
+            domain.append(('employee_id', 'in', list(employee_ids)))
+        return self.env['hr.payslip'].search(domain, order='employee_id, date_from')
+
+    @api.model
+    def _get_matrix(self, date_from, date_to, employee_ids=None, by_employee=False):
+        """Return the salary rule totals of done payslips as a matrix.
+
+        Every row holds the payslip (or, with ``by_employee``, all payslips
+        of the employee), the employee, its department name and an
+        ``amounts`` dict mapping upper-cased rule codes to their summed
+        totals. All amounts come from one grouped query over the payslip
+        lines.
+        """
+        slips = self._get_payslips(date_from, date_to, employee_ids)
+        if not slips:
+            return []
+
+        self.env['hr.payslip.line'].flush_model(['slip_id', 'code', 'amount', 'quantity', 'rate'])
+        self.env['hr.payslip'].flush_model(['employee_id'])
+        key = 'ps.employee_id' if by_employee else 'l.slip_id'
+        # total is not stored by every payroll module, so recompute it from its operands
+        self.env.cr.execute(f"""
+            SELECT {key},
+                   UPPER(TRIM(COALESCE(l.code, ''))) AS code,
+                   SUM(l.quantity * l.amount * l.rate / 100.0)
+              FROM hr_payslip_line l
+              JOIN hr_payslip ps ON ps.id = l.slip_id
+             WHERE l.slip_id IN %(slip_ids)s
+          GROUP BY {key}, code
+        """, {'slip_ids': tuple(slips.ids)})
+        matrix = {}
+        for row_id, code, total in self.env.cr.fetchall():
+            matrix.setdefault(row_id, {})[code] = total or 0.0
+
+        if by_employee:
+            slip_ids = {}
+            for slip in slips:
+                slip_ids.setdefault(slip.employee_id.id, []).append(slip.id)
+            return [{
+                'slip': slips.browse(slip_ids[emp.id]),
+                'employee': emp,
+                'department': emp.department_id.name or '',
+                'amounts': matrix.get(emp.id, {}),
+            } for emp in slips.employee_id]
+        return [{
+            'slip': slip,
+            'employee': slip.employee_id,
+            'department': slip.employee_id.department_id.name or '',
+            'amounts': matrix.get(slip.id, {}),
+        } for slip in slips]
+
+    @api.model
+    def _pick(self, amounts, *codes):
+        """Return the first non-zero amount among ``codes``."""
+        return next((amounts[code] for code in codes if amounts.get(code)), 0.0)
+
+    @api.model
+    def _get_latest_amounts(self, employee_ids, code, as_of=None):
+        """Return the ``code`` total of the latest done payslip per employee.
+
+        One ``DISTINCT ON`` query picks the most recent payslip of every
+        employee (starting on or before ``as_of`` when given) together with
+        the summed total of its ``code`` lines.
+        """
+        if not employee_ids:
+            return {}
+        self.env['hr.payslip.line'].flush_model(['slip_id', 'code', 'amount', 'quantity', 'rate'])
+        self.env['hr.payslip'].flush_model(['employee_id', 'state', 'date_from', 'company_id'])
+        query = """
+            SELECT DISTINCT ON (ps.employee_id)
+                   ps.employee_id,
+                   (SELECT SUM(l.quantity * l.amount * l.rate / 100.0)
+                      FROM hr_payslip_line l
+                     WHERE l.slip_id = ps.id
+                       AND UPPER(TRIM(l.code)) = %(code)s)
+              FROM hr_payslip ps
+             WHERE ps.state = 'done'
+               AND ps.employee_id IN %(employee_ids)s
+               AND ps.company_id IN %(company_ids)s
+        """
+        params = {
+            'code': code.strip().upper(),
+            'employee_ids': tuple(employee_ids),
+            'company_ids': tuple(self.env.companies.ids),
+        }
+        if as_of:
+            query += " AND ps.date_from <= %(as_of)s"
+            params['as_of'] = as_of
+        query += " ORDER BY ps.employee_id, ps.date_from DESC, ps.id DESC"
+        self.env.cr.execute(query, params)
+        return {employee_id: amount or 0.0 for employee_id, amount in self.env.cr.fetchall()}
+
+    @api.model
+    def _get_hire_dates(self, employees):
+        """Return the hire date per employee, else the start of the first contract."""
+        if 'hire_date' in employees._fields:
+            hire_dates = {emp.id: emp.hire_date for emp in employees if emp.hire_date}
+        else:
+            hire_dates = {}
+        missing = [emp_id for emp_id in employees.ids if emp_id not in hire_dates]
+        if missing and 'hr.contract' in self.env:
+            hire_dates.update({
+                emp.id: date_start
+                for emp, date_start in self.env['hr.contract']._read_group(
+                    [('employee_id', 'in', missing)], ['employee_id'], ['date_start:min'])
+                if date_start
+            })
+        return hire_dates
+
+    @api.model
+    def _get_leave_balances(self, employee_ids, as_of=None):
+        """Return validated allocated days minus validated leave days per employee."""
+        if not employee_ids or 'hr.leave.allocation' not in self.env:
+            return {}
+        allocated = dict(self.env['hr.leave.allocation']._read_group(
+            [('employee_id', 'in', list(employee_ids)), ('state', '=', 'validate')],
+            ['employee_id'], ['number_of_days:sum']))
+        leave_domain = [('employee_id', 'in', list(employee_ids)), ('state', '=', 'validate')]
+        if as_of:
+            leave_domain.append(('request_date_from', '<=', as_of))
+        if 'include_in_calendar' in self.env['hr.leave.type']._fields:
+            leave_domain.append(('holiday_status_id.include_in_calendar', '=', True))
+        used = dict(self.env['hr.leave']._read_group(leave_domain, ['employee_id'], ['number_of_days:sum']))
+        return {
+            emp.id: max(0.0, (days or 0.0) - abs(used.get(emp, 0.0) or 0.0))
+            for emp, days in allocated.items()
+        }
+
+    @api.model
+    def _get_provisions(self, as_of, employee_ids=None):
+        """Return gratuity and leave provision rows for all employees at once.
+
+        The latest BASIC, the hire dates and the leave balances are each
+        fetched with one query for every employee; gratuity is
+        15/26 x BASIC x completed years and the leave provision values the
+        remaining leave days at BASIC / 30 per day.
+        """
+        domain = [('id', 'in', list(employee_ids))] if employee_ids else []
+        employees = self.env['hr.employee'].search(domain, order='name')
+        if not employees:
+            return []
+        as_of = fields.Date.to_date(as_of) if as_of else None
+        basics = self._get_latest_amounts(employees.ids, 'BASIC', as_of)
+        hire_dates = self._get_hire_dates(employees)
+        balances = self._get_leave_balances(employees.ids, as_of)
+
+        rows = []
+        for emp in employees:
+            hire_date = hire_dates.get(emp.id, False)
+            days = (as_of - hire_date).days if hire_date and as_of else 0
+            years_service = floor(days / 365) if days > 0 else 0
+            basic = basics.get(emp.id, 0.0)
+            per_day = basic / 30.0 if basic else 0.0
+            leave_balance = balances.get(emp.id, 0.0)
+            rows.append({
+                'employee': emp,
+                'hire_date': hire_date,
+                'years_service': years_service,
+                'basic': basic,
+                'gratuity': (basic * 15.0 / 26.0) * years_service if basic and years_service else 0.0,
+                'leave_balance': leave_balance,
+                'per_day_salary': per_day,
+                'leave_provision': leave_balance * per_day,
+            })
+        return rows
@@ -1,9 +1,11 @@
 # -*- coding: utf-8 -*-
 from odoo import api, fields, models, _
 from odoo.exceptions import UserError
-import io, base64
+import io, base64, os, tempfile, uuid
 from datetime import datetime, date, timedelta
 
+from .report_perf_log import instrument_report
+
 try:
     import xlsxwriter
 except Exception:
@@ -20,6 +22,11 @@ class ReportCenter(models.Model):
 class ReportExportWizard(models.TransientModel):
     _name = 'report.export.wizard'
     _description = 'Export report wizard'
+    _inherit = ['report.background.mixin']
+    _background_method = 'action_export'
+
+    # Rows fetched per round trip by the streaming exports
+    _export_batch_size = 5000
 
     report_code = fields.Selection(selection=[
         ('general_ledger','General Ledger'),
@@ -38,11 +45,15 @@ class ReportExportWizard(models.TransientModel):
         ('pdf', 'PDF')
     ], string='Format', default='xlsx', required=True)
 
+    def _get_background_name(self):
+        return dict(self._fields['report_code'].selection).get(self.report_code) or self._description
+
     def _get_date_range(self):
         start = self.start_date or (date.today().replace(day=1))
         end = self.end_date or date.today()
         return (start, end)
 
+    @instrument_report()
     def action_export(self):
         if xlsxwriter is None and self.report_format == 'xlsx':
             raise UserError(_('Python library xlsxwriter is required for Excel export.'))
@@ -104,38 +115,107 @@ class ReportExportWizard(models.TransientModel):
             'target': 'self',
         }
 
+    def _open_streamed_workbook(self):
+        """Create a constant-memory workbook backed by a temporary file."""
+        fd, path = tempfile.mkstemp(suffix='.xlsx', prefix='report_export_')
+        os.close(fd)
+        workbook = xlsxwriter.Workbook(path, {'constant_memory': True})
+        return workbook, path
+
+    def _make_xlsx_file_attachment_action(self, path, filename):
+        """Store the workbook written at ``path`` and remove the temporary file."""
+        try:
+            with open(path, 'rb') as xlsx_file:
+                attachment = self.env['ir.attachment'].create({
+                    'name': filename,
+                    'type': 'binary',
+                    'raw': xlsx_file.read(),
+                    'mimetype': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+                })
+        finally:
+            os.unlink(path)
+        return {
+            'type': 'ir.actions.act_url',
+            'url': '/web/content/%s?download=true' % attachment.id,
+            'target': 'self',
+        }
+
+    def _iter_query_rows(self, query, params):
+        """Yield the rows of ``query`` through a server-side cursor.
+
+        Rows are fetched ``_export_batch_size`` at a time so only one batch
+        is ever held in Python, whatever the size of the result.
+        """
+        cr = self.env.cr
+        cursor_name = 'report_export_%s' % uuid.uuid4().hex
+        cr.execute('DECLARE %s NO SCROLL CURSOR FOR %s' % (cursor_name, query), params)
+        try:
+            while True:
+                cr.execute('FETCH %s FROM %s' % (int(self._export_batch_size), cursor_name))
+                rows = cr.fetchall()
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            cr.execute('CLOSE %s' % cursor_name)
+
     def _export_general_ledger(self, start_date, end_date):
-        workbook_stream = io.BytesIO()
-        workbook = xlsxwriter.Workbook(workbook_stream, {'in_memory': True})
+        workbook, path = self._open_streamed_workbook()
         sheet = workbook.add_worksheet('General Ledger')
 
         headers = ['Date','Journal','Account Code','Account Name','Partner','Label','Debit','Credit','Balance']
         for col, h in enumerate(headers):
             sheet.write(0, col, h)
 
-        domain = [('date','>=',str(start_date)),('date','<=',str(end_date)),('parent_state','=','posted')]
-        amls = self.env['account.move.line'].search(domain, order='date,account_id,partner_id')
+        self.env['account.move.line'].flush_model()
+        query = """
+            SELECT aml.date,
+                   COALESCE(aj.name->>%(lang)s, aj.name->>'en_US'),
+                   acc.code,
+                   COALESCE(acc.name->>%(lang)s, acc.name->>'en_US'),
+                   rp.name,
+                   aml.name,
+                   aml.debit,
+                   aml.credit,
+                   aml.account_id
+              FROM account_move_line aml
+              JOIN account_move am ON am.id = aml.move_id
+              JOIN account_journal aj ON aj.id = am.journal_id
+              JOIN account_account acc ON acc.id = aml.account_id
+         LEFT JOIN res_partner rp ON rp.id = aml.partner_id
+             WHERE aml.parent_state = 'posted'
+               AND aml.date >= %(start)s
+               AND aml.date <= %(end)s
+               AND aml.company_id IN %(company_ids)s
+          ORDER BY aml.date, aml.account_id, aml.partner_id, aml.id
+        """
+        params = {
+            'lang': self.env.lang or 'en_US',
+            'start': start_date,
+            'end': end_date,
+            'company_ids': tuple(self.env.companies.ids),
+        }
         balance_map = {}
         row = 1
-        for line in amls:
-            acc = line.account_id
-            key = acc.id
-            bal = balance_map.get(key, 0.0) + (line.debit - line.credit)
-            balance_map[key] = bal
-            sheet.write(row, 0, str(line.date))
-            sheet.write(row, 1, line.move_id.journal_id.name or '')
-            sheet.write(row, 2, acc.code or '')
-            sheet.write(row, 3, acc.name)
-            sheet.write(row, 4, line.partner_id.name or '')
-            sheet.write(row, 5, line.name or '')
-            sheet.write(row, 6, float(line.debit))
-            sheet.write(row, 7, float(line.credit))
+        for line_date, journal, code, account, partner, label, debit, credit, account_id in self._iter_query_rows(query, params):
+            if row % self._export_batch_size == 0:
+                self._report_progress((line_date - start_date).days, (end_date - start_date).days + 1)
+            bal = balance_map.get(account_id, 0.0) + (debit - credit)
+            balance_map[account_id] = bal
+            sheet.write(row, 0, str(line_date))
+            sheet.write(row, 1, journal or '')
+            sheet.write(row, 2, code or '')
+            sheet.write(row, 3, account or '')
+            sheet.write(row, 4, partner or '')
+            sheet.write(row, 5, label or '')
+            sheet.write(row, 6, float(debit))
+            sheet.write(row, 7, float(credit))
             sheet.write(row, 8, float(bal))
             row += 1
 
         workbook.close()
         filename = 'general_ledger_%s_%s.xlsx' % (start_date, end_date)
-        return self._make_xlsx_attachment_action(workbook_stream, filename)
+        return self._make_xlsx_file_attachment_action(path, filename)
 
     def _export_trial_balance(self, start_date, end_date):
         workbook_stream = io.BytesIO()
@@ -145,23 +225,15 @@ class ReportExportWizard(models.TransientModel):
         for col, h in enumerate(headers):
             sheet.write(0, col, h)
 
-        accounts = self.env['account.account'].search([], order='code')
         row = 1
-        for acc in accounts:
-            ob_domain = [('account_id','=',acc.id),('date','<',str(start_date)),('parent_state','=','posted')]
-            ob_lines = self.env['account.move.line'].search(ob_domain)
-            opening = sum([l.debit - l.credit for l in ob_lines])
-            period_domain = [('account_id','=',acc.id),('date','>=',str(start_date)),('date','<=',str(end_date)),('parent_state','=','posted')]
-            period_lines = self.env['account.move.line'].search(period_domain)
-            debit = sum([l.debit for l in period_lines])
-            credit = sum([l.credit for l in period_lines])
-            closing = opening + debit - credit
+        for item in self.env['report.center.trial.balance']._get_balances(start_date, end_date):
+            acc = item['account']
             sheet.write(row, 0, acc.code or '')
             sheet.write(row, 1, acc.name)
-            sheet.write(row, 2, float(opening))
-            sheet.write(row, 3, float(debit))
-            sheet.write(row, 4, float(credit))
-            sheet.write(row, 5, float(closing))
+            sheet.write(row, 2, float(item['opening']))
+            sheet.write(row, 3, float(item['debit']))
+            sheet.write(row, 4, float(item['credit']))
+            sheet.write(row, 5, float(item['closing']))
             row += 1
 
         workbook.close()
@@ -176,15 +248,13 @@ class ReportExportWizard(models.TransientModel):
         for col, h in enumerate(headers):
             sheet.write(0, col, h)
         accounts = self.env['account.account'].search([], order='code')
+        # labels of the account_type selection, resolved once for all accounts
+        account_types = dict(accounts._fields['account_type']._description_selection(self.env))
         row = 1
         for acc in accounts:
             sheet.write(row, 0, acc.code or '')
             sheet.write(row, 1, acc.name)
-            # In Odoo 17, account_type is a selection field
-            acc_type = ''
-            if hasattr(acc, 'account_type'):
-                acc_type = dict(acc._fields['account_type'].selection).get(acc.account_type, acc.account_type or '')
-            sheet.write(row, 2, acc_type)
+            sheet.write(row, 2, account_types.get(acc.account_type, acc.account_type or ''))
             sheet.write(row, 3, 'Yes' if acc.reconcile else 'No')
             row += 1
         workbook.close()
@@ -199,51 +269,14 @@ class ReportExportWizard(models.TransientModel):
         for col, h in enumerate(headers):
             sheet.write(0, col, h)
         
-        # Build proper domain for aging
-        domain = [
-            ('date','<=',str(end_date)),
-            ('reconciled','=',False),
-            ('parent_state','=','posted'),
-            ('account_id.account_type', 'in', ['asset_receivable'] if partner_type == 'customer' else ['liability_payable'])
-        ]
-        
-        lines = self.env['account.move.line'].search(domain)
-        partners = {}
-        for l in lines:
-            partner = l.partner_id
-            if not partner:
-                continue
-            partners.setdefault(partner.id, []).append(l)
-        
         row = 1
-        for pid, lns in partners.items():
-            partner = self.env['res.partner'].browse(pid)
-            buckets = [0, 0, 0, 0]  # 0-30, 31-60, 61-90, 90+
-            total_due = 0.0
-            
-            for l in lns:
-                days = (end_date - l.date).days if l.date else 0
-                # Use amount_residual for proper outstanding amount
-                amount = float(l.amount_residual or 0.0)
-                total_due += amount
-                
-                if days <= 30:
-                    buckets[0] += amount
-                elif days <= 60:
-                    buckets[1] += amount
-                elif days <= 90:
-                    buckets[2] += amount
-                else:
-                    buckets[3] += amount
-            
-            sheet.write(row, 0, partner.name)
-            sheet.write(row, 1, float(total_due))
-            sheet.write(row, 2, float(buckets[0]))
-            sheet.write(row, 3, float(buckets[1]))
-            sheet.write(row, 4, float(buckets[2]))
-            sheet.write(row, 5, float(buckets[3]))
+        for partner_data in self._get_aging_data(partner_type):
+            sheet.write(row, 0, partner_data['partner'].name)
+            sheet.write(row, 1, float(partner_data['total']))
+            for col, amount in enumerate(partner_data['buckets'], start=2):
+                sheet.write(row, col, float(amount))
             row += 1
-        
+
         workbook.close()
         filename = '%s_aging_%s_%s.xlsx' % (partner_type, start_date, end_date)
         return self._make_xlsx_attachment_action(workbook_stream, filename)
@@ -256,19 +289,14 @@ class ReportExportWizard(models.TransientModel):
         for col, h in enumerate(headers):
             sheet.write(0, col, h)
         
-        products = self.env['product.product'].search([('type', '=', 'product')])
         row = 1
-        for p in products:
-            quants = self.env['stock.quant'].search([('product_id','=',p.id),('location_id.usage','=','internal')])
-            qty_sum = sum(quants.mapped('quantity'))
-            unit_cost = float(p.standard_price or 0.0)
-            value = unit_cost * float(qty_sum)
-            
+        for item in self._get_inventory_valuation_data():
+            p = item['product']
             sheet.write(row, 0, p.name)
             sheet.write(row, 1, p.default_code or '')
-            sheet.write(row, 2, float(qty_sum))
-            sheet.write(row, 3, float(unit_cost))
-            sheet.write(row, 4, float(value))
+            sheet.write(row, 2, float(item['qty_on_hand']))
+            sheet.write(row, 3, float(item['unit_cost']))
+            sheet.write(row, 4, float(item['total_value']))
             row += 1
         
         workbook.close()
@@ -276,63 +304,87 @@ class ReportExportWizard(models.TransientModel):
         return self._make_xlsx_attachment_action(workbook_stream, filename)
 
     def _export_stock_register(self, start_date, end_date):
-        workbook_stream = io.BytesIO()
-        workbook = xlsxwriter.Workbook(workbook_stream, {'in_memory': True})
+        workbook, path = self._open_streamed_workbook()
         sheet = workbook.add_worksheet('Stock Register')
         headers = ['Date','Reference','Product','SKU','Qty','UOM','Source','Dest','Status']
         for col, h in enumerate(headers):
             sheet.write(0, col, h)
-        
-        domain = [('date','>=',str(start_date)),('date','<=',str(end_date)),('state','=','done')]
-        moves = self.env['stock.move'].search(domain, order='date')
+
+        self.env['stock.move'].flush_model()
+        query = """
+            SELECT sm.date,
+                   COALESCE(NULLIF(sm.reference, ''), sp.name),
+                   COALESCE(pt.name->>%(lang)s, pt.name->>'en_US'),
+                   pp.default_code,
+                   sm.product_uom_qty,
+                   COALESCE(uom.name->>%(lang)s, uom.name->>'en_US'),
+                   src.complete_name,
+                   dest.complete_name,
+                   sm.state
+              FROM stock_move sm
+              JOIN product_product pp ON pp.id = sm.product_id
+              JOIN product_template pt ON pt.id = pp.product_tmpl_id
+         LEFT JOIN uom_uom uom ON uom.id = sm.product_uom
+         LEFT JOIN stock_picking sp ON sp.id = sm.picking_id
+         LEFT JOIN stock_location src ON src.id = sm.location_id
+         LEFT JOIN stock_location dest ON dest.id = sm.location_dest_id
+             WHERE sm.state = 'done'
+               AND sm.date >= %(start)s
+               AND sm.date < %(end)s
+               AND sm.company_id IN %(company_ids)s
+          ORDER BY sm.date, sm.id
+        """
+        params = {
+            'lang': self.env.lang or 'en_US',
+            'start': str(start_date),
+            'end': str(end_date + timedelta(days=1)),
+            'company_ids': tuple(self.env.companies.ids),
+        }
         row = 1
-        for m in moves:
-            sheet.write(row, 0, str(m.date))
-            sheet.write(row, 1, m.reference or m.picking_id.name or '')
-            sheet.write(row, 2, m.product_id.name or '')
-            sheet.write(row, 3, m.product_id.default_code or '')
-            sheet.write(row, 4, float(m.product_uom_qty or 0.0))
-            sheet.write(row, 5, m.product_uom.name or '')
-            sheet.write(row, 6, m.location_id.complete_name or '')
-            sheet.write(row, 7, m.location_dest_id.complete_name or '')
-            sheet.write(row, 8, m.state or '')
+        for record in self._iter_query_rows(query, params):
+            move_date, reference, product, sku, qty, uom, source, dest, state = record
+            if row % self._export_batch_size == 0:
+                self._report_progress((move_date.date() - start_date).days, (end_date - start_date).days + 1)
+            sheet.write(row, 0, str(move_date))
+            sheet.write(row, 1, reference or '')
+            sheet.write(row, 2, product or '')
+            sheet.write(row, 3, sku or '')
+            sheet.write(row, 4, float(qty or 0.0))
+            sheet.write(row, 5, uom or '')
+            sheet.write(row, 6, source or '')
+            sheet.write(row, 7, dest or '')
+            sheet.write(row, 8, state or '')
             row += 1
-        
+
         workbook.close()
         filename = 'stock_register_%s_%s.xlsx' % (start_date, end_date)
-        return self._make_xlsx_attachment_action(workbook_stream, filename)
+        return self._make_xlsx_file_attachment_action(path, filename)
 
     def _export_gr_ir(self, start_date, end_date):
         workbook_stream = io.BytesIO()
         workbook = xlsxwriter.Workbook(workbook_stream, {'in_memory': True})
         sheet = workbook.add_worksheet('GR-IR Report')
-        headers = ['PO','Vendor','Product','Ordered Qty','Received Qty','Invoiced Qty','Difference (GR-IR)']
+        headers = ['PO','Vendor','Product','Ordered Qty','Received Qty','Invoiced Qty','Difference (GR-IR)',
+                   'PO Price','Open Value','Last Receipt','Age']
         for col, h in enumerate(headers):
             sheet.write(0, col, h)
-        
-        pos = self.env['purchase.order'].search([
-            ('date_order','>=',str(start_date)),
-            ('date_order','<=',str(end_date)),
-            ('state','in',['purchase','done'])
-        ])
-        
+
+        lines = self.env['report.center.gr.ir']._get_lines(start_date, end_date, only_open=False)
         row = 1
-        for po in pos:
-            for line in po.order_line:
-                ordered = float(line.product_qty or 0.0)
-                received = float(line.qty_received or 0.0)
-                invoiced = float(line.qty_invoiced or 0.0)
-                diff = received - invoiced
-                
-                sheet.write(row, 0, po.name)
-                sheet.write(row, 1, po.partner_id.name or '')
-                sheet.write(row, 2, line.product_id.name or '')
-                sheet.write(row, 3, ordered)
-                sheet.write(row, 4, received)
-                sheet.write(row, 5, invoiced)
-                sheet.write(row, 6, diff)
-                row += 1
-        
+        for line in lines:
+            sheet.write(row, 0, line['po_name'])
+            sheet.write(row, 1, line['vendor'])
+            sheet.write(row, 2, line['product_name'])
+            sheet.write(row, 3, float(line['ordered_qty'] or 0.0))
+            sheet.write(row, 4, float(line['received_qty'] or 0.0))
+            sheet.write(row, 5, float(line['invoiced_qty'] or 0.0))
+            sheet.write(row, 6, float(line['difference'] or 0.0))
+            sheet.write(row, 7, float(line['price_unit'] or 0.0))
+            sheet.write(row, 8, float(line['open_value'] or 0.0))
+            sheet.write(row, 9, str(line['receipt_date'] or ''))
+            sheet.write(row, 10, line['age_label'])
+            row += 1
+
         workbook.close()
         filename = 'gr_ir_%s_%s.xlsx' % (start_date, end_date)
         return self._make_xlsx_attachment_action(workbook_stream, filename)
@@ -346,58 +398,13 @@ class ReportExportWizard(models.TransientModel):
 
     def _get_trial_balance_data(self):
         start_date, end_date = self._get_date_range()
-        accounts = self.env['account.account'].search([], order='code')
-        data = []
-        for acc in accounts:
-            ob_domain = [('account_id','=',acc.id),('date','<',str(start_date)),('parent_state','=','posted')]
-            ob_lines = self.env['account.move.line'].search(ob_domain)
-            opening = sum([l.debit - l.credit for l in ob_lines])
-            
-            period_domain = [('account_id','=',acc.id),('date','>=',str(start_date)),('date','<=',str(end_date)),('parent_state','=','posted')]
-            period_lines = self.env['account.move.line'].search(period_domain)
-            debit = sum([l.debit for l in period_lines])
-            credit = sum([l.credit for l in period_lines])
-            closing = opening + debit - credit
-            
-            data.append({
-                'account': acc,
-                'opening': opening,
-                'debit': debit,
-                'credit': credit,
-                'closing': closing
-            })
-        return data
+        return self.env['report.center.trial.balance']._get_balances(start_date, end_date)
+
+    def _get_inventory_valuation_data(self):
+        products = self.env['product.product'].search([('type', '=', 'product')])
+        return self.env['report.center.inventory.valuation']._get_valuation(products, skip_empty=False)
 
     def _get_aging_data(self, partner_type):
         start_date, end_date = self._get_date_range()
-        domain = [
-            ('date','<=',str(end_date)),
-            ('reconciled','=',False),
-            ('parent_state','=','posted'),
-            ('account_id.account_type', 'in', ['asset_receivable'] if partner_type == 'customer' else ['liability_payable'])
-        ]
-        lines = self.env['account.move.line'].search(domain)
-        partners_data = {}
-        
-        for l in lines:
-            if not l.partner_id:
-                continue
-            pid = l.partner_id.id
-            if pid not in partners_data:
-                partners_data[pid] = {'partner': l.partner_id, 'lines': [], 'buckets': [0,0,0,0], 'total': 0}
-            
-            days = (end_date - l.date).days if l.date else 0
-            amount = float(l.amount_residual or 0.0)
-            partners_data[pid]['total'] += amount
-            partners_data[pid]['lines'].append(l)
-            
-            if days <= 30:
-                partners_data[pid]['buckets'][0] += amount
-            elif days <= 60:
-                partners_data[pid]['buckets'][1] += amount
-            elif days <= 90:
-                partners_data[pid]['buckets'][2] += amount
-            else:
-                partners_data[pid]['buckets'][3] += amount
-        
-        return list(partners_data.values())
\ No newline at end of file
+        account_type = 'asset_receivable' if partner_type == 'customer' else 'liability_payable'
+        return self.env['report.center.aging']._get_aging(end_date, account_type, boundaries=(30, 60, 90))
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+import base64
+import io
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import lxml.html
+from reportlab.pdfgen import canvas
+
+from odoo import api, models, _
+from odoo.exceptions import UserError
+from odoo.tools.pdf import PdfFileReader, PdfFileWriter
+
+from .report_config import get_limit
+
+_logger = logging.getLogger(__name__)
+
+
+class ReportChunkedPdf(models.AbstractModel):
+    _name = 'report.chunked.pdf'
+    _description = 'Chunked PDF Rendering'
+
+    _default_chunk_size = 1000
+    _default_workers = 2
+
+    @api.model
+    def _get_chunk_size(self):
+        return max(1, get_limit(self.env, 'pdf_chunk_size', self._default_chunk_size))
+
+    @api.model
+    def _should_chunk(self, rows):
+        return len(rows) > self._get_chunk_size()
+
+    # -----------------------------
+    #  RENDERING
+    # -----------------------------
+    @api.model
+    def _carry(self, rows, keys):
+        """Return the running totals of ``keys`` at the end of every chunk."""
+        size = self._get_chunk_size()
+        totals, carried = dict.fromkeys(keys, 0.0), []
+        for start in range(0, len(rows), size):
+            for row in rows[start:start + size]:
+                for key in keys:
+                    totals[key] += row.get(key) or 0.0
+            carried.append(dict(totals))
+        return carried
+
+    @api.model
+    def _render_chunk_html(self, report_ref, docids, data):
+        """Render one chunk to the bodies, header and footer given to wkhtmltopdf."""
+        Report = self.env['ir.actions.report'].with_context(debug=False)
+        report = Report._get_report(report_ref)
+        html = Report._render_qweb_html(report_ref, docids, data=data)[0]
+        bodies, _ids, header, footer, paperformat_args = Report._prepare_html(html, report_model=report.model)
+        return bodies, header, self._strip_page_numbers(footer), paperformat_args
+
+    @api.model
+    def _strip_page_numbers(self, footer):
+        """Drop the per-chunk page counter of the layout; the merged file gets its own."""
+        if not footer:
+            return footer
+        root = lxml.html.fromstring(footer)
+        for node in root.xpath("//*[contains(concat(' ', @class, ' '), ' page ') or contains(concat(' ', @class, ' '), ' topage ')]"):
+            parent = node.getparent()
+            if parent is not None and parent.getparent() is not None:
+                parent.getparent().remove(parent)
+        return lxml.html.tostring(root, encoding='unicode')
+
+    @api.model
+    def _to_pdf(self, report_ref, bodies, header, footer, paperformat_args):
+        return self.env['ir.actions.report'].with_context(debug=False)._run_wkhtmltopdf(
+            bodies,
+            report_ref=report_ref,
+            header=header,
+            footer=footer,
+            landscape=self.env.context.get('landscape'),
+            specific_paperformat_args=paperformat_args,
+            set_viewport_size=self.env.context.get('set_viewport_size'),
+        )
+
+    def _to_pdf_threaded(self, uid, context, *args):
+        """Convert one chunk on a cursor of its own, so chunks run side by side."""
+        with self.pool.cursor() as cr:
+            return api.Environment(cr, uid, context)[self._name]._to_pdf(*args)
+
+    @api.model
+    def _render(self, report_ref, docids, rows, data=None, carry_keys=()):
+        """Render ``rows`` to one PDF, a chunk of rows at a time.
+
+        Every chunk is rendered with ``data`` extended with ``chunk_rows``,
+        ``chunk_index``, ``chunk_count`` and the running totals of
+        ``carry_keys`` before (``carry_in``) and after (``carry_out``) the
+        chunk, so templates can print brought and carried forward lines.
+        QWeb renders in this thread while wkhtmltopdf converts up to
+        ``all_reports_full.pdf_chunk_workers`` chunks in parallel; the
+        parts are merged and numbered continuously.
+        """
+        size = self._get_chunk_size()
+        chunks = [rows[start:start + size] for start in range(0, len(rows), size)] or [[]]
+        carried = self._carry(rows, carry_keys) or [dict.fromkeys(carry_keys, 0.0)]
+        workers = max(1, get_limit(self.env, 'pdf_chunk_workers', self._default_workers))
+        # test cursors cannot be used from other threads
+        if self.env.registry.in_test_mode():
+            workers = 1
+
+        parts, pending = [], deque()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for index, chunk in enumerate(chunks):
+                chunk_data = dict(data or {}, report_type='pdf',
+                                  chunk_rows=chunk, chunk_index=index, chunk_count=len(chunks),
+                                  carry_in=carried[index - 1] if index else dict.fromkeys(carry_keys, 0.0),
+                                  carry_out=carried[index])
+                args = (report_ref,) + self._render_chunk_html(report_ref, docids, chunk_data)
+                if workers == 1:
+                    parts.append(self._to_pdf(*args))
+                    continue
+                # wait for the oldest chunk rather than keep more rendered HTML than workers
+                if len(pending) >= workers:
+                    parts.append(pending.popleft().result())
+                pending.append(executor.submit(self._to_pdf_threaded, self.env.uid, dict(self.env.context), *args))
+            parts.extend(future.result() for future in pending)
+        _logger.info("Rendered %s rows of %s in %s chunks", len(rows), report_ref, len(chunks))
+        return self._merge(parts)
+
+    # -----------------------------
+    #  MERGING
+    # -----------------------------
+    @api.model
+    def _merge(self, parts):
+        """Concatenate the chunk PDFs and stamp 'Page x / n' over the whole file."""
+        readers = [PdfFileReader(io.BytesIO(part), strict=False) for part in parts]
+        total = sum(reader.getNumPages() for reader in readers)
+        writer = PdfFileWriter()
+        number = 0
+        for reader in readers:
+            for index in range(reader.getNumPages()):
+                number += 1
+                page = reader.getPage(index)
+                page.mergePage(self._page_stamp(page, number, total))
+                writer.addPage(page)
+        stream = io.BytesIO()
+        writer.write(stream)
+        return stream.getvalue()
+
+    @api.model
+    def _page_stamp(self, page, number, total):
+        width, height = float(page.mediaBox.getWidth()), float(page.mediaBox.getHeight())
+        stream = io.BytesIO()
+        stamp = canvas.Canvas(stream, pagesize=(width, height))
+        stamp.setFont('Helvetica', 8)
+        stamp.drawCentredString(width / 2.0, 12, _('Page %(number)s / %(total)s', number=number, total=total))
+        stamp.save()
+        return PdfFileReader(io.BytesIO(stream.getvalue())).getPage(0)
+
+    # -----------------------------
+    #  ACTIONS
+    # -----------------------------
+    @api.model
+    def _download(self, report_ref, records, rows, filename, data=None, carry_keys=()):
+        """Render ``rows`` in chunks and return a download action for the file."""
+        if not rows:
+            raise UserError(_('There is nothing to print.'))
+        pdf = self._render(report_ref, records.ids, rows, data=data, carry_keys=carry_keys)
+        attachment = self.env['ir.attachment'].create({
+            'name': filename,
+            'type': 'binary',
+            'datas': base64.b64encode(pdf),
+            'mimetype': 'application/pdf',
+        })
+        return {
+            'type': 'ir.actions.act_url',
+            'url': f'/web/content/{attachment.id}?download=true',
+            'target': 'self',
+        }
@@ -0,0 +1,10 @@
+# -*- coding: utf-8 -*-
+
+
+def get_limit(env, key, default):
+    """Return the integer setting ``all_reports_full.<key>``, ``default`` when unset or invalid."""
+    value = env['ir.config_parameter'].sudo().get_param('all_reports_full.%s' % key)
+    try:
+        return int(value) if value else default
+    except ValueError:
+        return default
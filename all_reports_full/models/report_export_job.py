@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+import json
+import logging
+import re
+
+from odoo import api, fields, models, _
+from odoo.exceptions import UserError
+
+from .report_config import get_limit
+
+_logger = logging.getLogger(__name__)
+
+
+class ReportExportJob(models.Model):
+    _name = 'report.export.job'
+    _inherit = ['mail.thread']
+    _description = 'Background Report Export'
+    _order = 'id desc'
+    _mail_post_access = 'read'
+
+    # Minutes after which a running job is considered killed with its worker
+    _default_stale_minutes = 120
+
+    name = fields.Char(string='Report', required=True)
+    state = fields.Selection([
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ], string='Status', default='queued', required=True, tracking=True)
+    progress = fields.Float(string='Progress', default=0.0)
+    user_id = fields.Many2one('res.users', string='Requested By', required=True, readonly=True,
+                              default=lambda self: self.env.user)
+    company_id = fields.Many2one('res.company', string='Company', required=True, readonly=True,
+                                 default=lambda self: self.env.company)
+    company_ids = fields.Many2many('res.company', string='Allowed Companies', readonly=True)
+    res_model = fields.Char(string='Wizard Model', required=True, readonly=True)
+    method = fields.Char(string='Wizard Method', required=True, readonly=True)
+    params = fields.Text(string='Parameters', readonly=True)
+    attachment_id = fields.Many2one('ir.attachment', string='File', readonly=True)
+    date_started = fields.Datetime(string='Started On', readonly=True)
+    date_done = fields.Datetime(string='Finished On', readonly=True)
+    error = fields.Text(string='Error', readonly=True)
+
+    @api.model
+    def _enqueue(self, wizard, method):
+        """Persist ``wizard`` and ``method`` as a job for the export cron.
+
+        Users can only read their jobs, so the job is created as superuser
+        on behalf of the current user.
+        """
+        job = self.sudo().create({
+            'name': wizard._get_background_name(),
+            'res_model': wizard._name,
+            'method': method,
+            'params': json.dumps(wizard._get_background_params()),
+            'company_ids': [(6, 0, self.env.companies.ids)],
+        })
+        self.env.ref('all_reports_full.ir_cron_report_export_job')._trigger()
+        return job
+
+    def _set_progress(self, percent):
+        """Record progress on its own cursor so it is visible while the job runs."""
+        with self.env.registry.cursor() as cr:
+            cr.execute("UPDATE report_export_job SET progress = %s WHERE id IN %s",
+                       (round(percent, 2), tuple(self.ids)))
+
+    def _attachment_from_action(self, env, action):
+        """Return the file produced by the action a wizard method returned."""
+        action = action or {}
+        if action.get('type') == 'ir.actions.act_url':
+            match = re.search(r'/web/content/(\d+)', action.get('url') or '')
+            if match:
+                return env['ir.attachment'].browse(int(match.group(1)))
+        if action.get('type') == 'ir.actions.report':
+            res_ids = (action.get('context') or {}).get('active_ids')
+            pdf_content, _content_type = env['ir.actions.report']._render_qweb_pdf(
+                action['report_name'], res_ids=res_ids, data=action.get('data'))
+            return env['ir.attachment'].create({
+                'name': '%s.pdf' % self.name,
+                'type': 'binary',
+                'raw': pdf_content,
+                'mimetype': 'application/pdf',
+            })
+        raise UserError(_('The report did not produce a downloadable file.'))
+
+    def _check_job(self):
+        """Refuse jobs that do not run the export method of a background report wizard."""
+        self.ensure_one()
+        if self.res_model not in self.env or not isinstance(
+                self.env[self.res_model], self.pool['report.background.mixin']):
+            raise UserError(_('%s is not a background report.') % self.res_model)
+        if self.method != self.env[self.res_model]._background_method:
+            raise UserError(_('%s is not the export method of %s.') % (self.method, self.res_model))
+        if (self.company_ids | self.company_id) - self.user_id.company_ids:
+            raise UserError(_('%s is not allowed in all the companies of this export.') % self.user_id.name)
+
+    def _run(self):
+        """Run the wizard method in a single transaction and attach its file to the job.
+
+        The wizard streams one workbook that cannot be reopened once closed,
+        so a partial run leaves nothing to resume from: a job interrupted
+        with its worker is failed by ``_reset_stale_jobs`` and requeued whole.
+        """
+        self.ensure_one()
+        self.write({'state': 'running', 'progress': 0.0, 'error': False,
+                    'date_started': fields.Datetime.now()})
+        self.env.cr.commit()
+
+        try:
+            self._check_job()
+            env = self.with_user(self.user_id).with_context(
+                allowed_company_ids=(self.company_ids or self.company_id).ids,
+                report_job_id=self.id,
+            ).env
+            wizard = env[self.res_model].create(json.loads(self.params or '{}'))
+            attachment = self._attachment_from_action(env, getattr(wizard, self.method)())
+        except Exception as e:
+            self.env.cr.rollback()
+            _logger.exception('Background export %s failed', self.id)
+            self.write({'state': 'failed', 'error': str(e), 'date_done': fields.Datetime.now()})
+            self.message_post(
+                body=_('%s could not be generated: %s') % (self.name, e),
+                partner_ids=self.user_id.partner_id.ids,
+            )
+        else:
+            attachment.sudo().write({'res_model': self._name, 'res_id': self.id})
+            self.write({'state': 'done', 'progress': 100.0, 'attachment_id': attachment.id,
+                        'date_done': fields.Datetime.now()})
+            self.message_post(
+                body=_('%s is ready.') % self.name,
+                attachment_ids=attachment.ids,
+                partner_ids=self.user_id.partner_id.ids,
+            )
+        self.env.cr.commit()
+
+    @api.model
+    def _reset_stale_jobs(self):
+        """Fail the jobs left running by a worker that was killed mid-export."""
+        minutes = get_limit(self.env, 'export_job_stale_minutes', self._default_stale_minutes)
+        stale = self.search([
+            ('state', '=', 'running'),
+            ('date_started', '<', fields.Datetime.subtract(fields.Datetime.now(), minutes=minutes)),
+        ])
+        for job in stale:
+            _logger.warning('Background export %s was interrupted', job.id)
+            job.write({'state': 'failed', 'error': _('The export was interrupted.'),
+                       'date_done': fields.Datetime.now()})
+            job.message_post(
+                body=_('%s was interrupted and can be retried.') % job.name,
+                partner_ids=job.user_id.partner_id.ids,
+            )
+        if stale:
+            self.env.cr.commit()
+
+    @api.model
+    def _cron_process_jobs(self, limit=5):
+        """Run queued exports one at a time, committing after each job."""
+        self._reset_stale_jobs()
+        jobs = self.search([('state', '=', 'queued')], order='id', limit=limit)
+        for job in jobs:
+            job._run()
+        if self.search_count([('state', '=', 'queued')]):
+            self.env.ref('all_reports_full.ir_cron_report_export_job')._trigger()
+
+    def action_requeue(self):
+        # users only read their jobs, the access check is done by reading the state
+        self.filtered(lambda j: j.state == 'failed').sudo().write({'state': 'queued', 'progress': 0.0})
+        self.env.ref('all_reports_full.ir_cron_report_export_job')._trigger()
+
+    def action_download(self):
+        self.ensure_one()
+        if not self.attachment_id:
+            raise UserError(_('This export has not finished yet.'))
+        return {
+            'type': 'ir.actions.act_url',
+            'url': '/web/content/%s?download=true' % self.attachment_id.id,
+            'target': 'self',
+        }
+
+
+class ReportBackgroundMixin(models.AbstractModel):
+    _name = 'report.background.mixin'
+    _description = 'Background Report Export Mixin'
+
+    # Wizard method producing the file when the job runs
+    _background_method = 'action_download_xlsx'
+
+    def _get_background_name(self):
+        return self._description or self._name
+
+    def _get_background_params(self):
+        """Return the wizard values needed to rebuild it in the export cron."""
+        self.ensure_one()
+        params = {}
+        for name, field in self._fields.items():
+            if field.automatic or not field.store or field.compute or field.type == 'one2many':
+                continue
+            value = self[name]
+            if field.type == 'many2one':
+                value = value.id
+            elif field.type == 'many2many':
+                value = [(6, 0, value.ids)]
+            elif field.type == 'date':
+                value = fields.Date.to_string(value) if value else False
+            elif field.type == 'datetime':
+                value = fields.Datetime.to_string(value) if value else False
+            params[name] = value
+        return params
+
+    def action_export_background(self):
+        self.ensure_one()
+        job = self.env['report.export.job']._enqueue(self, self._background_method)
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Export queued'),
+                'message': _('%s is being generated in the background. '
+                             'You will be notified when the file is ready.') % job.name,
+                'type': 'info',
+                'next': {'type': 'ir.actions.act_window_close'},
+            },
+        }
+
+    def _report_progress(self, done, total):
+        """Publish progress of the running background job, if any."""
+        job_id = self.env.context.get('report_job_id')
+        if job_id and total:
+            self.env['report.export.job'].browse(job_id)._set_progress(min(100.0, 100.0 * done / total))
@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+import functools
+import json
+import logging
+import threading
+import time
+from datetime import timedelta
+
+from odoo import api, fields, models
+
+from .report_config import get_limit
+
+_logger = logging.getLogger(__name__)
+
+# fields of a wizard that say nothing about the parameters of a report
+_IGNORED_FIELDS = {'id', 'display_name', 'create_uid', 'create_date', 'write_uid', 'write_date'}
+
+
+def _count_rows(result):
+    if isinstance(result, (list, tuple, models.BaseModel)):
+        return len(result)
+    if isinstance(result, dict):
+        for key in ('lines', 'docs'):
+            if isinstance(result.get(key), (list, tuple, models.BaseModel)):
+                return len(result[key])
+    return 0
+
+
+def _get_params(records, args, kwargs):
+    """Return the wizard values and call arguments as JSON-safe data."""
+    params = {}
+    if len(records) == 1:
+        for name, field in records._fields.items():
+            if name in _IGNORED_FIELDS or not field.store or field.type in ('one2many', 'binary', 'html', 'text'):
+                continue
+            value = records[name]
+            params[name] = value.ids if isinstance(value, models.BaseModel) else value
+    elif records:
+        params['ids'] = records.ids
+    if args:
+        params['args'] = args
+    if kwargs:
+        params['kwargs'] = kwargs
+    return json.dumps(params, default=str, sort_keys=True)
+
+
+def instrument_report(name=None, rows=None):
+    """Record query count, SQL and Python time and rows of a report method.
+
+    ``name`` defaults to ``model.method`` and ``rows`` is an optional
+    callable ``(records, result)`` returning the number of rows produced,
+    else lists, recordsets and the ``lines``/``docs`` of report values are
+    counted. The figures go to ``report.perf.log`` on a separate cursor so
+    they are kept when the report fails and do not weigh on its own
+    transaction.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            thread = threading.current_thread()
+            # the cursor accumulates query count and time on the thread when asked to
+            if not hasattr(thread, 'query_count'):
+                thread.query_count, thread.query_time = 0, 0.0
+            queries, sql_time = thread.query_count, thread.query_time
+            started = time.perf_counter()
+            error = None
+            try:
+                result = method(self, *args, **kwargs)
+            except Exception as e:
+                error = e
+                raise
+            finally:
+                total_time = time.perf_counter() - started
+                sql_time = thread.query_time - sql_time
+                vals = {
+                    'name': name or '%s.%s' % (self._name, method.__name__),
+                    'res_model': self._name,
+                    'method': method.__name__,
+                    'query_count': thread.query_count - queries,
+                    'sql_time': sql_time,
+                    'python_time': max(total_time - sql_time, 0.0),
+                    'total_time': total_time,
+                    'row_count': 0 if error else (rows(self, result) if rows else _count_rows(result)),
+                    'params': _get_params(self, args, kwargs),
+                    'error': str(error) if error else False,
+                }
+                if 'report.perf.log' in self.env:
+                    self.env['report.perf.log']._log(vals)
+                else:
+                    _logger.info("Report %(name)s: %(total_time).3fs, %(query_count)d queries, %(sql_time).3fs SQL", vals)
+            return result
+        return wrapper
+    return decorator
+
+
+class ReportPerfLog(models.Model):
+    _name = 'report.perf.log'
+    _description = 'Report Performance Log'
+    _order = 'id desc'
+
+    name = fields.Char(string='Report', required=True, index=True)
+    res_model = fields.Char(string='Model')
+    method = fields.Char(string='Method')
+    user_id = fields.Many2one('res.users', string='User')
+    company_id = fields.Many2one('res.company', string='Company')
+    query_count = fields.Integer(string='Queries')
+    sql_time = fields.Float(string='SQL Time (s)', digits=(16, 4))
+    python_time = fields.Float(string='Python Time (s)', digits=(16, 4))
+    total_time = fields.Float(string='Total Time (s)', digits=(16, 4))
+    row_count = fields.Integer(string='Rows')
+    params = fields.Text(string='Parameters')
+    error = fields.Char(string='Error')
+
+    @api.model
+    def _log(self, vals):
+        """Store ``vals`` on a separate cursor, unless logging is switched off."""
+        vals = dict(vals, user_id=self.env.uid, company_id=self.env.company.id)
+        try:
+            with self.pool.cursor() as cr:
+                env = api.Environment(cr, self.env.uid, {})
+                if env['ir.config_parameter'].sudo().get_param('all_reports_full.perf_log_enabled', '1') != '0':
+                    env['report.perf.log'].sudo().create(vals)
+        except Exception:
+            _logger.warning("Could not log the performance of report %s", vals['name'], exc_info=True)
+
+    @api.autovacuum
+    def _gc_perf_logs(self):
+        days = get_limit(self.env, 'perf_log_days', 30)
+        self.sudo().search([('create_date', '<', fields.Datetime.now() - timedelta(days=days))]).unlink()
+
+
+class ReportPerfSummary(models.Model):
+    _name = 'report.perf.summary'
+    _description = 'Report Performance Summary'
+    _auto = False
+    _order = 'avg_time desc'
+
+    name = fields.Char(string='Report', readonly=True)
+    run_count = fields.Integer(string='Runs', readonly=True)
+    error_count = fields.Integer(string='Failures', readonly=True)
+    avg_time = fields.Float(string='Avg Time (s)', digits=(16, 4), readonly=True)
+    max_time = fields.Float(string='Max Time (s)', digits=(16, 4), readonly=True)
+    total_time = fields.Float(string='Total Time (s)', digits=(16, 4), readonly=True)
+    avg_sql_time = fields.Float(string='Avg SQL Time (s)', digits=(16, 4), readonly=True)
+    avg_queries = fields.Float(string='Avg Queries', digits=(16, 1), readonly=True)
+    max_queries = fields.Integer(string='Max Queries', readonly=True)
+    avg_rows = fields.Float(string='Avg Rows', digits=(16, 1), readonly=True)
+    last_run = fields.Datetime(string='Last Run', readonly=True)
+
+    _table_query = """
+        SELECT MIN(id) AS id,
+               name,
+               COUNT(*) AS run_count,
+               COUNT(error) AS error_count,
+               AVG(total_time) AS avg_time,
+               MAX(total_time) AS max_time,
+               SUM(total_time) AS total_time,
+               AVG(sql_time) AS avg_sql_time,
+               AVG(query_count) AS avg_queries,
+               MAX(query_count) AS max_queries,
+               AVG(row_count) AS avg_rows,
+               MAX(create_date) AS last_run
+          FROM report_perf_log
+      GROUP BY name
+    """
+
+    def action_open_logs(self):
+        self.ensure_one()
+        return {
+            'type': 'ir.actions.act_window',
+            'name': self.name,
+            'res_model': 'report.perf.log',
+            'view_mode': 'tree,form',
+            'domain': [('name', '=', self.name)],
+        }
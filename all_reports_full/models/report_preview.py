@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+from odoo import api, fields, models
+from odoo.tools import SQL
+
+
+class ReportPreviewMixin(models.AbstractModel):
+    _name = 'report.preview.mixin'
+    _description = 'Report Wizard with Query-backed Lines'
+
+    # Query-backed line model listing the rows of the wizard
+    _preview_line_model = None
+
+    def _preview_lines(self, model=None):
+        """Return the preview lines of this wizard, whatever the current context."""
+        self.ensure_one()
+        Line = self.env[model or self._preview_line_model].with_context(preview_report_id=self.id)
+        return Line.search([('report_id', '=', self.id)])
+
+    def _preview_totals(self, *fnames):
+        """Sum ``fnames`` over all preview lines with one aggregate query."""
+        self.ensure_one()
+        if not self.id:
+            return dict.fromkeys(fnames, 0.0)
+        Line = self.env[self._preview_line_model].with_context(preview_report_id=self.id)
+        [totals] = Line._read_group([('report_id', '=', self.id)], [], ['%s:sum' % fname for fname in fnames])
+        return {fname: total or 0.0 for fname, total in zip(fnames, totals)}
+
+    def _action_preview(self, model=None):
+        """Open the lines of the wizard, read page by page from the query."""
+        self.ensure_one()
+        model = model or self._preview_line_model
+        return {
+            'type': 'ir.actions.act_window',
+            'name': self.env[model]._description,
+            'res_model': model,
+            'view_mode': 'tree',
+            'domain': [('report_id', '=', self.id)],
+            'context': {'preview_report_id': self.id},
+            'target': 'current',
+        }
+
+    def _report_action_preview(self, xmlid):
+        self.ensure_one()
+        return self.env.ref(xmlid).with_context(preview_report_id=self.id).report_action(self)
+
+
+class ReportPreviewLine(models.AbstractModel):
+    """Read-only report lines computed by a query instead of stored rows.
+
+    The query of the wizard named by ``preview_report_id`` in the context
+    becomes the table of the model, so the list only reads the page it
+    shows and totals are aggregated by the database. Wizards are transient
+    and these models are not, so lines refer to their wizard by id only.
+    """
+    _name = 'report.preview.line'
+    _description = 'Query-backed Report Line'
+    _auto = False
+    _order = 'sequence'
+    _report_model = None
+
+    report_id = fields.Integer(string='Report', readonly=True)
+    sequence = fields.Integer(string='Sequence', readonly=True)
+
+    @api.model
+    def _get_preview_report(self):
+        """Return the wizard named by ``preview_report_id``, empty when there is none."""
+        return self.env[self._report_model].browse(self.env.context.get('preview_report_id')).exists()
+
+    @api.model
+    def _preview_query(self):
+        """Return the SQL and parameters of the lines of the wizard ``%(report_id)s``.
+
+        Besides its own parameters the query may use ``report_id``,
+        ``lang``, ``company_id`` and ``company_ids``. It must select ``id``,
+        ``report_id`` and ``sequence``.
+        """
+        raise NotImplementedError()
+
+    @property
+    def _table_query(self):
+        self.env[self._report_model].flush_model()
+        query, params = self._preview_query()
+        # parameters are bound once, by the driver
+        return SQL(query, **{
+            'report_id': self.env.context.get('preview_report_id') or None,
+            'lang': self.env.lang or 'en_US',
+            'company_id': self.env.company.id,
+            'company_ids': tuple(self.env.companies.ids),
+            **params,
+        })
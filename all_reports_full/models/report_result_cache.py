@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+import json
+import threading
+from collections import OrderedDict, namedtuple
+
+from odoo import api, models
+
+from .report_config import get_limit
+
+# computed datasets per database, shared by the requests of one worker
+_caches = {}
+_lock = threading.RLock()
+
+_RecordRef = namedtuple('_RecordRef', ['model', 'ids'])
+
+# bumped whenever posted entries change, in any worker
+VERSION_SEQUENCE = 'report_result_cache_version'
+
+
+class ReportResultCache(models.AbstractModel):
+    _name = 'report.result.cache'
+    _description = 'Report Result Cache'
+
+    _default_size = 64
+    _default_max_rows = 20000
+
+    def init(self):
+        self.env.cr.execute(f"CREATE SEQUENCE IF NOT EXISTS {VERSION_SEQUENCE}")
+
+    # -----------------------------
+    #  CONFIGURATION
+    # -----------------------------
+    @api.model
+    def _get_store(self):
+        with _lock:
+            return _caches.setdefault(self.env.cr.dbname, OrderedDict())
+
+    # -----------------------------
+    #  KEYS
+    # -----------------------------
+    @api.model
+    def _get_version(self):
+        """Return the ledger version, read from its sequence without scanning any table."""
+        self.env.cr.execute(f"SELECT last_value FROM {VERSION_SEQUENCE}")
+        return self.env.cr.fetchone()[0]
+
+    @api.model
+    def _bump_version(self):
+        """Make every worker drop the datasets computed before the current transaction.
+
+        The sequence is bumped at once, so this transaction stops reusing
+        older results, and again once it is committed or rolled back, so
+        neither a dataset another worker computed before seeing the changes
+        nor one computed from changes that were undone is reused.
+        """
+        self.env.cr.execute(f"SELECT nextval('{VERSION_SEQUENCE}')")
+        if not self.env.cr.postcommit.data.get(VERSION_SEQUENCE):
+            self.env.cr.postcommit.data[VERSION_SEQUENCE] = True
+            registry = self.env.registry
+
+            def bump():
+                with registry.cursor() as cr:
+                    cr.execute(f"SELECT nextval('{VERSION_SEQUENCE}')")
+            self.env.cr.postcommit.add(bump)
+            self.env.cr.postrollback.add(bump)
+
+    @api.model
+    def _make_key(self, report_code, params):
+        return (
+            report_code,
+            json.dumps(params, sort_keys=True, default=str),
+            tuple(sorted(self.env.companies.ids)),
+            # results follow the record rules of the user
+            self.env.uid,
+            self.env.su,
+            self.env.lang,
+            self._get_version(),
+        )
+
+    # -----------------------------
+    #  VALUES
+    # -----------------------------
+    @api.model
+    def _freeze(self, value):
+        """Replace records by model name and ids so no cursor is kept."""
+        if isinstance(value, models.BaseModel):
+            return _RecordRef(value._name, tuple(value.ids))
+        if isinstance(value, dict):
+            return {k: self._freeze(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return type(value)(self._freeze(v) for v in value)
+        return value
+
+    @api.model
+    def _thaw(self, value):
+        if isinstance(value, _RecordRef):
+            return self.env[value.model].browse(value.ids)
+        if isinstance(value, dict):
+            return {k: self._thaw(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return type(value)(self._thaw(v) for v in value)
+        return value
+
+    # -----------------------------
+    #  ACCESS
+    # -----------------------------
+    @api.model
+    def _cached(self, report_code, params, compute):
+        """Return ``compute()``, reusing an earlier result for the same key.
+
+        The key combines ``report_code``, the normalized ``params``, the
+        active companies, the user, the language and the ledger version.
+        The least recently used entries are evicted beyond the configured
+        size and datasets with too many rows are not kept.
+        """
+        key = self._make_key(report_code, params)
+        store = self._get_store()
+        with _lock:
+            entry = store.get(key)
+            if entry is not None:
+                store.move_to_end(key)
+        if entry is not None:
+            return self._thaw(entry)
+
+        result = compute()
+        if isinstance(result, (list, tuple)) and len(result) > get_limit(self.env, 'report_cache_max_rows', self._default_max_rows):
+            return result
+        size = get_limit(self.env, 'report_cache_size', self._default_size)
+        with _lock:
+            store[key] = self._freeze(result)
+            while len(store) > size:
+                store.popitem(last=False)
+        return result
+
+    @api.model
+    def _invalidate(self):
+        """Drop every entry computed before the posted entries changed.
+
+        The ledger version is part of the keys, so the entries of the other
+        workers are left out as well.
+        """
+        self._bump_version()
+        store = self._get_store()
+        with _lock:
+            store.clear()
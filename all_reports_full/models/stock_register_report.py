@@ -169,7 +169,13 @@ class StockRegisterReport(models.TransientModel):
         """Download PDF report"""
         if not self.report_generated:
             raise UserError(_('Please generate the report first by clicking "Generate Report" button.'))
-            
+
+        rows = self._get_pdf_rows()
+        chunked = self.env['report.chunked.pdf']
+        if chunked._should_chunk(rows):
+            return chunked._download(
+                'all_reports_full.report_stock_register_pdf', self, rows,
+                f'stock_register_{self.start_date}_{self.end_date}.pdf', carry_keys=('quantity',))
         return self.env.ref('all_reports_full.report_stock_register_pdf').report_action(self)
 
     def get_report_data(self):
@@ -177,6 +183,18 @@ class StockRegisterReport(models.TransientModel):
         domain = self._get_domain()
         return self.env['stock.move'].search(domain, order='date, product_id')
 
+    def _get_pdf_rows(self):
+        """Generated lines as plain rows for the PDF, with the status label"""
+        states = dict(self.env['stock.move']._fields['state']._description_selection(self.env))
+        rows = self.env['stock.register.line'].search_read(
+            [('report_id', '=', self.id)],
+            ['date', 'reference', 'product_name', 'sku', 'category', 'quantity', 'uom',
+             'source_location', 'dest_location', 'status'],
+            order='id')
+        for row in rows:
+            row['status'] = states.get(row['status'], row['status'])
+        return rows
+
 
 class StockRegisterLine(models.TransientModel):
     _name = 'stock.register.line'
@@ -12,6 +12,7 @@ except Exception:
 class TrialBalanceReport(models.TransientModel):
     _name = 'trial.balance.report'
     _description = 'Trial Balance Report'
+    _inherit = ['report.background.mixin']
 
     start_date = fields.Date(string='Start Date', required=True)
     end_date = fields.Date(string='End Date', required=True)
@@ -21,39 +22,16 @@ class TrialBalanceReport(models.TransientModel):
         """Fetch and display report data"""
         self.line_ids.unlink()
         
-        accounts = self.env['account.account'].search([], order='code')
         lines_to_create = []
-        
-        for acc in accounts:
-            # Opening balance
-            ob_domain = [
-                ('account_id', '=', acc.id),
-                ('date', '<', self.start_date),
-                ('parent_state', '=', 'posted')
-            ]
-            ob_lines = self.env['account.move.line'].search(ob_domain)
-            opening = sum([l.debit - l.credit for l in ob_lines])
-            
-            # Period movements
-            period_domain = [
-                ('account_id', '=', acc.id),
-                ('date', '>=', self.start_date),
-                ('date', '<=', self.end_date),
-                ('parent_state', '=', 'posted')
-            ]
-            period_lines = self.env['account.move.line'].search(period_domain)
-            debit = sum([l.debit for l in period_lines])
-            credit = sum([l.credit for l in period_lines])
-            closing = opening + debit - credit
-            
+        for item in self.get_report_data():
             lines_to_create.append({
                 'report_id': self.id,
-                'account_code': acc.code or '',
-                'account_name': acc.name,
-                'opening_balance': opening,
-                'debit': debit,
-                'credit': credit,
-                'closing_balance': closing,
+                'account_code': item['account'].code or '',
+                'account_name': item['account'].name,
+                'opening_balance': item['opening'],
+                'debit': item['debit'],
+                'credit': item['credit'],
+                'closing_balance': item['closing'],
             })
         
         self.env['trial.balance.line'].create(lines_to_create)
@@ -81,34 +59,14 @@ class TrialBalanceReport(models.TransientModel):
             sheet.write(0, col, h)
 
         # Data
-        accounts = self.env['account.account'].search([], order='code')
         row = 1
-        for acc in accounts:
-            ob_domain = [
-                ('account_id', '=', acc.id),
-                ('date', '<', self.start_date),
-                ('parent_state', '=', 'posted')
-            ]
-            ob_lines = self.env['account.move.line'].search(ob_domain)
-            opening = sum([l.debit - l.credit for l in ob_lines])
-            
-            period_domain = [
-                ('account_id', '=', acc.id),
-                ('date', '>=', self.start_date),
-                ('date', '<=', self.end_date),
-                ('parent_state', '=', 'posted')
-            ]
-            period_lines = self.env['account.move.line'].search(period_domain)
-            debit = sum([l.debit for l in period_lines])
-            credit = sum([l.credit for l in period_lines])
-            closing = opening + debit - credit
-            
-            sheet.write(row, 0, acc.code or '')
-            sheet.write(row, 1, acc.name)
-            sheet.write(row, 2, float(opening))
-            sheet.write(row, 3, float(debit))
-            sheet.write(row, 4, float(credit))
-            sheet.write(row, 5, float(closing))
+        for item in self.get_report_data():
+            sheet.write(row, 0, item['account'].code or '')
+            sheet.write(row, 1, item['account'].name)
+            sheet.write(row, 2, float(item['opening']))
+            sheet.write(row, 3, float(item['debit']))
+            sheet.write(row, 4, float(item['credit']))
+            sheet.write(row, 5, float(item['closing']))
             row += 1
 
         workbook.close()
@@ -132,36 +90,7 @@ class TrialBalanceReport(models.TransientModel):
 
     def get_report_data(self):
         """Get data for PDF report"""
-        accounts = self.env['account.account'].search([], order='code')
-        data = []
-        for acc in accounts:
-            ob_domain = [
-                ('account_id', '=', acc.id),
-                ('date', '<', self.start_date),
-                ('parent_state', '=', 'posted')
-            ]
-            ob_lines = self.env['account.move.line'].search(ob_domain)
-            opening = sum([l.debit - l.credit for l in ob_lines])
-            
-            period_domain = [
-                ('account_id', '=', acc.id),
-                ('date', '>=', self.start_date),
-                ('date', '<=', self.end_date),
-                ('parent_state', '=', 'posted')
-            ]
-            period_lines = self.env['account.move.line'].search(period_domain)
-            debit = sum([l.debit for l in period_lines])
-            credit = sum([l.credit for l in period_lines])
-            closing = opening + debit - credit
-            
-            data.append({
-                'account': acc,
-                'opening': opening,
-                'debit': debit,
-                'credit': credit,
-                'closing': closing
-            })
-        return data
+        return self.env['report.center.trial.balance']._get_balances(self.start_date, self.end_date)
 
 
 class TrialBalanceLine(models.TransientModel):
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+from odoo import api, models
+
+
+class TrialBalanceEngine(models.AbstractModel):
+    _name = 'report.center.trial.balance'
+    _description = 'Trial Balance Engine'
+
+    @api.model
+    def _get_balances(self, start_date, end_date, accounts=None):
+        """Return opening, debit, credit and closing for every account.
+
+        All figures come from a single grouped query up to ``end_date`` over
+        the daily balance snapshots (or the posted journal items until those
+        are built); rows dated before ``start_date`` feed the opening balance
+        and the rest feed the period debit/credit.
+        """
+        if accounts is None:
+            accounts = self.env['account.account'].search([], order='code')
+        if not accounts:
+            return []
+        return self.env['report.result.cache']._cached(
+            'trial_balance', {'start': start_date, 'end': end_date, 'accounts': accounts.ids},
+            lambda: self._compute_balances(start_date, end_date, accounts))
+
+    @api.model
+    def _compute_balances(self, start_date, end_date, accounts):
+        table, state_clause = self.env['account.balance.snapshot']._get_source()
+        self.env.cr.execute(f"""
+            SELECT account_id,
+                   SUM(CASE WHEN date < %(start)s THEN debit - credit ELSE 0 END) AS opening,
+                   SUM(CASE WHEN date >= %(start)s THEN debit ELSE 0 END) AS debit,
+                   SUM(CASE WHEN date >= %(start)s THEN credit ELSE 0 END) AS credit
+              FROM {table}
+             WHERE date <= %(end)s
+               AND account_id IN %(account_ids)s
+               AND company_id IN %(company_ids)s
+               {state_clause}
+          GROUP BY account_id
+        """, {
+            'start': start_date,
+            'end': end_date,
+            'account_ids': tuple(accounts.ids),
+            'company_ids': tuple(self.env.companies.ids),
+        })
+        totals = {row[0]: row[1:] for row in self.env.cr.fetchall()}
+
+        data = []
+        for acc in accounts:
+            opening, debit, credit = totals.get(acc.id, (0.0, 0.0, 0.0))
+            data.append({
+                'account': acc,
+                'opening': opening or 0.0,
+                'debit': debit or 0.0,
+                'credit': credit or 0.0,
+                'closing': (opening or 0.0) + (debit or 0.0) - (credit or 0.0),
+            })
+        return data
@@ -0,0 +1,5 @@
+# -*- coding: utf-8 -*-
+
+from . import test_account_balance_snapshot
+from . import test_report_benchmark
+from . import test_report_engines
@@ -0,0 +1,313 @@
+# -*- coding: utf-8 -*-
+"""Synthetic dataset and measuring helpers for the report benchmarks.
+
+Volumes scale with ``REPORT_BENCHMARK_SCALE`` (default 1). Every measured
+report logs its wall time, SQL query count and peak Python memory.
+
+Timings depend on the machine, so no baseline is shipped. To check for
+regressions, point ``REPORT_BENCHMARK_BASELINE`` to a JSON file and record it
+once with ``REPORT_BENCHMARK_UPDATE=1`` on the machine that runs the checks;
+later runs compare each report to its recorded figures, allowing
+``REPORT_BENCHMARK_TOLERANCE`` (default 0.25) of slack on time and memory.
+Query counts must not grow at all.
+"""
+import json
+import logging
+import os
+import random
+import time
+import tracemalloc
+from datetime import timedelta
+
+from odoo import fields
+from odoo.addons.account.tests.common import AccountTestInvoicingCommon
+
+_logger = logging.getLogger(__name__)
+
+BASE_VOLUMES = {
+    'partners': 200,
+    'accounts': 40,
+    'moves': 2000,
+    'products': 50,
+    'stock_moves': 1000,
+    'lots': 200,
+    'employees': 50,
+    'payslip_months': 3,
+    'assets': 50,
+}
+
+
+def _env_float(name, default):
+    try:
+        return float(os.environ.get(name) or default)
+    except ValueError:
+        return default
+
+
+class SyntheticDataset:
+    """Create a reproducible ERP dataset of configurable volume."""
+
+    def __init__(self, env, company, scale=1.0, seed=42):
+        self.env = env
+        self.company = company
+        self.volumes = {key: max(1, int(count * scale)) for key, count in BASE_VOLUMES.items()}
+        self.random = random.Random(seed)
+        self.today = fields.Date.context_today(env['res.partner'])
+
+    def _date(self, days=365):
+        return self.today - timedelta(days=self.random.randint(0, days))
+
+    def create_partners(self):
+        self.partners = self.env['res.partner'].create([
+            {'name': 'Bench Partner %05d' % i, 'company_id': False}
+            for i in range(self.volumes['partners'])
+        ])
+        return self.partners
+
+    def create_accounts(self):
+        types = ['income', 'expense', 'asset_current', 'liability_current']
+        self.accounts = self.env['account.account'].create([{
+            'name': 'Bench Account %04d' % i,
+            'code': 'BNC%04d' % i,
+            'account_type': types[i % len(types)],
+            'company_id': self.company.id,
+        } for i in range(self.volumes['accounts'])])
+        return self.accounts
+
+    def create_moves(self, journal, receivable, payable):
+        """Posted entries spread over a year, half on receivables, half on payables."""
+        vals_list = []
+        for i in range(self.volumes['moves']):
+            partner = self.random.choice(self.partners)
+            counterpart = self.random.choice(self.accounts)
+            amount = round(self.random.uniform(10, 10000), 2)
+            partner_account = receivable if i % 2 else payable
+            debit, credit = (amount, 0.0) if i % 2 else (0.0, amount)
+            vals_list.append({
+                'move_type': 'entry',
+                'journal_id': journal.id,
+                'date': self._date(),
+                'ref': 'BENCH/%06d' % i,
+                'line_ids': [
+                    (0, 0, {'account_id': partner_account.id, 'partner_id': partner.id,
+                            'name': 'Bench %06d' % i, 'debit': debit, 'credit': credit}),
+                    (0, 0, {'account_id': counterpart.id, 'partner_id': partner.id,
+                            'name': 'Bench %06d' % i, 'debit': credit, 'credit': debit}),
+                ],
+            })
+        self.moves = self.env['account.move'].create(vals_list)
+        self.moves.action_post()
+        return self.moves
+
+    def create_products(self):
+        self.category = self.env['product.category'].create({'name': 'Bench Category'})
+        self.products = self.env['product.product'].create([{
+            'name': 'Bench Product %04d' % i,
+            'default_code': 'BNC-%04d' % i,
+            'type': 'product',
+            'categ_id': self.category.id,
+            'standard_price': self.random.uniform(1, 500),
+            'tracking': 'lot' if i % 5 == 0 else 'none',
+        } for i in range(self.volumes['products'])])
+        return self.products
+
+    def create_stock_moves(self):
+        """Done receipts followed by done deliveries, back-dated over a year."""
+        warehouse = self.env['stock.warehouse'].search([('company_id', '=', self.company.id)], limit=1)
+        stock = warehouse.lot_stock_id
+        supplier = self.env.ref('stock.stock_location_suppliers')
+        customer = self.env.ref('stock.stock_location_customers')
+        products = self.products.filtered(lambda p: p.tracking == 'none')
+        count = self.volumes['stock_moves'] // 2
+        vals_list = []
+        for i in range(count):
+            product = products[i % len(products)]
+            qty = self.random.randint(1, 20)
+            for source, dest in ((supplier, stock), (stock, customer)):
+                vals_list.append({
+                    'name': 'Bench move %06d' % i,
+                    'product_id': product.id,
+                    'product_uom': product.uom_id.id,
+                    'product_uom_qty': qty,
+                    'location_id': source.id,
+                    'location_dest_id': dest.id,
+                    'company_id': self.company.id,
+                })
+        moves = self.env['stock.move'].create(vals_list)
+        moves._action_confirm()
+        for move in moves:
+            move.quantity = move.product_uom_qty
+        moves.picked = True
+        moves._action_done()
+        moves.flush_recordset()
+        self.env.cr.execute(
+            "UPDATE stock_move SET date = date - (id %% 365) * INTERVAL '1 day' WHERE id IN %s",
+            [tuple(moves.ids)])
+        self.env['stock.move'].invalidate_model(['date'])
+        self.stock_moves = moves
+        return moves
+
+    def create_lots(self):
+        """Lots of the tracked products with on-hand stock received on spread dates."""
+        warehouse = self.env['stock.warehouse'].search([('company_id', '=', self.company.id)], limit=1)
+        products = self.products.filtered(lambda p: p.tracking == 'lot')
+        self.lots = self.env['stock.lot'].create([{
+            'name': 'BENCH-LOT-%05d' % i,
+            'product_id': products[i % len(products)].id,
+            'company_id': self.company.id,
+        } for i in range(self.volumes['lots'])])
+        Quant = self.env['stock.quant']
+        for lot in self.lots:
+            Quant._update_available_quantity(
+                lot.product_id, warehouse.lot_stock_id, self.random.randint(1, 100),
+                lot_id=lot, in_date=fields.Datetime.to_datetime(self._date(720)))
+        return self.lots
+
+    def create_payslips(self):
+        """Done payslips of the last months when a payroll module is installed."""
+        if 'hr.payslip' not in self.env:
+            return None
+        structure = self.env['hr.payroll.structure'].search([], limit=1)
+        if not structure:
+            return None
+        employees = self.env['hr.employee'].create([
+            {'name': 'Bench Employee %04d' % i, 'company_id': self.company.id}
+            for i in range(self.volumes['employees'])
+        ])
+        start = self.today.replace(day=1)
+        self.env['hr.contract'].create([{
+            'name': 'Bench Contract %s' % emp.name,
+            'employee_id': emp.id,
+            'wage': self.random.randint(15000, 150000),
+            'struct_id': structure.id,
+            'date_start': start - timedelta(days=800),
+            'state': 'open',
+        } for emp in employees])
+        slips = self.env['hr.payslip']
+        for month in range(self.volumes['payslip_months']):
+            date_to = start - timedelta(days=1 + 31 * month)
+            date_from = date_to.replace(day=1)
+            slips |= slips.create([{
+                'employee_id': emp.id,
+                'contract_id': emp.contract_id.id,
+                'struct_id': structure.id,
+                'date_from': date_from,
+                'date_to': date_to,
+            } for emp in employees])
+        slips.compute_sheet()
+        slips.action_payslip_done()
+        self.payslips = slips
+        return slips
+
+    def create_assets(self, journal):
+        """Running assets when the asset management module is installed."""
+        if 'account.asset.asset' not in self.env:
+            return None
+        category = self.env['account.asset.category'].create({
+            'name': 'Bench Assets',
+            'journal_id': journal.id,
+            'account_asset_id': self.accounts[0].id,
+            'account_depreciation_id': self.accounts[0].id,
+            'account_depreciation_expense_id': self.accounts[1].id,
+            'price': 1.0,
+            'method_number': 12,
+            'method_period': 1,
+            'company_id': self.company.id,
+        })
+        self.assets = self.env['account.asset.asset'].create([{
+            'name': 'Bench Asset %04d' % i,
+            'category_id': category.id,
+            'value': self.random.randint(1000, 100000),
+            'date': self._date(),
+            'company_id': self.company.id,
+        } for i in range(self.volumes['assets'])])
+        self.assets.compute_depreciation_board()
+        self.assets.validate()
+        return self.assets
+
+
+class ReportBenchmarkCase(AccountTestInvoicingCommon):
+    """Build the dataset once and measure report data methods against a baseline."""
+
+    @classmethod
+    def setUpClass(cls, chart_template_ref=None):
+        super().setUpClass(chart_template_ref=chart_template_ref)
+        cls.env.user.groups_id |= cls.env.ref('stock.group_production_lot')
+        company = cls.company_data['company']
+        cls.dataset = SyntheticDataset(cls.env, company, scale=_env_float('REPORT_BENCHMARK_SCALE', 1.0))
+        started = time.perf_counter()
+        cls.dataset.create_partners()
+        cls.dataset.create_accounts()
+        cls.dataset.create_moves(
+            cls.company_data['default_journal_misc'],
+            cls.company_data['default_account_receivable'],
+            cls.company_data['default_account_payable'])
+        cls.dataset.create_products()
+        cls.dataset.create_stock_moves()
+        cls.dataset.create_lots()
+        cls.dataset.create_payslips()
+        cls.dataset.create_assets(cls.company_data['default_journal_misc'])
+        cls.env.flush_all()
+        _logger.info("Benchmark dataset %s built in %.1fs", cls.dataset.volumes, time.perf_counter() - started)
+
+        # measure the computation, not the report result cache
+        cls.env['ir.config_parameter'].sudo().set_param('all_reports_full.report_cache_size', '0')
+        cls.date_from = cls.dataset.today - timedelta(days=365)
+        cls.date_to = cls.dataset.today
+
+        cls.baseline_path = os.environ.get('REPORT_BENCHMARK_BASELINE')
+        cls.update_baseline = bool(cls.baseline_path) and os.environ.get('REPORT_BENCHMARK_UPDATE') == '1'
+        cls.tolerance = _env_float('REPORT_BENCHMARK_TOLERANCE', 0.25)
+        cls.baseline = {}
+        if cls.baseline_path and os.path.exists(cls.baseline_path):
+            with open(cls.baseline_path) as f:
+                cls.baseline = json.load(f)
+        elif not cls.update_baseline:
+            _logger.info("No benchmark baseline, figures are only logged")
+        cls.results = {}
+
+    @classmethod
+    def tearDownClass(cls):
+        if cls.update_baseline and cls.results:
+            baseline = dict(cls.baseline, **cls.results)
+            with open(cls.baseline_path, 'w') as f:
+                json.dump(baseline, f, indent=2, sort_keys=True)
+            _logger.info("Benchmark baseline written to %s", cls.baseline_path)
+        super().tearDownClass()
+
+    def measure(self, name, method, *args, **kwargs):
+        """Run ``method`` on a cold cache and check it against the baseline of ``name``."""
+        self.env.flush_all()
+        self.env.invalidate_all()
+        cr = self.env.cr
+        queries = cr.sql_log_count
+        tracemalloc.start()
+        started = time.perf_counter()
+        try:
+            result = method(*args, **kwargs)
+            self.env.flush_all()
+            wall_time = time.perf_counter() - started
+            peak_memory = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        figures = {
+            'wall_time': round(wall_time, 4),
+            'queries': cr.sql_log_count - queries,
+            'peak_memory': peak_memory,
+        }
+        self.results[name] = figures
+        _logger.info("Benchmark %s: %.3fs, %d queries, %.1f KiB peak",
+                     name, wall_time, figures['queries'], peak_memory / 1024.0)
+
+        expected = self.baseline.get(name)
+        if expected and not self.update_baseline:
+            self.assertLessEqual(
+                figures['queries'], expected['queries'],
+                "%s runs more queries than its baseline" % name)
+            self.assertLessEqual(
+                figures['wall_time'], expected['wall_time'] * (1 + self.tolerance),
+                "%s is slower than its baseline" % name)
+            self.assertLessEqual(
+                figures['peak_memory'], expected['peak_memory'] * (1 + self.tolerance),
+                "%s uses more memory than its baseline" % name)
+        return result
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+from datetime import timedelta
+
+from odoo import fields
+from odoo.addons.account.tests.common import AccountTestInvoicingCommon
+from odoo.tests import tagged
+
+
+@tagged('post_install', '-at_install')
+class TestAccountBalanceSnapshot(AccountTestInvoicingCommon):
+    """Opening balances read from the snapshots match the posted journal items."""
+
+    @classmethod
+    def setUpClass(cls, chart_template_ref=None):
+        super().setUpClass(chart_template_ref=chart_template_ref)
+        cls.Snapshot = cls.env['account.balance.snapshot']
+        cls.today = fields.Date.context_today(cls.Snapshot)
+        cls.Snapshot._rebuild()
+
+    def _entry(self, amount, days_ago, post=True):
+        move = self.env['account.move'].create({
+            'move_type': 'entry',
+            'journal_id': self.company_data['default_journal_misc'].id,
+            'date': self.today - timedelta(days=days_ago),
+            'line_ids': [
+                (0, 0, {'account_id': self.company_data['default_account_receivable'].id,
+                        'partner_id': self.partner_a.id, 'debit': amount, 'credit': 0.0}),
+                (0, 0, {'account_id': self.company_data['default_account_revenue'].id,
+                        'partner_id': self.partner_a.id, 'debit': 0.0, 'credit': amount}),
+            ],
+        })
+        if post:
+            move.action_post()
+        return move
+
+    def assertSnapshotMatchesJournalItems(self, date):
+        self.env.flush_all()
+        accounts = self.env['account.account'].search([('company_id', '=', self.env.company.id)])
+        self.env.cr.execute("""
+            SELECT account_id, SUM(debit - credit)
+              FROM account_move_line
+             WHERE parent_state = 'posted'
+               AND date < %s
+               AND account_id IN %s
+          GROUP BY account_id
+        """, [date, tuple(accounts.ids)])
+        expected = {account_id: balance for account_id, balance in self.env.cr.fetchall() if balance}
+        balances = self.Snapshot._get_opening_balances(date, accounts.ids)
+        self.assertEqual(self.Snapshot._get_source()[0], 'account_balance_snapshot')
+        self.assertEqual({account_id: balance for account_id, balance in balances.items() if balance}, expected)
+
+    def test_opening_balances_follow_journal_items(self):
+        old = self._entry(100.0, 40)
+        recent = self._entry(250.0, 5)
+        self._entry(75.0, 10, post=False)
+        # invoices carry section and note lines without account
+        invoice = self.init_invoice('out_invoice', products=self.product_a, post=False)
+        invoice.write({'invoice_line_ids': [
+            (0, 0, {'display_type': 'line_section', 'name': 'Section'}),
+            (0, 0, {'display_type': 'line_note', 'name': 'Note'}),
+        ]})
+        invoice.action_post()
+        self.assertSnapshotMatchesJournalItems(self.today + timedelta(days=1))
+
+        # corrections of posted entries, resets to draft and deletions
+        recent.line_ids.filtered('debit').with_context(check_move_validity=False).debit = 300.0
+        recent.line_ids.filtered('credit').with_context(check_move_validity=False).credit = 300.0
+        extra = self.env['account.move.line'].with_context(check_move_validity=False).create([
+            {'move_id': recent.id, 'account_id': self.company_data['default_account_expense'].id,
+             'debit': 40.0, 'credit': 0.0},
+            {'move_id': recent.id, 'account_id': self.company_data['default_account_revenue'].id,
+             'debit': 0.0, 'credit': 40.0},
+        ])
+        self.assertSnapshotMatchesJournalItems(self.today + timedelta(days=1))
+        extra[0].with_context(check_move_validity=False).unlink()
+        self.assertSnapshotMatchesJournalItems(self.today + timedelta(days=1))
+        extra[1].with_context(check_move_validity=False).unlink()
+        old.button_draft()
+        old.line_ids.filtered('debit').with_context(check_move_validity=False).debit = 120.0
+        old.line_ids.filtered('credit').with_context(check_move_validity=False).credit = 120.0
+        old.action_post()
+        recent.button_draft()
+        recent.unlink()
+        self.assertSnapshotMatchesJournalItems(self.today + timedelta(days=1))
+        self.assertSnapshotMatchesJournalItems(self.today - timedelta(days=20))
+
+    def test_rebuild_matches_incremental_updates(self):
+        self._entry(60.0, 3)
+        self._entry(90.0, 30)
+        self.Snapshot._rebuild()
+        self.assertSnapshotMatchesJournalItems(self.today + timedelta(days=1))
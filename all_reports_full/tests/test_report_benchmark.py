@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+from odoo.tests import tagged
+
+from .common import ReportBenchmarkCase
+
+
+@tagged('post_install', '-at_install', '-standard', 'report_benchmark')
+class TestReportBenchmark(ReportBenchmarkCase):
+    """Data methods of the reports at synthetic volume.
+
+    Run with ``--test-tags report_benchmark``; see ``common.py`` for the
+    volume, baseline and tolerance settings.
+    """
+
+    def _require(self, model):
+        if model not in self.env:
+            self.skipTest("%s is not installed" % model)
+
+    # -----------------------------
+    #  ALL REPORTS FULL
+    # -----------------------------
+    def test_trial_balance(self):
+        self.measure('all_reports_full.trial_balance',
+                     self.env['report.center.trial.balance']._get_balances, self.date_from, self.date_to)
+
+    def test_customer_aging(self):
+        self.measure('all_reports_full.customer_aging',
+                     self.env['report.center.aging']._get_aging, self.date_to, 'asset_receivable')
+
+    def test_partner_ledger(self):
+        self.measure('all_reports_full.partner_ledger',
+                     self.env['report.center.partner.ledger']._get_ledger,
+                     self.date_from, self.date_to, 'liability_payable')
+
+    def test_general_ledger(self):
+        wizard = self.env['general.ledger.report'].create({'start_date': self.date_from, 'end_date': self.date_to})
+        self.measure('all_reports_full.general_ledger', wizard._get_ledger_rows)
+
+    def test_journal_register(self):
+        wizard = self.env['journal.register.report'].create({
+            'date_from': self.date_from,
+            'date_to': self.date_to,
+            'journal_ids': [(6, 0, self.company_data['default_journal_misc'].ids)],
+        })
+        self.measure('all_reports_full.journal_register', lambda: list(wizard._get_register_rows()))
+
+    def test_chart_of_accounts(self):
+        wizard = self.env['chart.of.accounts.report'].create({
+            'date_from': self.date_from, 'date_to': self.date_to, 'show_entries': True,
+        })
+        self.measure('all_reports_full.chart_of_accounts', wizard.get_report_data)
+
+    def test_inventory_valuation(self):
+        self.measure('all_reports_full.inventory_valuation',
+                     self.env['report.center.inventory.valuation']._get_valuation,
+                     self.dataset.products, self.date_from, self.date_to)
+
+    def test_material_consumption(self):
+        self.measure('all_reports_full.material_consumption',
+                     self.env['report.center.consumption']._get_summary, self.date_from, self.date_to)
+
+    def test_gr_ir(self):
+        self.measure('all_reports_full.gr_ir',
+                     self.env['report.center.gr.ir']._get_lines, self.date_from, self.date_to)
+
+    def test_payments(self):
+        engine = self.env['report.center.payments']
+        self.measure('all_reports_full.collection_register', engine._get_collections, self.date_from, self.date_to)
+        self.measure('all_reports_full.outstanding_credit_notes', engine._get_credit_notes, self.date_to)
+
+    def test_payroll(self):
+        self._require('hr.payslip')
+        engine = self.env['report.center.payroll']
+        self.measure('all_reports_full.salary_sheet', engine._get_matrix, self.date_from, self.date_to)
+        self.measure('all_reports_full.gratuity_provision', engine._get_provisions, self.date_to)
+
+    # -----------------------------
+    #  OTHER MODULES
+    # -----------------------------
+    def test_base_accounting_kit_trial_balance(self):
+        self._require('report.base_accounting_kit.report_trial_balance')
+        report = self.env['report.base_accounting_kit.report_trial_balance'].with_context(
+            date_from=self.date_from, date_to=self.date_to, state='posted', strict_range=True)
+        self.measure('base_accounting_kit.trial_balance',
+                     report._get_accounts, self.env['account.account'].search([]), 'movement')
+
+    def test_base_accounting_kit_aged_partner(self):
+        self._require('report.base_accounting_kit.report_agedpartnerbalance')
+        report = self.env['report.base_accounting_kit.report_agedpartnerbalance']
+        self.measure('base_accounting_kit.aged_partner',
+                     report._get_partner_move_lines, ['asset_receivable'], self.date_to, 'posted', 30)
+
+    def test_base_accounting_kit_assets(self):
+        self._require('asset.asset.report')
+        self.measure('base_accounting_kit.asset_report',
+                     self.env['asset.asset.report']._read_group,
+                     [], ['asset_category_id'], ['gross_value:sum', 'posted_value:sum', 'unposted_value:sum'])
@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+from datetime import timedelta
+
+from odoo import fields
+from odoo.addons.account.tests.common import AccountTestInvoicingCommon
+from odoo.tests import tagged
+
+
+@tagged('post_install', '-at_install')
+class TestReportEngines(AccountTestInvoicingCommon):
+    """The grouped report engines against the per-record computations they replaced."""
+
+    @classmethod
+    def setUpClass(cls, chart_template_ref=None):
+        super().setUpClass(chart_template_ref=chart_template_ref)
+        cls.today = fields.Date.context_today(cls.env['res.partner'])
+        cls.date_from = cls.today - timedelta(days=60)
+        cls.date_to = cls.today
+        cls.receivable = cls.company_data['default_account_receivable']
+        cls.revenue = cls.company_data['default_account_revenue']
+
+        # entries before and inside the range, a draft one and some open invoices
+        for partner, amount, days_ago in ((cls.partner_a, 100.0, 120), (cls.partner_b, 250.0, 45),
+                                          (cls.partner_a, 80.0, 10), (cls.partner_b, 40.0, 0)):
+            cls._create_entry(partner, amount, days_ago)
+        cls._create_entry(cls.partner_a, 999.0, 5, post=False)
+        cls.invoices = cls.env['account.move']
+        for partner, amounts, days_ago in ((cls.partner_a, [300.0], 95), (cls.partner_b, [120.0, 30.0], 35),
+                                           (cls.partner_a, [75.0], 3)):
+            cls.invoices |= cls.init_invoice(
+                'out_invoice', partner=partner, invoice_date=cls.today - timedelta(days=days_ago),
+                amounts=amounts, post=True)
+        cls.env['account.payment.register'].with_context(
+            active_model='account.move', active_ids=cls.invoices[0].ids,
+        ).create({'amount': 100.0, 'payment_date': cls.today - timedelta(days=20)})._create_payments()
+        cls.refund = cls.init_invoice('out_refund', partner=cls.partner_b, amounts=[50.0], post=True,
+                                      invoice_date=cls.today - timedelta(days=15))
+
+    @classmethod
+    def _create_entry(cls, partner, amount, days_ago, post=True):
+        move = cls.env['account.move'].create({
+            'move_type': 'entry',
+            'journal_id': cls.company_data['default_journal_misc'].id,
+            'date': cls.today - timedelta(days=days_ago),
+            'line_ids': [
+                (0, 0, {'account_id': cls.receivable.id, 'partner_id': partner.id, 'debit': amount, 'credit': 0.0}),
+                (0, 0, {'account_id': cls.revenue.id, 'partner_id': partner.id, 'debit': 0.0, 'credit': amount}),
+            ],
+        })
+        if post:
+            move.action_post()
+        return move
+
+    def _posted_lines(self, domain):
+        return self.env['account.move.line'].search(domain + [
+            ('parent_state', '=', 'posted'), ('company_id', '=', self.env.company.id)])
+
+    # -----------------------------
+    #  ACCOUNTING
+    # -----------------------------
+    def test_trial_balance(self):
+        accounts = self.receivable | self.revenue
+        rows = self.env['report.center.trial.balance']._compute_balances(self.date_from, self.date_to, accounts)
+        self.assertEqual([row['account'] for row in rows], list(accounts))
+        for row in rows:
+            account = row['account']
+            before = self._posted_lines([('account_id', '=', account.id), ('date', '<', self.date_from)])
+            period = self._posted_lines([('account_id', '=', account.id), ('date', '>=', self.date_from),
+                                         ('date', '<=', self.date_to)])
+            opening = sum(before.mapped('debit')) - sum(before.mapped('credit'))
+            self.assertAlmostEqual(row['opening'], opening)
+            self.assertAlmostEqual(row['debit'], sum(period.mapped('debit')))
+            self.assertAlmostEqual(row['credit'], sum(period.mapped('credit')))
+            self.assertAlmostEqual(row['closing'], opening + sum(period.mapped('debit')) - sum(period.mapped('credit')))
+
+    def test_aging(self):
+        boundaries = (30, 60, 90)
+        rows = self.env['report.center.aging']._compute_aging(self.today, 'asset_receivable', boundaries, None)
+        expected = {}
+        for line in self._posted_lines([('account_id.account_type', '=', 'asset_receivable'),
+                                        ('reconciled', '=', False), ('partner_id', '!=', False),
+                                        ('date', '<=', self.today)]):
+            age = (self.today - line.date).days
+            bucket = next((i for i, bound in enumerate(boundaries) if age <= bound), len(boundaries))
+            expected.setdefault(line.partner_id, [0.0] * (len(boundaries) + 1))[bucket] += line.amount_residual
+        self.assertEqual({row['partner'] for row in rows}, set(expected))
+        for row in rows:
+            for amount, expected_amount in zip(row['buckets'], expected[row['partner']]):
+                self.assertAlmostEqual(amount, expected_amount)
+            self.assertAlmostEqual(row['total'], sum(expected[row['partner']]))
+
+    def test_partner_ledger(self):
+        rows = self.env['report.center.partner.ledger']._compute_ledger(
+            self.date_from, self.date_to, 'asset_receivable', None, None)
+        self.assertTrue(rows)
+        for row in rows:
+            partner_domain = [('partner_id', '=', row['partner'].id),
+                              ('account_id.account_type', '=', 'asset_receivable')]
+            before = self._posted_lines(partner_domain + [('date', '<', self.date_from)])
+            period = self._posted_lines(partner_domain + [('date', '>=', self.date_from), ('date', '<=', self.date_to)])
+            opening = sum(before.mapped('debit')) - sum(before.mapped('credit'))
+            self.assertAlmostEqual(row['opening_balance'], opening)
+            self.assertEqual(len(row['entries']), len(period))
+            self.assertAlmostEqual(row['total_debit'], sum(period.mapped('debit')))
+            self.assertAlmostEqual(row['total_credit'], sum(period.mapped('credit')))
+            self.assertAlmostEqual(row['closing_balance'], opening + sum(period.mapped('balance')))
+
+    def test_collections_and_credit_notes(self):
+        engine = self.env['report.center.payments']
+        payments = self.env['account.payment'].search([
+            ('payment_type', '=', 'inbound'), ('state', '=', 'posted'),
+            ('date', '>=', self.date_from), ('date', '<=', self.date_to),
+            ('company_id', '=', self.env.company.id),
+        ])
+        collections = engine._get_collections(self.date_from, self.date_to)
+        self.assertEqual({line['payment_id'] for line in collections['lines']}, set(payments.ids))
+        self.assertAlmostEqual(collections['total'], sum(payments.mapped('amount')))
+
+        refunds = self.env['account.move'].search([
+            ('move_type', 'in', ('out_refund', 'in_refund')), ('state', '=', 'posted'),
+            ('amount_residual', '>', 0), ('invoice_date', '<=', self.date_to),
+            ('company_id', '=', self.env.company.id),
+        ])
+        credit_notes = engine._get_credit_notes(self.date_to)
+        self.assertIn(self.refund, refunds)
+        self.assertEqual({line['move_id'] for line in credit_notes['lines']}, set(refunds.ids))
+        self.assertAlmostEqual(credit_notes['total'], sum(refunds.mapped('amount_residual')))
+
+    def test_balance_snapshot_source(self):
+        """Opening balances read the same from the snapshots as from the journal items."""
+        accounts = self.receivable | self.revenue
+        TrialBalance = self.env['report.center.trial.balance']
+        from_lines = TrialBalance._compute_balances(self.date_from, self.date_to, accounts)
+        self.env['account.balance.snapshot']._rebuild()
+        from_snapshots = TrialBalance._compute_balances(self.date_from, self.date_to, accounts)
+        for line_row, snapshot_row in zip(from_lines, from_snapshots):
+            for key in ('opening', 'debit', 'credit', 'closing'):
+                self.assertAlmostEqual(line_row[key], snapshot_row[key])
+
+    # -----------------------------
+    #  PURCHASE AND STOCK
+    # -----------------------------
+    def test_gr_ir(self):
+        order = self.env['purchase.order'].create({
+            'partner_id': self.partner_a.id,
+            'order_line': [(0, 0, {'product_id': self.product_a.id, 'product_qty': 10.0, 'price_unit': 20.0})],
+        })
+        order.button_confirm()
+        line = order.order_line
+        if line.qty_received_method == 'manual':
+            line.qty_received = 6.0
+        else:
+            move = line.move_ids
+            move.quantity = 6.0
+            move.picked = True
+            move._action_done(cancel_backorder=True)
+        bill = self.env['account.move'].create({
+            'move_type': 'in_invoice',
+            'partner_id': self.partner_a.id,
+            'invoice_date': self.today,
+            'invoice_line_ids': [(0, 0, {'product_id': self.product_a.id, 'quantity': 4.0, 'price_unit': 20.0,
+                                         'purchase_line_id': line.id})],
+        })
+        bill.action_post()
+
+        rows = self.env['report.center.gr.ir']._get_lines(self.date_from, self.date_to)
+        [row] = [row for row in rows if row['line_id'] == line.id]
+        self.assertAlmostEqual(row['received_qty'], line.qty_received)
+        self.assertAlmostEqual(row['invoiced_qty'], line.qty_invoiced)
+        self.assertAlmostEqual(row['difference'], line.qty_received - line.qty_invoiced)
+        self.assertAlmostEqual(row['open_value'], (line.qty_received - line.qty_invoiced) * line.price_unit)
+
+    def _storable(self, name, price):
+        return self.env['product.product'].create({'name': name, 'type': 'product', 'standard_price': price})
+
+    def _move(self, product, source, dest, qty, company=None):
+        move = self.env['stock.move'].create({
+            'name': product.name,
+            'product_id': product.id,
+            'product_uom': product.uom_id.id,
+            'product_uom_qty': qty,
+            'location_id': source.id,
+            'location_dest_id': dest.id,
+            'company_id': (company or self.env.company).id,
+        })
+        move._action_confirm()
+        move.quantity = qty
+        move.picked = True
+        move._action_done()
+        return move
+
+    def test_consumption(self):
+        stock = self.env['stock.warehouse'].search([('company_id', '=', self.env.company.id)], limit=1).lot_stock_id
+        supplier = self.env.ref('stock.stock_location_suppliers')
+        customer = self.env.ref('stock.stock_location_customers')
+        scrap = self.env['stock.location'].search([('usage', '=', 'inventory'), ('company_id', 'in', (False, self.env.company.id))], limit=1)
+        product = self._storable('Consumed', 5.0)
+        self._move(product, supplier, stock, 20.0)
+        self._move(product, stock, customer, 7.0)
+        self._move(product, stock, customer, 3.0)
+        self._move(product, stock, scrap, 2.0)
+
+        rows = self.env['report.center.consumption']._get_summary(
+            self.date_from, self.date_to, product_id=product.id, period='year')
+        moves = self.env['stock.move'].search([
+            ('product_id', '=', product.id), ('state', '=', 'done'), ('location_id.usage', '=', 'internal'),
+        ])
+        expected = {}
+        for move in moves:
+            usage = move.location_dest_id.usage if move.location_dest_id.usage in ('customer', 'inventory') else 'other'
+            count, qty = expected.get(usage, (0, 0.0))
+            expected[usage] = (count + 1, qty + move.product_qty)
+        self.assertEqual({row['usage']: (row['move_count'], row['quantity']) for row in rows}, expected)
+
+    def _legacy_valuation(self, products):
+        """Quantities and value of ``products`` as the report computed them product by product."""
+        lines = {}
+        for p in products:
+            moves_in = self.env['stock.move'].search([
+                ('product_id', '=', p.id), ('date', '>=', self.date_from),
+                ('date', '<', self.date_to + timedelta(days=1)), ('state', '=', 'done'),
+                ('location_dest_id.usage', '=', 'internal'),
+            ])
+            moves_out = self.env['stock.move'].search([
+                ('product_id', '=', p.id), ('date', '>=', self.date_from),
+                ('date', '<', self.date_to + timedelta(days=1)), ('state', '=', 'done'),
+                ('location_id.usage', '=', 'internal'),
+            ])
+            qty_in = sum(moves_in.mapped('product_uom_qty'))
+            qty_out = sum(moves_out.mapped('product_uom_qty'))
+            quants = self.env['stock.quant'].search([('product_id', '=', p.id), ('location_id.usage', '=', 'internal')])
+            current_qty = sum(quants.mapped('quantity'))
+            if current_qty == 0 and qty_in - qty_out == 0:
+                continue
+            lines[p] = {
+                'qty_in': qty_in,
+                'qty_out': qty_out,
+                'qty_on_hand': current_qty,
+                'total_value': sum(quant.quantity * p.with_company(quant.company_id).standard_price for quant in quants),
+            }
+        return lines
+
+    def test_inventory_valuation(self):
+        company_2 = self.company_data_2['company']
+        stock = self.env['stock.warehouse'].search([('company_id', '=', self.env.company.id)], limit=1).lot_stock_id
+        stock_2 = self.env['stock.warehouse'].search([('company_id', '=', company_2.id)], limit=1).lot_stock_id
+        supplier = self.env.ref('stock.stock_location_suppliers')
+        customer = self.env.ref('stock.stock_location_customers')
+        in_stock = self._storable('In stock', 10.0)
+        in_stock.with_company(company_2).standard_price = 25.0
+        sold_out = self._storable('Sold out', 4.0)
+        untouched = self._storable('Untouched', 3.0)
+        self._move(in_stock, supplier, stock, 8.0)
+        self._move(in_stock, stock, customer, 3.0)
+        self.env['stock.quant'].with_company(company_2)._update_available_quantity(in_stock, stock_2, 2.0)
+        self._move(sold_out, supplier, stock, 5.0)
+        self._move(sold_out, stock, customer, 5.0)
+        products = in_stock | sold_out | untouched
+
+        Engine = self.env['report.center.inventory.valuation'].with_context(
+            allowed_company_ids=[self.env.company.id, company_2.id])
+        rows = Engine._get_valuation(products, self.date_from, self.date_to)
+        expected = self._legacy_valuation(products.with_env(Engine.env))
+        self.assertEqual([row['product'] for row in rows], list(expected))
+        for row in rows:
+            for key, value in expected[row['product']].items():
+                self.assertAlmostEqual(row[key], value, msg="%s of %s" % (key, row['product'].name))
+        # stock of each company is valued at the price of that company
+        [in_stock_row] = [row for row in rows if row['product'] == in_stock]
+        self.assertAlmostEqual(in_stock_row['total_value'], 5.0 * 10.0 + 2.0 * 25.0)
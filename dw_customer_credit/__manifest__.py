@@ -14,7 +14,7 @@ Long description of module's purpose
     'category': 'Uncategorized',
     'version': '0.1',
 
-    'depends': ['base','sale', 'account','dw_sales','base_accounting_kit','stock', 'mrp'],
+    'depends': ['base','sale', 'account','dw_sales','base_accounting_kit','stock', 'mrp', 'all_reports_full'],
 
     'data': [
         'security/res_partner_onboarding_security.xml',
@@ -24,6 +24,7 @@ Long description of module's purpose
         'views/res_partner_onboarding_views.xml',
         'views/res_partner_views.xml',
         'views/sale_order_views.xml',
+        'views/credit_exposure_views.xml',
         'views/account_move_views.xml',
         'views/views.xml',
         'views/neft_register_wizard_view.xml', 
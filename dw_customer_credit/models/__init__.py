@@ -3,6 +3,7 @@
 from . import models
 from . import res_partner_onboarding
 from . import sale_order
+from . import credit_exposure
 from . import res_partner
 from . import account_move
 from . import report_cashflow
@@ -15,9 +16,11 @@ from . import asset_disposal_wizard
 from . import report_asset_disposal
 from . import inventory_costing_wizard
 from . import report_inventory_costing
+from . import wip_valuation_engine
 from . import wip_valuation_wizard
 from . import report_wip_valuation
 from . import slow_moving_wizard
+from . import lot_aging_engine
 from . import report_slow_nonmoving
 from . import dw_cashflow_forecast_line
 from . import report_neft_register
@@ -104,4 +104,26 @@ class AccountMove(models.Model):
                         f"Available Credit: {max(0, move.partner_id.credit_limit - net_outstanding)}\n\n"
                         f"Please contact the sales manager for override or request customer payment."
                     )
-        return super(AccountMove, self).action_post()
\ No newline at end of file
+        return super(AccountMove, self).action_post()
+
+    def _post(self, soft=True):
+        posted = super(AccountMove, self)._post(soft=soft)
+        posted._refresh_credit_exposure()
+        return posted
+
+    def button_draft(self):
+        res = super(AccountMove, self).button_draft()
+        self._refresh_credit_exposure()
+        return res
+
+    def button_cancel(self):
+        res = super(AccountMove, self).button_cancel()
+        self._refresh_credit_exposure()
+        return res
+
+    def _refresh_credit_exposure(self):
+        """Refresh the credit exposure of the customers of these invoices"""
+        # posting an invoice also moves its amount from uninvoiced orders to unpaid invoices
+        invoices = self.filtered(lambda m: m.move_type in ('out_invoice', 'out_refund'))
+        if invoices:
+            self.env['customer.credit.exposure']._refresh(invoices.partner_id.ids)
@@ -0,0 +1,118 @@
+from odoo import models, fields, api
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class CustomerCreditExposure(models.Model):
+    """Unpaid invoices and uninvoiced confirmed orders of a customer.
+
+    One record per partner and company, refreshed for the partners touched
+    by invoice posting, payment reconciliation and order confirmation or
+    cancellation, so credit checks read a single row instead of summing
+    every invoice and order of the customer.
+    """
+    _name = 'customer.credit.exposure'
+    _description = 'Customer Credit Exposure'
+    _order = 'exposure desc'
+
+    partner_id = fields.Many2one('res.partner', string='Customer', required=True, index=True, ondelete='cascade')
+    company_id = fields.Many2one('res.company', string='Company', required=True, ondelete='cascade')
+    invoice_residual = fields.Float(string='Unpaid Invoices')
+    order_uninvoiced = fields.Float(string='Uninvoiced Orders')
+    exposure = fields.Float(string='Exposure', compute='_compute_exposure', store=True)
+    credit_limit = fields.Float(related='partner_id.credit_limit', string='Credit Limit')
+
+    _sql_constraints = [
+        ('partner_company_uniq', 'unique(partner_id, company_id)', 'Only one credit exposure per customer and company.'),
+    ]
+
+    @api.depends('invoice_residual', 'order_uninvoiced')
+    def _compute_exposure(self):
+        for rec in self:
+            rec.exposure = rec.invoice_residual + rec.order_uninvoiced
+
+    @api.model
+    def _get_exposures(self, partners):
+        """Return the exposure of ``partners`` per (partner id, company id), building missing ones"""
+        if not partners:
+            return {}
+        records = self.sudo().search([('partner_id', 'in', partners.ids)])
+        missing = partners - records.partner_id
+        if missing:
+            self._refresh(missing.ids)
+            records = self.sudo().search([('partner_id', 'in', partners.ids)])
+        return {(rec.partner_id.id, rec.company_id.id): rec.exposure for rec in records}
+
+    @api.model
+    def _refresh(self, partner_ids=None):
+        """Recompute the exposure of ``partner_ids``, or of every customer when None"""
+        if partner_ids is not None and not partner_ids:
+            return
+        partner_domain = [('partner_id', 'in', list(partner_ids))] if partner_ids is not None else []
+        values = {}
+
+        Move = self.env['account.move'].sudo()
+        for partner, company, residual in Move._read_group(
+                partner_domain + [('move_type', '=', 'out_invoice'), ('state', '=', 'posted')],
+                ['partner_id', 'company_id'], ['amount_residual:sum']):
+            values.setdefault((partner.id, company.id), [0.0, 0.0])[0] = residual or 0.0
+
+        # amount_invoiced is not stored, so the confirmed orders themselves are read
+        orders = self.env['sale.order'].sudo().search(partner_domain + [('state', '=', 'sale')])
+        for order in orders:
+            key = (order.partner_id.id, order.company_id.id)
+            values.setdefault(key, [0.0, 0.0])[1] += order.amount_total - order.amount_invoiced
+
+        # customers without invoices or orders get an empty row, so they are not refreshed again on every check
+        if partner_ids is not None:
+            for partner_id in partner_ids:
+                values.setdefault((partner_id, self.env.company.id), [0.0, 0.0])
+
+        existing = self.sudo().search(partner_domain)
+        for rec in existing:
+            invoice_residual, order_uninvoiced = values.pop((rec.partner_id.id, rec.company_id.id), (0.0, 0.0))
+            if rec.invoice_residual != invoice_residual or rec.order_uninvoiced != order_uninvoiced:
+                rec.write({'invoice_residual': invoice_residual, 'order_uninvoiced': order_uninvoiced})
+        self.sudo().create([{
+            'partner_id': partner_id,
+            'company_id': company_id,
+            'invoice_residual': invoice_residual,
+            'order_uninvoiced': order_uninvoiced,
+        } for (partner_id, company_id), (invoice_residual, order_uninvoiced) in values.items()])
+
+        Partner = self.env['res.partner'].sudo()
+        if Partner._credit_limit_reached_is_stored():
+            partners = Partner.browse(partner_ids) if partner_ids is not None else Partner.search([('credit_limit', '>', 0)])
+            partners._refresh_credit_limit_reached()
+
+    @api.model
+    def _rebuild(self):
+        """Recompute the exposure of every customer from scratch"""
+        self.sudo().search([]).unlink()
+        self._refresh()
+        _logger.info("Rebuilt the credit exposure of %s customers", self.sudo().search_count([]))
+
+    def action_rebuild(self):
+        self._rebuild()
+        return {'type': 'ir.actions.client', 'tag': 'reload'}
+
+
+class AccountPartialReconcile(models.Model):
+    _inherit = 'account.partial.reconcile'
+
+    def _get_exposure_partners(self):
+        moves = (self.debit_move_id | self.credit_move_id).move_id
+        return moves.filtered(lambda m: m.move_type == 'out_invoice').partner_id
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        partials = super().create(vals_list)
+        self.env['customer.credit.exposure']._refresh(partials._get_exposure_partners().ids)
+        return partials
+
+    def unlink(self):
+        partners = self._get_exposure_partners()
+        res = super().unlink()
+        self.env['customer.credit.exposure']._refresh(partners.ids)
+        return res
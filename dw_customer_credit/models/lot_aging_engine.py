@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+from odoo import api, models, fields
+
+# (label, upper bound in days) of the age buckets, the last one is open
+AGE_BUCKETS = [
+    ('0-15 Days', 15),
+    ('16-30 Days', 30),
+    ('31-60 Days', 60),
+    ('61-120 Days', 120),
+    ('121-180 Days', 180),
+    ('180+ Days', None),
+]
+
+
+class LotAgingEngine(models.AbstractModel):
+    _name = 'stock.lot.aging'
+    _description = 'Lot Aging Engine'
+
+    @api.model
+    def _get_lot_stock(self, product_id=None, categ_id=None, location_id=None):
+        """Return the lots of the company with stock on hand and their quantity.
+
+        Quants of internal locations are summed per lot, restricted to the
+        subtree of ``location_id`` when given.
+        """
+        self.env['stock.quant'].flush_model(['lot_id', 'product_id', 'location_id', 'quantity'])
+        self.env['stock.lot'].flush_model(['name', 'company_id', 'create_date'])
+        self.env['stock.location'].flush_model(['usage', 'parent_path'])
+        query = """
+            SELECT q.lot_id,
+                   q.product_id,
+                   lot.name AS lot_name,
+                   lot.create_date,
+                   SUM(q.quantity) AS remaining_qty
+              FROM stock_quant q
+              JOIN stock_lot lot ON lot.id = q.lot_id
+              JOIN stock_location l ON l.id = q.location_id
+              JOIN product_product pp ON pp.id = q.product_id
+              JOIN product_template pt ON pt.id = pp.product_tmpl_id
+         LEFT JOIN product_category pc ON pc.id = pt.categ_id
+             WHERE q.quantity > 0
+               AND l.usage = 'internal'
+               AND lot.company_id = %(company_id)s
+               AND pt.detailed_type = 'product'
+               AND pp.active
+        """
+        params = {'company_id': self.env.company.id}
+        if location_id:
+            query += " AND l.parent_path LIKE %(location_path)s"
+            params['location_path'] = self.env['stock.location'].browse(location_id).parent_path + '%'
+        if product_id:
+            query += " AND q.product_id = %(product_id)s"
+            params['product_id'] = product_id
+        if categ_id:
+            query += " AND pc.parent_path LIKE %(categ_path)s"
+            params['categ_path'] = self.env['product.category'].browse(categ_id).parent_path + '%'
+        query += " GROUP BY q.lot_id, q.product_id, lot.name, lot.create_date ORDER BY q.product_id, lot.name, q.lot_id"
+        self.env.cr.execute(query, params)
+        return self.env.cr.dictfetchall()
+
+    @api.model
+    def _get_first_receipts(self, lot_ids):
+        """Return the first done move line into an internal location of every lot, by lot id"""
+        if not lot_ids:
+            return {}
+        self.env['stock.move.line'].flush_model(['lot_id', 'state', 'location_dest_id', 'quantity', 'date', 'picking_id'])
+        self.env['stock.picking'].flush_model(['name', 'origin'])
+        self.env.cr.execute("""
+            SELECT DISTINCT ON (ml.lot_id)
+                   ml.lot_id,
+                   ml.date,
+                   ml.quantity,
+                   ml.picking_id,
+                   sp.name AS picking_name,
+                   sp.origin AS picking_origin
+              FROM stock_move_line ml
+              JOIN stock_location ld ON ld.id = ml.location_dest_id
+         LEFT JOIN stock_picking sp ON sp.id = ml.picking_id
+             WHERE ml.lot_id = ANY(%s)
+               AND ml.state = 'done'
+               AND ld.usage = 'internal'
+               AND ml.quantity > 0
+          ORDER BY ml.lot_id, ml.date, ml.id
+        """, [list(lot_ids)])
+        return {row['lot_id']: row for row in self.env.cr.dictfetchall()}
+
+    @api.model
+    def _get_bucket(self, days):
+        for label, bound in AGE_BUCKETS:
+            if bound is None or days <= bound:
+                return label
+
+    @api.model
+    def _get_aging(self, slow_days, non_moving_days, product_id=None, categ_id=None, location_id=None):
+        """Return the aged lots per product and the summary of the slow / non-moving report.
+
+        Lot quantities and first receipts come from two queries; ages,
+        buckets and the classification of every product are then computed
+        in one pass over the lots.
+        """
+        today = fields.Date.context_today(self)
+        stock = self._get_lot_stock(product_id, categ_id, location_id)
+        receipts = self._get_first_receipts([row['lot_id'] for row in stock])
+        products = self.env['product.product'].browse(list(dict.fromkeys(row['product_id'] for row in stock)))
+
+        lots_by_product = {}
+        for row in stock:
+            remaining_qty = row['remaining_qty']
+            first_incoming = receipts.get(row['lot_id'])
+            original_qty = first_incoming['quantity'] if first_incoming else remaining_qty
+            used_qty = max(original_qty - remaining_qty, 0.0)
+
+            # Lot date (receipt date)
+            lot_datetime = first_incoming['date'] if first_incoming else row['create_date'] or fields.Datetime.now()
+            lot_date = lot_datetime.date()
+            days_in_stock = max((today - lot_date).days, 0)
+
+            reference = ''
+            if first_incoming and first_incoming['picking_name']:
+                if first_incoming['picking_origin']:
+                    reference = f"{first_incoming['picking_name']} ({first_incoming['picking_origin']})"
+                else:
+                    reference = first_incoming['picking_name']
+
+            lots_by_product.setdefault(row['product_id'], []).append({
+                'lot_name': row['lot_name'],
+                'lot_id': row['lot_id'],
+                'date': lot_date,
+                'datetime': lot_datetime,
+                'remaining_qty': remaining_qty,
+                'original_qty': original_qty,
+                'used_qty': used_qty,
+                'days': days_in_stock,
+                'reference': reference or row['lot_name'],
+            })
+
+        lines = []
+        total_summary = {
+            'total_qty': 0.0,
+            'total_value': 0.0,
+            'total_lots': 0,
+            'slow_moving_count': 0,
+            'non_moving_count': 0,
+            'active_count': 0
+        }
+        all_age_buckets = {label: {'qty': 0, 'value': 0} for label, _bound in AGE_BUCKETS}
+
+        for product in products:
+            lot_info = lots_by_product[product.id]
+            cost = product.standard_price or 0.0
+            age_buckets = {label: {'qty': 0, 'value': 0, 'lots': []} for label, _bound in AGE_BUCKETS}
+            total_qty = total_value = 0.0
+            oldest_lot_info = newest_lot_info = None
+
+            for info in lot_info:
+                info['value'] = info['remaining_qty'] * cost
+                total_qty += info['remaining_qty']
+                total_value += info['value']
+
+                # Track oldest and newest
+                if not oldest_lot_info or info['datetime'] < oldest_lot_info['datetime']:
+                    oldest_lot_info = info
+                if not newest_lot_info or info['datetime'] > newest_lot_info['datetime']:
+                    newest_lot_info = info
+
+                bucket = self._get_bucket(info['days'])
+                age_buckets[bucket]['qty'] += info['remaining_qty']
+                age_buckets[bucket]['value'] += info['value']
+                age_buckets[bucket]['lots'].append({
+                    'name': info['lot_name'],
+                    'remaining_qty': info['remaining_qty'],
+                    'used_qty': info['used_qty'],
+                    'original_qty': info['original_qty'],
+                    'days': info['days'],
+                    'reference': info['reference']
+                })
+                all_age_buckets[bucket]['qty'] += info['remaining_qty']
+                all_age_buckets[bucket]['value'] += info['value']
+
+            oldest_date = oldest_lot_info['date']
+            newest_date = newest_lot_info['date']
+            oldest_days = (today - oldest_date).days
+
+            if oldest_days >= non_moving_days:
+                classification = 'Non-Moving'
+                total_summary['non_moving_count'] += 1
+            elif oldest_days >= slow_days:
+                classification = 'Slow Moving'
+                total_summary['slow_moving_count'] += 1
+            else:
+                classification = 'Active'
+                total_summary['active_count'] += 1
+
+            total_summary['total_qty'] += total_qty
+            total_summary['total_value'] += total_value
+            total_summary['total_lots'] += len(lot_info)
+
+            lot_names = [info['lot_name'] for info in lot_info[:5]]
+            if len(lot_info) > 5:
+                lot_names.append(f"... and {len(lot_info) - 5} more lots")
+
+            lines.append({
+                'product': product.display_name,
+                'code': product.default_code or '',
+                'category': product.categ_id.display_name or 'All',
+                'total_qty': total_qty,
+                'total_value': total_value,
+                'oldest_date': oldest_date,
+                'oldest_days': oldest_days,
+                'oldest_lot': oldest_lot_info['lot_name'],
+                'oldest_reference': oldest_lot_info['reference'],
+                'newest_date': newest_date,
+                'newest_days': (today - newest_date).days,
+                'newest_lot': newest_lot_info['lot_name'],
+                'newest_reference': newest_lot_info['reference'],
+                'classification': classification,
+                'lot_count': len(lot_info),
+                'lot_names': lot_names,
+                'all_lots_count': len(lot_info),
+                'age_buckets': age_buckets,
+                'lot_info': lot_info,
+            })
+
+        lines.sort(key=lambda x: (
+            x['classification'] != 'Non-Moving',
+            x['classification'] != 'Slow Moving',
+            -x['oldest_days']
+        ))
+        return lines, total_summary, all_age_buckets
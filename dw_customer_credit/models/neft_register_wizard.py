@@ -186,6 +186,12 @@ class NeftRegisterWizard(models.TransientModel):
         if not self.neft_data_json or self.neft_data_json == '[]':
             raise UserError("Please generate NEFT data first using the 'Generate' button.")
         
+        # large registers are rendered in chunks
+        lines = self.get_neft_lines()
+        if self.env['report.chunked.pdf']._should_chunk(lines):
+            return self.env['report.chunked.pdf']._download(
+                'dw_customer_credit.action_report_neft_register', self, lines,
+                'Fund Transfer Report - %s.pdf' % self.date_from, carry_keys=('amount',))
         return self.env.ref('dw_customer_credit.action_report_neft_register').report_action(self)
     
     def _get_neft_transactions(self):
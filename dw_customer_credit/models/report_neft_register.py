@@ -26,12 +26,24 @@ class ReportNeftRegister(models.AbstractModel):
         vendor_count = sum(1 for line in lines if line.get('payment_type') == 'outbound')
         transfer_count = sum(1 for line in lines if line.get('payment_type') == 'transfer')
         customer_count = sum(1 for line in lines if line.get('payment_type') == 'inbound')
+        line_count = len(lines)
+
+        # A chunk of a large register prints its own lines with the running
+        # total; the counts above still cover the whole register
+        data = data or {}
+        last_chunk = True
+        if data.get('chunk_rows') is not None:
+            lines = data['chunk_rows']
+            total_amount = data['carry_out']['amount']
+            last_chunk = data['chunk_index'] == data['chunk_count'] - 1
         
         return {
             'doc_ids': docids,
             'doc_model': 'neft.register.wizard',
             'docs': wizards,
             'lines': lines,
+            'line_count': line_count,
+            'last_chunk': last_chunk,
             'date_from': wizard.date_from if wizard else None,
             'date_to': wizard.date_to if wizard else None,
             'journal_id': wizard.journal_id if wizard else None,
@@ -7,10 +7,6 @@ class ReportWipValuation(models.AbstractModel):
 
     @api.model
     def _get_report_values(self, docids, data=None):
-        print("=" * 80)
-        print("WIP REPORT: _get_report_values called")
-        print(f"docids: {docids}")
-        
         # Ensure docids is a list
         if not isinstance(docids, (list, tuple)):
             docids = [docids]
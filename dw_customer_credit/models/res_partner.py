@@ -3,6 +3,10 @@ import logging
 
 _logger = logging.getLogger(__name__)
 
+STORE_CREDIT_LIMIT_REACHED_KEY = 'dw_customer_credit.store_credit_limit_reached'
+# set once the stored flags were filled after enabling the option above
+CREDIT_LIMIT_REACHED_READY_KEY = 'dw_customer_credit.credit_limit_reached_ready'
+
 class ResPartner(models.Model):
     _inherit = 'res.partner'
     
@@ -11,6 +15,9 @@ class ResPartner(models.Model):
                                          compute='_compute_active_onboarding')
     requires_onboarding = fields.Boolean(string='Requires Onboarding', compute='_compute_requires_onboarding')
     credit_limit_reached = fields.Boolean(string='Credit Limit Reached', compute='_compute_credit_limit_reached')
+    # kept up to date on invoice and payment events when the
+    # dw_customer_credit.store_credit_limit_reached parameter is '1'
+    credit_limit_reached_stored = fields.Boolean(string='Credit Limit Reached (Stored)', readonly=True, copy=False)
     
     @api.depends('onboarding_ids', 'onboarding_ids.state')
     def _compute_active_onboarding(self):
@@ -23,54 +30,6 @@ class ResPartner(models.Model):
         for partner in self:
             partner.requires_onboarding = not partner.active_onboarding_id and partner.customer_rank > 0
     
-    @api.depends('credit_limit')
-    def _compute_credit_limit_reached(self):
-        for partner in self:
-            if partner.credit_limit > 0 and partner.customer_rank > 0:
-                # Calculate total from posted invoices
-                posted_invoices = self.env['account.move'].search([
-                    ('partner_id', '=', partner.id),
-                    ('move_type', '=', 'out_invoice'),
-                    ('state', '=', 'posted')
-                ])
-                total_invoiced = sum(posted_invoices.mapped('amount_total'))
-                
-                # Calculate total payments received - IMPROVED
-                payments = self.env['account.payment'].search([
-                    ('partner_id', '=', partner.id),
-                    ('state', '=', 'posted'),
-                    ('payment_type', '=', 'inbound')
-                ])
-                total_payments = sum(payments.mapped('amount'))
-                
-                # Also check from account.move for reconciled payments
-                payment_moves = self.env['account.move'].search([
-                    ('partner_id', '=', partner.id),
-                    ('state', '=', 'posted'),
-                    ('payment_id', '!=', False)
-                ])
-                for move in payment_moves:
-                    credit_lines = move.line_ids.filtered(
-                        lambda line: line.account_id.internal_group == 'receivable' and line.credit > 0
-                    )
-                    total_payments += sum(credit_lines.mapped('credit'))
-                
-                # Calculate net outstanding
-                net_outstanding = total_invoiced - total_payments
-                partner.credit_limit_reached = net_outstanding >= partner.credit_limit
-                
-                _logger.info(
-                    f"=== PARTNER CREDIT STATUS: {partner.name} ===\n"
-                    f"Credit Limit: {partner.credit_limit}\n"
-                    f"Total Invoiced: {total_invoiced}\n"
-                    f"Total Payments: {total_payments}\n"
-                    f"Net Outstanding: {net_outstanding}\n"
-                    f"Credit Limit Reached: {partner.credit_limit_reached}\n"
-                    f"======================================"
-                )
-            else:
-                partner.credit_limit_reached = False
-    
     def action_view_onboarding(self):
         """View onboarding history"""
         self.ensure_one()
@@ -97,25 +56,96 @@ class ResPartner(models.Model):
             'target': 'current',
         }
     
-    @api.depends('credit_limit')
+    @api.model
+    def _credit_limit_reached_is_stored(self):
+        ICP = self.env['ir.config_parameter'].sudo()
+        return ICP.get_param(STORE_CREDIT_LIMIT_REACHED_KEY) == '1' and bool(ICP.get_param(CREDIT_LIMIT_REACHED_READY_KEY))
+
+    @api.model
+    def _init_credit_limit_reached(self):
+        """Fill the stored flag of every customer with a credit limit"""
+        Partner = self.sudo().with_context(active_test=False)
+        Partner.search([('credit_limit_reached_stored', '=', True)]).write({'credit_limit_reached_stored': False})
+        customers = Partner.search([('credit_limit', '>', 0), ('customer_rank', '>', 0)])
+        reached = customers._get_credit_limit_reached()
+        customers.filtered(lambda p: p.id in reached).write({'credit_limit_reached_stored': True})
+        _logger.info("Stored the credit limit state of %s customers", len(customers))
+
+    def _get_credit_limit_reached(self):
+        """Return the ids of the customers whose unpaid invoices reach their credit limit"""
+        customers = self.filtered(lambda p: p.credit_limit > 0 and p.customer_rank > 0 and p._origin.id)
+        if not customers:
+            return set()
+        # Calculate using residual amount, for all customers at once
+        unpaid = {
+            partner.id: residual or 0.0
+            for partner, residual in self.env['account.move'].sudo()._read_group([
+                ('partner_id', 'in', customers._origin.ids),
+                ('move_type', '=', 'out_invoice'),
+                ('state', '=', 'posted'),
+            ], ['partner_id'], ['amount_residual:sum'])
+        }
+        return {p._origin.id for p in customers if unpaid.get(p._origin.id, 0.0) >= p.credit_limit}
+
+    @api.depends('credit_limit', 'customer_rank', 'credit_limit_reached_stored')
     def _compute_credit_limit_reached(self):
+        if self._credit_limit_reached_is_stored():
+            for partner in self:
+                partner.credit_limit_reached = partner.credit_limit_reached_stored
+            return
+        reached = self._get_credit_limit_reached()
         for partner in self:
-            if partner.credit_limit > 0 and partner.customer_rank > 0:
-                # Calculate using residual amount
-                posted_invoices = self.env['account.move'].search([
-                    ('partner_id', '=', partner.id),
-                    ('move_type', '=', 'out_invoice'),
-                    ('state', '=', 'posted')
-                ])
-                total_unpaid = sum(posted_invoices.mapped('amount_residual'))
-                
-                partner.credit_limit_reached = total_unpaid >= partner.credit_limit
-                
-                _logger.info(
-                    f"PARTNER CREDIT STATUS - {partner.name}: "
-                    f"Limit: {partner.credit_limit}, "
-                    f"Unpaid: {total_unpaid}, "
-                    f"Reached: {partner.credit_limit_reached}"
-                )
-            else:
-                partner.credit_limit_reached = False
\ No newline at end of file
+            partner.credit_limit_reached = partner._origin.id in reached
+
+    def _refresh_credit_limit_reached(self):
+        """Update the stored flag of these partners, when it is enabled"""
+        if not self._credit_limit_reached_is_stored():
+            return
+        reached = self._get_credit_limit_reached()
+        changed = self.filtered(lambda p: (p.id in reached) != p.credit_limit_reached_stored)
+        for flag in (True, False):
+            partners = changed.filtered(lambda p: (p.id in reached) == flag)
+            if partners:
+                partners.sudo().write({'credit_limit_reached_stored': flag})
+
+    def write(self, vals):
+        res = super(ResPartner, self).write(vals)
+        if 'credit_limit' in vals or 'customer_rank' in vals:
+            self._refresh_credit_limit_reached()
+        return res
+
+
+class IrConfigParameter(models.Model):
+    _inherit = 'ir.config_parameter'
+
+    def _sync_credit_limit_reached(self):
+        """Fill the stored flags when the option is turned on, forget them when it is turned off"""
+        ICP = self.sudo()
+        enabled = ICP.get_param(STORE_CREDIT_LIMIT_REACHED_KEY) == '1'
+        ready = bool(ICP.get_param(CREDIT_LIMIT_REACHED_READY_KEY))
+        if enabled and not ready:
+            self.env['res.partner']._init_credit_limit_reached()
+            ICP.set_param(CREDIT_LIMIT_REACHED_READY_KEY, '1')
+        elif ready and not enabled:
+            ICP.set_param(CREDIT_LIMIT_REACHED_READY_KEY, False)
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        params = super().create(vals_list)
+        if any(vals.get('key') == STORE_CREDIT_LIMIT_REACHED_KEY for vals in vals_list):
+            self._sync_credit_limit_reached()
+        return params
+
+    def write(self, vals):
+        keys = self.mapped('key') + [vals.get('key')]
+        res = super().write(vals)
+        if STORE_CREDIT_LIMIT_REACHED_KEY in keys:
+            self._sync_credit_limit_reached()
+        return res
+
+    def unlink(self):
+        keys = self.mapped('key')
+        res = super().unlink()
+        if STORE_CREDIT_LIMIT_REACHED_KEY in keys:
+            self._sync_credit_limit_reached()
+        return res
@@ -18,33 +18,12 @@ class SaleOrder(models.Model):
     
     @api.depends('partner_id', 'amount_total', 'partner_id.credit_limit', 'partner_id.credit_limit_reached')
     def _compute_credit_limit(self):
+        orders = self.filtered(lambda o: o.partner_id.credit_limit > 0)
+        exposures = self.env['customer.credit.exposure']._get_exposures(orders.partner_id)
         for order in self:
             if order.partner_id.credit_limit > 0:
-                partner = order.partner_id
-                
-                # Calculate total from posted invoices (using amount_residual for accurate unpaid amount)
-                posted_invoices = self.env['account.move'].search([
-                    ('partner_id', '=', partner.id),
-                    ('move_type', '=', 'out_invoice'),
-                    ('state', '=', 'posted')
-                ])
-                total_unpaid = sum(posted_invoices.mapped('amount_residual'))
-                
-                # Calculate total from confirmed sales orders that are NOT fully invoiced
-                confirmed_orders = self.env['sale.order'].search([
-                    ('partner_id', '=', partner.id),
-                    ('state', '=', 'sale'),
-                    ('id', '!=', order.id if order.id else False)
-                ])
-                
-                # Only include orders that are not fully invoiced
-                orders_not_invoiced = 0
-                for so in confirmed_orders:
-                    if so.invoice_status != 'invoiced' or so.amount_total > so.amount_invoiced:
-                        orders_not_invoiced += so.amount_total - so.amount_invoiced
-                
-                # Calculate net outstanding (unpaid invoices + uninvoiced portion of confirmed orders)
-                net_outstanding = total_unpaid + orders_not_invoiced
+                # Net outstanding (unpaid invoices + uninvoiced portion of other confirmed orders)
+                net_outstanding = order._get_credit_outstanding(exposures)
                 current_order_amount = order.amount_total if order.state != 'cancel' else 0
                 
                 # Total including current order
@@ -53,63 +32,49 @@ class SaleOrder(models.Model):
                 order.available_credit = max(0, order.partner_id.credit_limit - total_with_current)
                 order.exceeds_credit_limit = total_with_current > order.partner_id.credit_limit
                 
-                _logger.info(
-                    f"=== CREDIT CALCULATION FOR {partner.name} ===\n"
-                    f"Credit Limit: {order.partner_id.credit_limit}\n"
-                    f"Unpaid Invoices: {total_unpaid}\n"
-                    f"Uninvoiced Orders: {orders_not_invoiced}\n"
-                    f"Net Outstanding: {net_outstanding}\n"
-                    f"Current Order: {current_order_amount}\n"
-                    f"Total With Current: {total_with_current}\n"
-                    f"Available Credit: {order.available_credit}\n"
-                    f"Exceeds Limit: {order.exceeds_credit_limit}\n"
-                    f"======================================"
+                _logger.debug(
+                    "Credit of %s: limit %s, outstanding %s, with order %s",
+                    order.partner_id.name, order.partner_id.credit_limit, net_outstanding, total_with_current,
                 )
             else:
                 order.available_credit = 0
                 order.exceeds_credit_limit = False
 
+    def _get_credit_outstanding(self, exposures):
+        """Unpaid invoices and uninvoiced confirmed orders of the customer, this order excluded"""
+        self.ensure_one()
+        outstanding = exposures.get((self.partner_id.id, self.company_id.id), 0.0)
+        # the exposure already holds this order once it is confirmed
+        if self._origin.id and self._origin.state == 'sale':
+            outstanding -= self._origin.amount_total - self._origin.amount_invoiced
+        return outstanding
+
+    def _refresh_credit_exposure(self):
+        self.env['customer.credit.exposure']._refresh(self.partner_id.ids)
+
     def _check_credit_limit(self):
         """Reusable credit limit check for quotation creation & confirmation"""
-        for order in self:
-            if order.partner_id.credit_limit > 0:
-                partner = order.partner_id
-                
-                # Calculate total from posted invoices (using amount_residual for accurate unpaid amount)
-                posted_invoices = self.env['account.move'].search([
-                    ('partner_id', '=', partner.id),
-                    ('move_type', '=', 'out_invoice'),
-                    ('state', '=', 'posted')
-                ])
-                total_unpaid = sum(posted_invoices.mapped('amount_residual'))
-                
-                # Calculate total from confirmed sales orders that are NOT fully invoiced
-                confirmed_orders = self.env['sale.order'].search([
-                    ('partner_id', '=', partner.id),
-                    ('state', '=', 'sale'),
-                    ('id', '!=', order.id if order.id else False)
-                ])
-                
-                # Only include orders that are not fully invoiced
-                orders_not_invoiced = 0
-                for so in confirmed_orders:
-                    if so.invoice_status != 'invoiced' or so.amount_total > so.amount_invoiced:
-                        orders_not_invoiced += so.amount_total - so.amount_invoiced
-                
-                # Calculate net outstanding
-                net_outstanding = total_unpaid + orders_not_invoiced
-                total_with_current = net_outstanding + order.amount_total
-                
-                if total_with_current > order.partner_id.credit_limit:
-                    raise UserError(
-                        f"This quotation exceeds {order.partner_id.name}'s credit limit.\n"
-                        f"Credit Limit: {order.partner_id.credit_limit}\n"
-                        f"Current Outstanding (Unpaid Invoices + Uninvoiced Orders): {net_outstanding}\n"
-                        f"Quotation Amount: {order.amount_total}\n"
-                        f"Total After Quotation: {total_with_current}\n"
-                        f"Available Credit: {max(0, order.partner_id.credit_limit - net_outstanding)}\n\n"
-                        f"Please request customer payment or contact sales manager."
-                    )
+        orders = self.filtered(lambda o: o.partner_id.credit_limit > 0)
+        # the exposure of all customers of the batch is read at once
+        exposures = self.env['customer.credit.exposure']._get_exposures(orders.partner_id)
+        for order in orders:
+            # Calculate net outstanding
+            net_outstanding = order._get_credit_outstanding(exposures)
+            total_with_current = net_outstanding + order.amount_total
+            
+            if total_with_current > order.partner_id.credit_limit:
+                raise UserError(
+                    f"This quotation exceeds {order.partner_id.name}'s credit limit.\n"
+                    f"Credit Limit: {order.partner_id.credit_limit}\n"
+                    f"Current Outstanding (Unpaid Invoices + Uninvoiced Orders): {net_outstanding}\n"
+                    f"Quotation Amount: {order.amount_total}\n"
+                    f"Total After Quotation: {total_with_current}\n"
+                    f"Available Credit: {max(0, order.partner_id.credit_limit - net_outstanding)}\n\n"
+                    f"Please request customer payment or contact sales manager."
+                )
+
+    # fields whose change can move an order's amount or its customer's exposure
+    _credit_check_fields = {'order_line', 'partner_id', 'state', 'currency_id', 'pricelist_id', 'company_id'}
 
     def create(self, vals):
         order = super(SaleOrder, self).create(vals)
@@ -117,10 +82,26 @@ class SaleOrder(models.Model):
         return order
 
     def write(self, vals):
+        if not self._credit_check_fields.intersection(vals):
+            return super(SaleOrder, self).write(vals)
+        # confirmed orders are part of the exposure, keep it in line with their amounts;
+        # a change of customer moves the exposure from the old customer to the new one
+        confirmed = self.filtered(lambda o: o.state == 'sale')
+        partners = confirmed.partner_id
         res = super(SaleOrder, self).write(vals)
+        confirmed |= self.filtered(lambda o: o.state == 'sale')
+        if confirmed:
+            self.env['customer.credit.exposure']._refresh((partners | confirmed.partner_id).ids)
         self._check_credit_limit()
         return res
 
     def action_confirm(self):
         self._check_credit_limit()
-        return super(SaleOrder, self).action_confirm()
\ No newline at end of file
+        res = super(SaleOrder, self).action_confirm()
+        self._refresh_credit_exposure()
+        return res
+
+    def _action_cancel(self):
+        res = super(SaleOrder, self)._action_cancel()
+        self._refresh_credit_exposure()
+        return res
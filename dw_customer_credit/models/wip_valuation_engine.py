@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+from datetime import timedelta
+
+from odoo import api, fields, models, tools
+
+# date fields tried in order, the first one the model has is used
+DATE_FIELDS = ['date_start', 'date_planned_start', 'date_finished', 'date_planned_finished', 'create_date']
+
+WIP_STATES = ('confirmed', 'progress', 'to_close', 'done')
+
+
+class WipValuationEngine(models.AbstractModel):
+    _name = 'wip.valuation.engine'
+    _description = 'WIP Valuation Engine'
+
+    @api.model
+    @tools.ormcache('model_name')
+    def _get_date_field(self, model_name):
+        """Return the date field of ``model_name`` the report filters on, resolved once per registry"""
+        fields_ = self.env[model_name]._fields
+        return next((name for name in DATE_FIELDS if name in fields_), None)
+
+    @api.model
+    def _get_date_domain(self, model_name, date_from, date_to):
+        date_field = self._get_date_field(model_name)
+        if not date_field:
+            return date_field, []
+        # the date fields are datetimes, so the last day is included up to midnight
+        return date_field, [
+            (date_field, '>=', fields.Date.to_date(date_from)),
+            (date_field, '<', fields.Date.to_date(date_to) + timedelta(days=1)),
+        ]
+
+    @api.model
+    def _get_layer_values(self, production_ids):
+        """Return the component value consumed and the value produced of every MO, by MO id.
+
+        Both come from the valuation layers of the done moves of the MOs in a
+        single grouped query; consumption layers are negative, so their sign
+        is flipped.
+        """
+        if not production_ids:
+            return {}
+        self.env['stock.move'].flush_model(['raw_material_production_id', 'production_id', 'state'])
+        self.env['stock.valuation.layer'].flush_model(['stock_move_id', 'value'])
+        self.env.cr.execute("""
+            SELECT COALESCE(m.raw_material_production_id, m.production_id) AS production_id,
+                   -SUM(svl.value) FILTER (WHERE m.raw_material_production_id IS NOT NULL) AS consumed,
+                   SUM(svl.value) FILTER (WHERE m.production_id IS NOT NULL) AS produced
+              FROM stock_valuation_layer svl
+              JOIN stock_move m ON m.id = svl.stock_move_id
+             WHERE m.state = 'done'
+               AND (m.raw_material_production_id = ANY(%(ids)s) OR m.production_id = ANY(%(ids)s))
+          GROUP BY 1
+        """, {'ids': list(production_ids)})
+        return {row['production_id']: row for row in self.env.cr.dictfetchall()}
+
+    @api.model
+    def _get_mo_lines(self, date_from, date_to, product_id=None, categ_id=None):
+        """Return the WIP lines of the manufacturing orders in range and their total value.
+
+        The WIP of an MO is the value of the components it consumed less the
+        value of the finished products it already put in stock; MOs without
+        value left in production are not listed.
+        """
+        date_field, domain = self._get_date_domain('mrp.production', date_from, date_to)
+        domain += [('state', 'in', WIP_STATES)]
+        if product_id:
+            domain.append(('product_id', '=', product_id))
+        if categ_id:
+            domain.append(('product_id.categ_id', 'child_of', categ_id))
+        productions = self.env['mrp.production'].search(domain, order=f"{date_field or 'id'}, id")
+        values = self._get_layer_values(productions.ids)
+
+        lines = []
+        total_wip_value = 0.0
+        for mo in productions:
+            row = values.get(mo.id)
+            wip_value = (row['consumed'] or 0.0) - (row['produced'] or 0.0) if row else 0.0
+            if wip_value <= 0:
+                continue
+            mo_date = mo[date_field] if date_field else False
+            lines.append({
+                'date': fields.Date.to_string(mo_date) if mo_date else '',
+                'product': mo.product_id.display_name or '',
+                'qty': mo.qty_producing or mo.product_qty,
+                'value': wip_value,
+                'location': mo.location_src_id.complete_name or '',
+                'mo_reference': mo.name,
+                'state': mo.state,
+            })
+            total_wip_value += wip_value
+        return lines, total_wip_value
+
+    @api.model
+    def _get_move_lines(self, date_from, date_to, product_id=None, categ_id=None):
+        """Return the done moves out of production locations in range with their layer value.
+
+        Used when no MO is in range; the values of all the moves are summed
+        in one grouped read of their valuation layers.
+        """
+        domain = [
+            ('state', '=', 'done'),
+            ('date', '>=', fields.Date.to_date(date_from)),
+            ('date', '<', fields.Date.to_date(date_to) + timedelta(days=1)),
+            ('location_id.usage', '=', 'production'),
+            ('location_dest_id.usage', '=', 'internal'),
+        ]
+        if product_id:
+            domain.append(('product_id', '=', product_id))
+        if categ_id:
+            domain.append(('product_id.categ_id', 'child_of', categ_id))
+        moves = self.env['stock.move'].search(domain, order='date, id')
+        values = dict(self.env['stock.valuation.layer']._read_group(
+            [('stock_move_id', 'in', moves.ids)], ['stock_move_id'], ['value:sum']))
+
+        lines = []
+        total_wip_value = 0.0
+        for move in moves:
+            value = values.get(move, 0.0)
+            if value <= 0:
+                continue
+            lines.append({
+                'date': fields.Date.to_string(move.date) if move.date else '',
+                'product': move.product_id.display_name,
+                'qty': move.product_uom_qty,
+                'value': value,
+                'location': f"{move.location_id.complete_name} → {move.location_dest_id.complete_name}",
+                'reference': move.picking_id.name or move.origin or move.name or '',
+                'move_type': 'Stock Move',
+            })
+            total_wip_value += value
+        return lines, total_wip_value
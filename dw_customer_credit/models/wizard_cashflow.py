@@ -2,6 +2,8 @@ from odoo import fields, models, api
 from odoo.exceptions import UserError
 import json
 
+from odoo.addons.all_reports_full.models.report_perf_log import instrument_report
+
 class DwCashflowForecastWizard(models.TransientModel):
     _name = "dw.cashflow.forecast.wizard"
     _description = "Cash Flow Forecast Wizard"
@@ -93,6 +95,7 @@ class DwCashflowForecastWizard(models.TransientModel):
                 wizard.total_outflow = 0
                 wizard.net_cash_flow = 0
 
+    @instrument_report(rows=lambda wizard, result: len(wizard.get_cashflow_lines()))
     def action_generate_cashflow(self):
         """
         Generate cash flow lines and display them in the wizard
@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+
+from . import test_report_engines
+from . import test_report_benchmark
@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+from odoo.tests import tagged
+
+from odoo.addons.all_reports_full.tests.common import ReportBenchmarkCase
+
+
+@tagged('post_install', '-at_install', '-standard', 'report_benchmark')
+class TestReportBenchmark(ReportBenchmarkCase):
+    """Stock reports of the module on the synthetic dataset of all_reports_full."""
+
+    def test_slow_nonmoving(self):
+        wizard = self.env['slow.moving.wizard'].create({})
+        report = self.env['report.dw_customer_credit.report_slow_nonmoving_template']
+        self.measure('dw_customer_credit.slow_nonmoving', report._get_report_values, wizard.ids)
+
+    def test_wip_valuation(self):
+        self.measure('dw_customer_credit.wip_valuation',
+                     self.env['wip.valuation.engine']._get_mo_lines, self.date_from, self.date_to)
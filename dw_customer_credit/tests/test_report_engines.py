@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+from datetime import timedelta
+from unittest.mock import patch
+
+from odoo import fields
+from odoo.addons.account.tests.common import AccountTestInvoicingCommon
+from odoo.tests import tagged
+
+
+@tagged('post_install', '-at_install')
+class TestReportEngines(AccountTestInvoicingCommon):
+    """Credit exposure, lot aging and WIP engines against per-record computations."""
+
+    @classmethod
+    def setUpClass(cls, chart_template_ref=None):
+        super().setUpClass(chart_template_ref=chart_template_ref)
+        cls.today = fields.Date.context_today(cls.env['res.partner'])
+        cls.stock = cls.env['stock.warehouse'].search([('company_id', '=', cls.env.company.id)], limit=1).lot_stock_id
+        cls.supplier = cls.env.ref('stock.stock_location_suppliers')
+        cls.customer = cls.env.ref('stock.stock_location_customers')
+
+    def _move(self, product, source, dest, qty, lot=None):
+        move = self.env['stock.move'].create({
+            'name': product.name,
+            'product_id': product.id,
+            'product_uom': product.uom_id.id,
+            'product_uom_qty': qty,
+            'location_id': source.id,
+            'location_dest_id': dest.id,
+        })
+        move._action_confirm()
+        move.move_line_ids = [(5, 0, 0), (0, 0, {
+            'product_id': product.id,
+            'product_uom_id': product.uom_id.id,
+            'lot_id': lot.id if lot else False,
+            'quantity': qty,
+            'location_id': source.id,
+            'location_dest_id': dest.id,
+        })]
+        move.picked = True
+        move._action_done()
+        return move
+
+    # -----------------------------
+    #  CREDIT EXPOSURE
+    # -----------------------------
+    def test_credit_exposure(self):
+        self.init_invoice('out_invoice', partner=self.partner_a, amounts=[500.0], post=True)
+        order = self.env['sale.order'].create({
+            'partner_id': self.partner_a.id,
+            'order_line': [(0, 0, {'product_id': self.product_a.id, 'product_uom_qty': 2.0, 'price_unit': 100.0})],
+        })
+        order.action_confirm()
+
+        Exposure = self.env['customer.credit.exposure']
+        exposures = Exposure._get_exposures(self.partner_a | self.partner_b)
+        invoices = self.env['account.move'].search([
+            ('partner_id', '=', self.partner_a.id), ('move_type', '=', 'out_invoice'), ('state', '=', 'posted')])
+        orders = self.env['sale.order'].search([('partner_id', '=', self.partner_a.id), ('state', '=', 'sale')])
+        expected = sum(invoices.mapped('amount_residual')) + sum(o.amount_total - o.amount_invoiced for o in orders)
+        company_id = self.env.company.id
+        self.assertAlmostEqual(exposures[(self.partner_a.id, company_id)], expected)
+        self.assertEqual(exposures[(self.partner_b.id, company_id)], 0.0)
+
+        # customers without anything open keep their empty row and are not refreshed again
+        with patch.object(type(Exposure), '_refresh') as refresh:
+            Exposure._get_exposures(self.partner_b)
+        refresh.assert_not_called()
+
+    # -----------------------------
+    #  LOT AGING
+    # -----------------------------
+    def test_lot_aging(self):
+        product = self.env['product.product'].create({
+            'name': 'Aged', 'type': 'product', 'tracking': 'lot', 'standard_price': 2.0,
+        })
+        old_lot, new_lot = self.env['stock.lot'].create([
+            {'name': 'OLD', 'product_id': product.id, 'company_id': self.env.company.id},
+            {'name': 'NEW', 'product_id': product.id, 'company_id': self.env.company.id},
+        ])
+        receipt = self._move(product, self.supplier, self.stock, 10.0, old_lot)
+        self._move(product, self.supplier, self.stock, 5.0, new_lot)
+        self._move(product, self.stock, self.customer, 4.0, old_lot)
+        receipt.move_line_ids.flush_recordset()
+        self.env.cr.execute("UPDATE stock_move_line SET date = date - INTERVAL '100 days' WHERE id IN %s",
+                            [tuple(receipt.move_line_ids.ids)])
+        self.env['stock.move.line'].invalidate_model(['date'])
+
+        [line], summary, _buckets = self.env['stock.lot.aging']._get_aging(30, 90, product_id=product.id)
+        quants = self.env['stock.quant'].search([('product_id', '=', product.id), ('location_id.usage', '=', 'internal')])
+        self.assertAlmostEqual(line['total_qty'], sum(quants.mapped('quantity')))
+        self.assertAlmostEqual(line['total_value'], sum(quants.mapped('quantity')) * product.standard_price)
+        self.assertEqual(line['lot_count'], 2)
+        self.assertEqual(line['oldest_lot'], 'OLD')
+        self.assertGreaterEqual(line['oldest_days'], 100)
+        self.assertEqual(line['classification'], 'Non-Moving')
+        lots = {info['lot_name']: info for info in line['lot_info']}
+        self.assertEqual((lots['OLD']['original_qty'], lots['OLD']['used_qty'], lots['OLD']['remaining_qty']),
+                         (10.0, 4.0, 6.0))
+        self.assertEqual((lots['NEW']['original_qty'], lots['NEW']['used_qty'], lots['NEW']['remaining_qty']),
+                         (5.0, 0.0, 5.0))
+        self.assertEqual(summary['non_moving_count'], 1)
+
+    # -----------------------------
+    #  WIP VALUATION
+    # -----------------------------
+    def test_wip_valuation(self):
+        if 'stock.valuation.layer' not in self.env:
+            self.skipTest("WIP is valued from stock valuation layers")
+        component = self.env['product.product'].create({'name': 'Component', 'type': 'product', 'standard_price': 10.0})
+        finished = self.env['product.product'].create({'name': 'Finished', 'type': 'product'})
+        bom = self.env['mrp.bom'].create({
+            'product_tmpl_id': finished.product_tmpl_id.id,
+            'product_qty': 1.0,
+            'bom_line_ids': [(0, 0, {'product_id': component.id, 'product_qty': 3.0})],
+        })
+        self.env['stock.quant']._update_available_quantity(component, self.stock, 10.0)
+        production = self.env['mrp.production'].create({'product_id': finished.id, 'bom_id': bom.id, 'product_qty': 1.0})
+        production.action_confirm()
+        production.move_raw_ids.quantity = 3.0
+        production.move_raw_ids.picked = True
+        production.move_raw_ids._action_done()
+
+        lines, total = self.env['wip.valuation.engine']._get_mo_lines(
+            self.today - timedelta(days=1), self.today, product_id=finished.id)
+        layers = self.env['stock.valuation.layer'].search([('stock_move_id', 'in', production.move_raw_ids.ids)])
+        self.assertEqual([line['mo_reference'] for line in lines], [production.name])
+        self.assertAlmostEqual(lines[0]['value'], -sum(layers.mapped('value')))
+        self.assertAlmostEqual(total, 30.0)
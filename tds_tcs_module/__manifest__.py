@@ -2,7 +2,7 @@
     'name': 'Vendor TDS Auto Population',
     'version': '17.0.1.0.0',
     'category': 'Accounting',
-    'depends': ['account'],
+    'depends': ['account', 'all_reports_full'],
     'data': [
         'security/ir.model.access.csv',
         'views/res_partner_view.xml',
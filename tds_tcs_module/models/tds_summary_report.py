@@ -4,6 +4,8 @@ from odoo import models, fields, api
 from odoo.exceptions import UserError
 import logging
 
+from odoo.addons.all_reports_full.models.report_perf_log import instrument_report
+
 _logger = logging.getLogger(__name__)
 
 class TdsSummaryReport(models.Model):
@@ -65,6 +67,7 @@ class TdsSummaryReport(models.Model):
             if record.date_from > record.date_to:
                 raise UserError("From Date cannot be greater than To Date!")
 
+    @instrument_report(rows=lambda report, result: len(report.detail_line_ids))
     def action_generate_report(self):
         """Generate TDS Summary Report for All Vendors"""
         self.ensure_one()
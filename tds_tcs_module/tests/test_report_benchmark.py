@@ -0,0 +1,13 @@
+# -*- coding: utf-8 -*-
+from odoo.tests import tagged
+
+from odoo.addons.all_reports_full.tests.common import ReportBenchmarkCase
+
+
+@tagged('post_install', '-at_install', '-standard', 'report_benchmark')
+class TestReportBenchmark(ReportBenchmarkCase):
+    """TDS summary on the synthetic dataset of all_reports_full."""
+
+    def test_tds_summary(self):
+        summary = self.env['tds.summary.report'].create({'date_from': self.date_from, 'date_to': self.date_to})
+        self.measure('tds_tcs_module.tds_summary', summary.action_generate_report)